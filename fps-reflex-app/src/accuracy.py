@@ -0,0 +1,97 @@
+import math
+import numpy as np
+
+BINS = 33  # Odd, so the target center is the middle of a bin
+EXTENT = 3.0  # Target radii covered on each side of the center; misses further out land in the edge bins
+
+class AccuracyMap:
+    """Where clicks landed relative to the center of the target they were aimed at.
+
+    Offsets are measured in target radii, so targets of every size share one
+    grid: the target itself is the circle of radius 1 in the middle. Each
+    click increments one bin of a fixed BINS x BINS count array and a few
+    running sums, so recording is O(1) whatever has been recorded before.
+    `version` changes with every click, for caches drawn from the map.
+    """
+
+    def __init__(self, bins=BINS, extent=EXTENT):
+        self.bins = bins
+        self.extent = extent
+        self.scale = bins / (2 * extent)  # Bins per radius
+        self.counts = np.zeros((bins, bins), dtype=np.int32)  # [row (y), column (x)]
+        self.hits = 0
+        self.misses = 0
+        self.sum_dx = 0.0  # In radii; positive is right of / below the center
+        self.sum_dy = 0.0
+        self.sum_distance = 0.0
+        self.version = 0
+
+    def record(self, dx, dy, radius, hit):
+        x = dx / radius
+        y = dy / radius
+        last = self.bins - 1
+        column = min(max(int((x + self.extent) * self.scale), 0), last)
+        row = min(max(int((y + self.extent) * self.scale), 0), last)
+        self.counts[row, column] += 1
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.sum_dx += x
+        self.sum_dy += y
+        self.sum_distance += math.hypot(x, y)
+        self.version += 1
+
+    @property
+    def clicks(self):
+        return self.hits + self.misses
+
+    @property
+    def accuracy(self):
+        """Share of clicks that hit, or None before the first click"""
+        return self.hits / self.clicks if self.clicks else None
+
+    def bias(self):
+        """Mean offset (x, y) in radii: where this player's clicks land on average"""
+        if not self.clicks:
+            return (0.0, 0.0)
+        return (self.sum_dx / self.clicks, self.sum_dy / self.clicks)
+
+    def mean_distance(self):
+        return self.sum_distance / self.clicks if self.clicks else 0.0
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.hits += other.hits
+        self.misses += other.misses
+        self.sum_dx += other.sum_dx
+        self.sum_dy += other.sum_dy
+        self.sum_distance += other.sum_distance
+        self.version += 1
+
+    def clear(self):
+        self.counts.fill(0)
+        self.hits = self.misses = 0
+        self.sum_dx = self.sum_dy = self.sum_distance = 0.0
+        self.version += 1
+
+    def copy(self):
+        aim = AccuracyMap(self.bins, self.extent)
+        aim.merge(self)
+        return aim
+
+    def to_row(self):
+        """(counts, hits, misses, sum_dx, sum_dy, sum_distance) for storage"""
+        return (self.counts.tobytes(), self.hits, self.misses, self.sum_dx, self.sum_dy, self.sum_distance)
+
+    @classmethod
+    def from_row(cls, row):
+        counts, hits, misses, sum_dx, sum_dy, sum_distance = row
+        aim = cls()
+        aim.counts[:] = np.frombuffer(counts, dtype=np.int32).reshape(aim.counts.shape)
+        aim.hits = hits
+        aim.misses = misses
+        aim.sum_dx = sum_dx
+        aim.sum_dy = sum_dy
+        aim.sum_distance = sum_distance
+        return aim
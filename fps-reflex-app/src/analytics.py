@@ -0,0 +1,223 @@
+import argparse
+import glob
+import json
+import os
+import numpy as np
+import telemetry
+
+# Per-shot arrays kept in the cache, all the same length
+SHOT_FIELDS = {
+    "session": np.int64,
+    "reaction_ns": np.int64,
+    "distance": np.float64,
+    "width": np.float64
+}
+
+def session_shots(columns):
+    """Vectorized per-hit measurements for one session's telemetry columns.
+
+    reaction_ns is present -> hit (what the game scores, and the movement time
+    in Fitts' law), distance is from the previous hit to the target center
+    (NaN for the first shot) and width is the target diameter.
+    """
+    kind = np.frombuffer(columns["kind"], dtype=np.uint8)
+    t_ns = np.frombuffer(columns["t_ns"], dtype=np.int64)
+    x = np.frombuffer(columns["x"], dtype=np.float32)
+    y = np.frombuffer(columns["y"], dtype=np.float32)
+    size = np.frombuffer(columns["size"], dtype=np.float32)
+
+    spawns = np.flatnonzero(kind == telemetry.SPAWN)
+    presents = np.flatnonzero(kind == telemetry.PRESENT)
+    hits = np.flatnonzero(kind == telemetry.HIT)
+    if len(spawns) == 0 or len(hits) == 0:
+        return {name: np.empty(0, dtype=SHOT_FIELDS[name]) for name in ("reaction_ns", "distance", "width")}
+
+    target = np.frombuffer(columns["target"], dtype=np.int32) if "target" in columns else None
+    if target is not None and (target[spawns] >= 0).all():
+        # Each event names its target's spawn number, so a hit pairs with the spawn and first
+        # present of the target that was hit, even with many targets on screen
+        ids = max(int(target[spawns].max()), int(target[hits].max())) + 1
+        spawn_of = np.full(ids, -1, dtype=np.int64)
+        spawn_of[target[spawns]] = spawns
+        present_of = np.full(ids, -1, dtype=np.int64)
+        present_of[target[presents][::-1]] = presents[::-1]  # Reversed, so the first present wins
+        hit_ids = target[hits]
+        known = hit_ids >= 0
+        owner = np.where(known, spawn_of[np.maximum(hit_ids, 0)], -1)
+        valid = (owner >= 0) & (owner < hits)
+        hits = hits[valid]
+        owner = owner[valid]
+        present = present_of[hit_ids[valid]]
+    else:
+        # Sessions recorded before targets were numbered: each hit belongs to the latest spawn before it
+        owner = spawns[np.maximum(np.searchsorted(spawns, hits) - 1, 0)]
+        valid = owner < hits
+        hits = hits[valid]
+        owner = owner[valid]
+        next_present = np.searchsorted(presents, owner)
+        present = np.where(next_present < len(presents), presents[np.minimum(next_present, len(presents) - 1)], owner)
+
+    # The first present, if it came after the spawn and before the hit; otherwise the spawn itself
+    present = np.where((present > owner) & (present < hits), present, owner)
+    shown_ns = t_ns[present]
+
+    reaction = t_ns[hits] - shown_ns
+    previous_x = np.concatenate(([np.nan], x[hits][:-1]))
+    previous_y = np.concatenate(([np.nan], y[hits][:-1]))
+    distance = np.hypot(x[owner] - previous_x, y[owner] - previous_y)
+    return {
+        "reaction_ns": reaction,
+        "distance": distance,
+        "width": size[owner] * 2
+    }
+
+class ShotCache:
+    """Per-shot arrays for every processed session, saved as one .npz.
+
+    Only session files that aren't in the cache yet get parsed on update().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sessions = np.empty(0, dtype=str)   # Session file names
+        self.session_mode = np.empty(0, dtype=str)
+        self.session_time = np.empty(0, dtype=np.float64)
+        self.shots = {name: np.empty(0, dtype=dtype) for name, dtype in SHOT_FIELDS.items()}
+        if os.path.exists(path):
+            self.load()
+
+    def load(self):
+        with np.load(self.path, allow_pickle=False) as data:
+            self.sessions = data["sessions"]
+            self.session_mode = data["session_mode"]
+            self.session_time = data["session_time"]
+            self.shots = {name: data[name] for name in SHOT_FIELDS}
+
+    def save(self):
+        temp_path = self.path + ".tmp.npz"
+        np.savez(
+            temp_path,
+            sessions=self.sessions,
+            session_mode=self.session_mode,
+            session_time=self.session_time,
+            **self.shots
+        )
+        os.replace(temp_path, self.path)
+
+    def update(self, telemetry_dir):
+        """Add sessions from telemetry_dir that aren't cached yet; returns how many were added"""
+        known = set(self.sessions.tolist())
+        new_files = sorted(
+            path for path in glob.glob(os.path.join(telemetry_dir, "*.fpst"))
+            if os.path.basename(path) not in known
+        )
+        if not new_files:
+            return 0
+
+        names, modes, times = [], [], []
+        parts = {name: [self.shots[name]] for name in SHOT_FIELDS}
+        for index, path in enumerate(new_files, start=len(self.sessions)):
+            meta, columns = telemetry.load_session(path)
+            shots = session_shots(columns)
+            names.append(os.path.basename(path))
+            modes.append(meta.get("mode") or "")
+            times.append(meta.get("saved_at", os.path.getmtime(path)))
+            for name, values in shots.items():
+                parts[name].append(np.asarray(values, dtype=SHOT_FIELDS[name]))
+            parts["session"].append(np.full(len(shots["reaction_ns"]), index, dtype=np.int64))
+
+        self.sessions = np.concatenate((self.sessions, names))
+        self.session_mode = np.concatenate((self.session_mode, modes))
+        self.session_time = np.concatenate((self.session_time, times))
+        self.shots = {name: np.concatenate(parts[name]) for name in SHOT_FIELDS}
+        self.save()
+        return len(new_files)
+
+def summarize(reaction_ns):
+    """Distribution of reaction times, in milliseconds"""
+    if len(reaction_ns) == 0:
+        return {"shots": 0}
+    ms = reaction_ns / 1e6
+    p10, p25, p50, p75, p90, p95, p99 = np.percentile(ms, [10, 25, 50, 75, 90, 95, 99])
+    return {
+        "shots": int(len(ms)),
+        "mean": float(ms.mean()),
+        "stddev": float(ms.std()),
+        "iqr": float(p75 - p25),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p95": float(p95),
+        "p99": float(p99)
+    }
+
+def fitts_fit(distance, width, movement_ns):
+    """Least-squares fit of MT = a + b * log2(D/W + 1); MT in milliseconds"""
+    valid = np.isfinite(distance) & (width > 0) & (movement_ns > 0)
+    if np.count_nonzero(valid) < 2:
+        return None
+    index_of_difficulty = np.log2(distance[valid] / width[valid] + 1)
+    mt = movement_ns[valid] / 1e6
+    # Closed-form simple regression; cheaper than polyfit's least squares on millions of rows
+    id_offset = index_of_difficulty - index_of_difficulty.mean()
+    mt_offset = mt - mt.mean()
+    id_variance = np.dot(id_offset, id_offset)
+    if id_variance == 0:
+        return None  # A line can't be fitted through a single difficulty
+    covariance = np.dot(id_offset, mt_offset)
+    mt_variance = np.dot(mt_offset, mt_offset)
+    b = covariance / id_variance
+    a = mt.mean() - b * index_of_difficulty.mean()
+    r_squared = covariance * covariance / (id_variance * mt_variance) if mt_variance else 0.0
+    return {
+        "intercept_ms": float(a),
+        "slope_ms_per_bit": float(b),
+        "r_squared": float(r_squared),
+        "throughput_bits_per_s": float(np.mean(index_of_difficulty / (mt / 1e3)))
+    }
+
+def trend(session, reaction_ns, session_time):
+    """Slope of per-session mean reaction time over time, in ms per day (negative = improving)"""
+    counts = np.bincount(session, minlength=len(session_time))
+    played = counts > 0
+    if np.count_nonzero(played) < 2:
+        return None
+    means = np.bincount(session, weights=reaction_ns / 1e6, minlength=len(session_time))[played] / counts[played]
+    days = (session_time[played] - session_time[played].min()) / 86400
+    if np.ptp(days) == 0:
+        return None
+    slope, _ = np.polyfit(days, means, 1)
+    return {"sessions": int(np.count_nonzero(played)), "ms_per_day": float(slope)}
+
+def report(cache):
+    shots = cache.shots
+    # Compare small integer codes per shot rather than strings
+    modes, session_mode = np.unique(cache.session_mode, return_inverse=True)
+    shot_mode = session_mode[shots["session"]]
+    result = {
+        "overall": summarize(shots["reaction_ns"]),
+        "fitts": fitts_fit(shots["distance"], shots["width"], shots["reaction_ns"]),
+        "trend": trend(shots["session"], shots["reaction_ns"], cache.session_time),
+        "modes": {}
+    }
+    for code, mode in enumerate(modes):
+        selected = shot_mode == code
+        result["modes"][str(mode)] = {
+            "summary": summarize(shots["reaction_ns"][selected]),
+            "fitts": fitts_fit(shots["distance"][selected], shots["width"][selected], shots["reaction_ns"][selected])
+        }
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reaction time analytics over recorded sessions")
+    parser.add_argument("--telemetry", default="telemetry", help="Directory of .fpst session files")
+    parser.add_argument("--cache", default=None, help="Shot cache file (default: <telemetry>/analytics_cache.npz)")
+    args = parser.parse_args(argv)
+
+    cache = ShotCache(args.cache or os.path.join(args.telemetry, "analytics_cache.npz"))
+    if os.path.isdir(args.telemetry):
+        cache.update(args.telemetry)
+    print(json.dumps(report(cache), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Benchmarks never open a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game import Game
+from game_mode import GameMode
+from highscores import Highscores
+from history import ScoreHistory
+from replay import NoScores, ReplayWindow
+from target import Target
+from ui.window import GameWindow
+
+HISTORY_SIZES = (10, 10_000, 1_000_000)
+# Every state the game reaches; the legacy "menu" screen isn't entered any more
+STATES = ("mode_select", "confirm_clear", "countdown", "playing", "ended", "name_input")
+
+def timed(run, repeats):
+    """Median and best ns per operation over `repeats` calls of `run`, which returns (ops, elapsed ns)"""
+    samples = []
+    for _ in range(repeats):
+        ops, elapsed = run()
+        samples.append(elapsed / ops)
+    samples.sort()
+    return {"ns_per_op": samples[len(samples) // 2], "best_ns_per_op": samples[0], "ops": ops, "repeats": repeats}
+
+def bench_target(results, scale, repeats):
+    target = Target(400.0, 300.0, 20.0)
+    ops = max(1, int(200_000 * scale))
+
+    def clicks(x, y):
+        def run():
+            started = time.perf_counter_ns()
+            for _ in range(ops):
+                target.is_clicked(x, y)
+            return ops, time.perf_counter_ns() - started
+        return run
+
+    results["target.is_clicked[hit]"] = timed(clicks(405, 296), repeats)
+    results["target.is_clicked[miss]"] = timed(clicks(900, 700), repeats)
+
+def bench_generate_target(results, scale, repeats, width=1920, height=1080):
+    game = Game(NoScores())
+    game.window = ReplayWindow(width, height)
+    rounds = max(1, int(50 * scale))
+    for mode in GameMode.MODES:
+        def run():
+            ops = elapsed = 0
+            for seed in range(rounds):
+                game.start_game(mode, seed)  # Not timed; resets the field and the schedule
+                count = game.max_clicks
+                started = time.perf_counter_ns()
+                for _ in range(count):
+                    game.generate_target(0)
+                elapsed += time.perf_counter_ns() - started
+                ops += count
+            return ops, elapsed
+        results[f"game.generate_target[{mode}]"] = timed(run, repeats)
+
+def bench_update_display(results, scale, repeats, window, highscores):
+    frames = max(1, int(200 * scale))
+    game = Game(NoScores())
+    game.window = window
+
+    def frames_of(state, targets, mode="quick", redraw=False):
+        def run():
+            started = time.perf_counter_ns()
+            for _ in range(frames):
+                if redraw:
+                    window.invalidate_scene(state)
+                window.update_display(state, targets, 3, 10, 0.245, highscores, "ACE", mode, 3 if state == "countdown" else None)
+            return frames, time.perf_counter_ns() - started
+        return run
+
+    for state in STATES:
+        targets = []
+        if state == "playing":
+            game.start_game("quick", 1)
+            game.begin_play(0)
+            targets = list(game.visible_targets(0))
+        window.update_display(state, targets, 3, 10, 0.245, highscores, "ACE", "quick")  # Warm caches
+        results[f"window.update_display[{state}]"] = timed(frames_of(state, targets), repeats)
+        if state in window.SCENE_STATES:
+            results[f"window.update_display[{state}:redraw]"] = timed(frames_of(state, targets, redraw=True), repeats)
+
+    # The busiest play screen: many targets at once
+    game.start_game("grid", 1)
+    game.begin_play(0)
+    targets = list(game.visible_targets(0))
+    results["window.update_display[playing:grid]"] = timed(frames_of("playing", targets, "grid"), repeats)
+
+def fill_history(path, size, rng):
+    history = ScoreHistory(path)
+    modes = list(GameMode.MODES)
+    now = time.time()
+    for start in range(0, size, 100_000):
+        history.add_runs([
+            (modes[i % len(modes)], f"P{rng.randrange(500)}", rng.uniform(0.15, 0.6), now - rng.uniform(0, 3e7), i)
+            for i in range(start, min(size, start + 100_000))
+        ])
+    history.close()
+
+def bench_highscores(results, scale, repeats, sizes, data_dir):
+    rng = random.Random(7)
+    for size in sizes:
+        directory = os.path.join(data_dir, str(size))
+        os.makedirs(directory)
+        filename = os.path.join(directory, "highscores.json")
+        fill_history(os.path.splitext(filename)[0] + ".db", size, rng)
+        highscores = Highscores(filename)
+        adds = max(1, int(100 * scale))
+
+        def add():
+            started = time.perf_counter_ns()
+            for i in range(adds):
+                highscores.add_score(f"P{i % 50}", 0.2 + i / 1e4, "quick", seed=i)
+            elapsed = time.perf_counter_ns() - started
+            highscores.flush()  # Keep the writer's backlog out of the next sample
+            return adds, elapsed
+
+        def load():
+            started = time.perf_counter_ns()
+            highscores.load_scores()
+            return 1, time.perf_counter_ns() - started
+
+        def rank(reaction_time):
+            def run():
+                started = time.perf_counter_ns()
+                for _ in range(adds):
+                    highscores.get_rank("quick", reaction_time)
+                return adds, time.perf_counter_ns() - started
+            return run
+
+        results[f"highscores.add_score[{size}]"] = timed(add, repeats)
+        results[f"highscores.load_scores[{size}]"] = timed(load, repeats)
+        # A new best and a run slower than every other: with rank_tree both are O(log n)
+        results[f"highscores.rank_of[{size}:best]"] = timed(rank(0.01), repeats)
+        results[f"highscores.rank_of[{size}:worst]"] = timed(rank(10.0), repeats)
+        highscores.close()
+
+def run_benchmarks(scale=1.0, repeats=5, sizes=HISTORY_SIZES, only=None):
+    """Every benchmark (or those whose group matches `only`), as {name: timing}"""
+    groups = only or ("target", "generate_target", "update_display", "highscores")
+    results = {}
+    data_dir = tempfile.mkdtemp(prefix="fps-reflex-bench-")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):  # Silence per-round game output
+            if "target" in groups:
+                bench_target(results, scale, repeats)
+            if "generate_target" in groups:
+                bench_generate_target(results, scale, repeats)
+            if "update_display" in groups:
+                pygame.display.init()
+                pygame.font.init()
+                info = pygame.display.Info()
+                window = GameWindow(info.current_w, info.current_h)
+                highscores = Highscores(os.path.join(data_dir, "display.json"))
+                for i in range(30):
+                    highscores.add_score(f"P{i}", 0.2 + i / 100, list(GameMode.MODES)[i % len(GameMode.MODES)])
+                bench_update_display(results, scale, repeats, window, highscores)
+                highscores.close()
+                window.close()
+            if "highscores" in groups:
+                bench_highscores(results, scale, repeats, sizes, data_dir)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+def compare(results, baseline, threshold):
+    """Adds change_percent to each result with a baseline; returns the ones slower by more than `threshold` %"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["ns_per_op"]:
+            continue
+        result["change_percent"] = 100 * (result["ns_per_op"] - base["ns_per_op"]) / base["ns_per_op"]
+        if result["change_percent"] > threshold:
+            regressions.append(name)
+    return regressions
+
+def machine_info():
+    return {
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "created": time.time()
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the hot paths headless and compare them with a saved baseline")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="Baseline file to compare with (or write with --save)")
+    parser.add_argument("--save", action="store_true", help="Write this run's results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=25.0, help="Fail when a benchmark is this many percent slower")
+    parser.add_argument("--only", nargs="+", choices=["target", "generate_target", "update_display", "highscores"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(HISTORY_SIZES), help="Run history sizes for highscores")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplies the operations per repeat")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scale, args.repeats, args.sizes, args.only)
+    regressions = []
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(dict(machine_info(), results=results), f, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    for name, result in results.items():
+        change = result.get("change_percent")
+        change_text = f"{change:+7.1f}%" if change is not None else ""
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<44} {result['ns_per_op'] / 1000:12.3f} us {change_text}{flag}")
+    if args.save:
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold}%", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from game_mode import GameMode
+
+# Per-round mean index of difficulty is histogrammed in bins this wide (bits)
+ID_BIN = 0.005
+ID_MAX = 10.0
+CHUNK_ROUNDS = 20000  # Rounds generated per task; small enough to spread evenly over workers
+
+# Typical mouse pointing constants for MT = a + b * ID; analytics.py fits your own
+DEFAULT_INTERCEPT_MS = 230.0
+DEFAULT_SLOPE_MS = 166.0
+
+def sample_rounds(mode, width, height, rounds, rng):
+    """(x, y, size) arrays of shape (rounds, targets) drawn like SpawnSchedule, all rounds at once.
+
+    The distributions match SpawnSchedule's; the sequences don't, since this
+    draws from a NumPy generator instead of random.Random.
+    """
+    mode_info = GameMode.get_mode_info(mode)
+    count = mode_info["targets"]
+    shape = (rounds, count)
+    if mode == "burst":
+        groups = (count + 2) // 3
+        center_x = rng.integers(150, width - 150, size=(rounds, groups), endpoint=True)
+        center_y = rng.integers(150, height - 150, size=(rounds, groups), endpoint=True)
+        direction = rng.uniform(0, 2 * np.pi, size=(rounds, groups))
+        spacing = rng.integers(40, 100, size=(rounds, groups), endpoint=True)
+        position_in_group = np.arange(groups * 3) % 3
+        offset = np.repeat(spacing, 3, axis=1) * position_in_group
+        jitter = rng.uniform(-5, 5, size=(2, rounds, groups * 3)) * (position_in_group > 0)
+        direction = np.repeat(direction, 3, axis=1)
+        x = np.repeat(center_x, 3, axis=1) + offset * np.cos(direction) + jitter[0]
+        y = np.repeat(center_y, 3, axis=1) + offset * np.sin(direction) + jitter[1]
+        x = np.clip(x[:, :count], 50, width - 50)
+        y = np.clip(y[:, :count], 50, height - 50)
+        size = np.full(shape, 20.0)
+    elif "sizes" in mode_info:
+        min_size, max_size = mode_info["sizes"]
+        size = rng.integers(min_size, max_size, size=shape, endpoint=True)
+        x = rng.integers(size, width - size, endpoint=True)
+        y = rng.integers(size, height - size, endpoint=True)
+    else:
+        x = rng.integers(30, width - 30, size=shape, endpoint=True)
+        y = rng.integers(30, height - 30, size=shape, endpoint=True)
+        size = np.full(shape, 20.0)
+    return x, y, size
+
+def round_difficulty(x, y, size):
+    """Mean Fitts index of difficulty per round: log2(D/W + 1) from each target to the next.
+
+    The first target has no previous position and is left out. Modes with
+    several targets on screen are measured in spawn order, which stands in
+    for the order players clear them; moving targets use spawn positions.
+    """
+    distance = np.hypot(np.diff(x, axis=1), np.diff(y, axis=1))
+    width = 2.0 * size[:, 1:]
+    return np.log2(distance / width + 1).mean(axis=1)
+
+def calibrate_chunk(mode, width, height, rounds, seed):
+    """Worker task: histogram and moments of per-round difficulty for `rounds` rounds"""
+    rng = np.random.default_rng(seed)
+    difficulty = round_difficulty(*sample_rounds(mode, width, height, rounds, rng))
+    bins = np.minimum((difficulty / ID_BIN).astype(np.int64), int(ID_MAX / ID_BIN) - 1)
+    return {
+        "counts": np.bincount(bins, minlength=int(ID_MAX / ID_BIN)),
+        "sum": float(difficulty.sum()),
+        "sum_squares": float(np.dot(difficulty, difficulty)),
+        "rounds": rounds
+    }
+
+def _merge(results):
+    counts = sum(result["counts"] for result in results)
+    rounds = sum(result["rounds"] for result in results)
+    mean = sum(result["sum"] for result in results) / rounds
+    variance = sum(result["sum_squares"] for result in results) / rounds - mean * mean
+    cumulative = np.cumsum(counts) / rounds
+    percentiles = {
+        f"p{p}": float((np.searchsorted(cumulative, p / 100) + 0.5) * ID_BIN)
+        for p in (5, 25, 50, 75, 95)
+    }
+    return dict({"rounds": rounds, "mean_id": mean, "std_id": float(np.sqrt(max(variance, 0.0)))}, **percentiles)
+
+def tasks(modes, resolutions, rounds, seed):
+    """Independent (mode, width, height, rounds, seed) chunks; results don't depend on the worker count"""
+    for mode_index, mode in enumerate(modes):
+        for width, height in resolutions:
+            for chunk, start in enumerate(range(0, rounds, CHUNK_ROUNDS)):
+                chunk_seed = np.random.SeedSequence([seed, mode_index, width, height, chunk])
+                yield mode, width, height, min(CHUNK_ROUNDS, rounds - start), chunk_seed
+
+def calibrate(modes, resolutions, rounds, workers=None, seed=0,
+              intercept_ms=DEFAULT_INTERCEPT_MS, slope_ms=DEFAULT_SLOPE_MS, reference="normal"):
+    """Difficulty distribution and normalization factor per resolution and mode.
+
+    factor = predicted mean MT of the reference mode / predicted mean MT of
+    the mode at the same resolution; multiplying a time by it puts the run
+    on the reference mode's scale.
+    """
+    jobs = list(tasks(modes, resolutions, rounds, seed))
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(job[:3], pool.submit(calibrate_chunk, *job)) for job in jobs]
+        for key, future in futures:
+            results.setdefault(key, []).append(future.result())
+
+    table = {}
+    for (mode, width, height), chunks in results.items():
+        summary = _merge(chunks)
+        summary["predicted_ms"] = intercept_ms + slope_ms * summary["mean_id"]
+        table.setdefault(f"{width}x{height}", {})[mode] = summary
+    for boards in table.values():
+        baseline = boards.get(reference, next(iter(boards.values())))["predicted_ms"]
+        for summary in boards.values():
+            summary["factor"] = baseline / summary["predicted_ms"]
+    return {
+        "reference": reference,
+        "intercept_ms": intercept_ms,
+        "slope_ms_per_bit": slope_ms,
+        "resolutions": table
+    }
+
+class DifficultyTable:
+    """Normalization factors from a calibration file, for leaderboards comparing modes"""
+
+    def __init__(self, path):
+        with open(path, 'r') as f:
+            self.data = json.load(f)
+        self.sizes = [tuple(map(int, key.split("x"))) for key in self.data["resolutions"]]
+
+    def factor(self, mode, width, height):
+        # The calibrated resolution closest in pixel count
+        closest = min(self.sizes, key=lambda size: abs(size[0] * size[1] - width * height))
+        boards = self.data["resolutions"][f"{closest[0]}x{closest[1]}"]
+        return boards[mode]["factor"] if mode in boards else 1.0
+
+    def normalize(self, reaction_time, mode, width, height):
+        return reaction_time * self.factor(mode, width, height)
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate mode difficulty from simulated target sequences")
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="Rounds sampled per mode and resolution")
+    parser.add_argument("--modes", nargs="+", default=list(GameMode.MODES), choices=list(GameMode.MODES))
+    parser.add_argument("--resolutions", nargs="+", type=parse_resolution,
+                        default=[(1280, 720), (1920, 1080), (2560, 1440)], metavar="WxH")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reference", default="normal", choices=list(GameMode.MODES))
+    parser.add_argument("--intercept-ms", type=float, default=DEFAULT_INTERCEPT_MS)
+    parser.add_argument("--slope-ms", type=float, default=DEFAULT_SLOPE_MS, help="Fitts slope in ms per bit")
+    parser.add_argument("--output", default="difficulty.json")
+    parser.add_argument("--scaling", action="store_true", help="Time 1..--workers workers and report the speedup")
+    args = parser.parse_args(argv)
+
+    if args.scaling:
+        timings = {}
+        for workers in range(1, args.workers + 1):
+            started = time.perf_counter()
+            calibrate(args.modes, args.resolutions, args.rounds, workers, args.seed)
+            timings[workers] = time.perf_counter() - started
+        print(json.dumps({workers: {"seconds": t, "speedup": timings[1] / t} for workers, t in timings.items()}, indent=2))
+        return
+
+    started = time.perf_counter()
+    result = calibrate(args.modes, args.resolutions, args.rounds, args.workers, args.seed,
+                       args.intercept_ms, args.slope_ms, args.reference)
+    elapsed = time.perf_counter() - started
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    total = args.rounds * len(args.modes) * len(args.resolutions)
+    print(f"Sampled {total} rounds with {args.workers} workers in {elapsed:.1f}s ({total / elapsed:.0f} rounds/s); wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,159 @@
-import random
+import os
 import time
-import pygame
-from target import Target
+from target import TargetPool
+from targetfield import TargetField
 from highscores import Highscores
 from game_mode import GameMode
-import math
+from timing import ReactionTimer, now_ns
+from spawns import SpawnSchedule, new_seed
+import metrics
+import telemetry
+import recording
+
+ROUNDS_STARTED = metrics.REGISTRY.counter("fps_rounds_started_total", "Rounds started", ("mode",))
+ROUNDS_COMPLETED = metrics.REGISTRY.counter("fps_rounds_completed_total", "Rounds played to the last target", ("mode",))
+SHOTS = metrics.REGISTRY.counter("fps_shots_total", "Clicks during play", ("result",))
+HITS = SHOTS.labels("hit")
+MISSES = SHOTS.labels("miss")
+REACTION_TIME = metrics.REGISTRY.histogram("fps_reaction_time_seconds", "Present-to-click time of each hit", ("mode",))
+ROUND_AVERAGE = metrics.REGISTRY.histogram("fps_round_average_seconds", "Average reaction time of each completed round", ("mode",))
 
 class Game:
-    def __init__(self):
+    def __init__(self, highscores=None, telemetry_dir=None, recordings_dir=None):
         self.window = None
         self.running = True
-        self.current_target = None
-        self.target_appear_time = 0
+        self.current_target = None  # Most recently spawned target
+        self.field = TargetField()  # All live targets in multi-target modes
+        self.multi_target = False
+        self.moving = False  # Targets move; self.field is a MoverField
+        self.spawned = 0  # Targets spawned this round
+        self.target_pool = TargetPool()
+        self.seed = None  # Seed of the current round's spawn schedule
+        self.schedule = None
+        self.timer = ReactionTimer()  # Spawn/present/click timestamps for reaction times
         self.score = 0
         self.clicks = 0
         self.reaction_times = []
         self.state = "mode_select"  # new initial state
         self.current_mode = None
         self.max_clicks = 20  # will be updated based on mode
-        self.highscores = Highscores()
+        self.highscores = highscores if highscores is not None else Highscores()
         self.input_text = self.highscores.last_player_name
-        self.burst_count = 0  # Track targets within burst
-        self.burst_center = None  # Track center point for burst group
-        self.burst_direction = None  # Track the movement direction (degrees)
-        self.burst_speed = None     # Track simulated movement speed
-        self.current_group = 0  # Track which group of 3 we're on
         self.countdown_time = None
         self.countdown_start = None
+        self.telemetry = telemetry.TelemetryRecorder()  # Motion/click/spawn events for this round
+        self.telemetry_dir = telemetry_dir  # Where finished rounds are saved; None keeps them in memory only
+        self.recorder = recording.InputRecorder()  # Input stream of the current round, for replays
+        self.recordings_dir = recordings_dir  # Where submitted runs' recordings are saved
+        self.memory = None  # Optional MemoryMonitor sampled at round boundaries
+        self.versus = None  # Optional VersusMatch racing another kiosk
+        self.aim = None  # AccuracyMap of this round's click offsets; created by the first start_game
 
-    def generate_target(self):
+    def generate_target(self, timestamp_ns=None):
         if not self.window:
             return
 
-        if self.current_mode == "burst":
-            # Determine which group and position within group
-            current_group = self.clicks // 3
-            position_in_group = self.clicks % 3
-            
-            # Generate new burst parameters when starting a new group
-            if position_in_group == 0:
-                self.burst_center = (
-                    random.randint(150, self.window.width - 150),
-                    random.randint(150, self.window.height - 150)
-                )
-                self.burst_direction = random.uniform(0, 2 * math.pi)
-                self.burst_speed = random.randint(40, 100)
-            
-            # Calculate position based on group position
-            if position_in_group == 0:
-                # First target in group is at center
-                x, y = self.burst_center
-            else:
-                # Second and third targets follow the direction
-                offset = position_in_group * self.burst_speed
-                x = self.burst_center[0] + offset * math.cos(self.burst_direction)
-                y = self.burst_center[1] + offset * math.sin(self.burst_direction)
-                
-                # Add small random variation to non-center targets
-                x += random.uniform(-5, 5)
-                y += random.uniform(-5, 5)
-            
-            # Ensure target stays within screen bounds
-            x = max(50, min(self.window.width - 50, x))
-            y = max(50, min(self.window.height - 50, y))
-            
-            self.current_target = Target(x, y, 20)
+        # Positions come from the round's seeded schedule so any run can be replayed
+        if self.schedule is None:
+            self.schedule = SpawnSchedule(self.seed, self.current_mode, self.window.width, self.window.height)
+        if self.spawned >= len(self.schedule):
+            return
+        x, y, size = self.schedule[self.spawned]
+        spawn_ns = timestamp_ns if timestamp_ns is not None else now_ns()
+
+        if not self.multi_target and self.current_target:
+            self.target_pool.release(self.current_target)
+        self.current_target = self.target_pool.acquire(x, y, size, self.spawned)
+        if self.moving:
+            self.field.insert(self.current_target, *self.schedule.motion(self.spawned), timestamp_ns=spawn_ns)
+        elif self.multi_target:
+            self.field.insert(self.current_target)
+
+        self.spawned += 1
+        self.timer.target_spawned(self.current_target, spawn_ns)
+        target = self.current_target
+        self.telemetry.record(telemetry.SPAWN, spawn_ns, target.x, target.y, target.size, target.index)
+
+    def frame_presented(self, timestamp_ns=None):
+        if timestamp_ns is None:
+            timestamp_ns = now_ns()
+        shown = self.timer.frame_presented(timestamp_ns)
+        if shown:
+            for target in shown:
+                self.telemetry.record(telemetry.PRESENT, timestamp_ns, target.x, target.y, target.size, target.index)
+            self.recorder.record(recording.PRESENT, timestamp_ns)
+
+    def visible_targets(self, timestamp_ns=None):
+        if self.moving:
+            # Drawn where they are at present time, between two simulation steps
+            self.field.sync(timestamp_ns if timestamp_ns is not None else now_ns())
+        if self.multi_target:
+            return self.field.targets
+        return [self.current_target] if self.current_target else []
+
+    def target_at(self, pos, timestamp_ns=None):
+        if self.moving:
+            return self.field.hit_test(*pos, timestamp_ns=timestamp_ns if timestamp_ns is not None else now_ns())
+        if self.multi_target:
+            return self.field.hit_test(*pos)
+        if self.current_target and self.current_target.is_clicked(*pos):
+            return self.current_target
+        return None
+
+    def aimed_at(self, pos, timestamp_ns=None):
+        """The target nearest a click, for attributing a miss"""
+        if self.moving:
+            return self.field.nearest(*pos, timestamp_ns=timestamp_ns if timestamp_ns is not None else now_ns())
+        if self.multi_target:
+            return self.field.nearest(*pos)
+        return self.current_target
+
+    def record_aim(self, pos, target, hit, timestamp_ns):
+        """Add a click's offset from the target's center (where it was at the click) to the round's AccuracyMap"""
+        if target is None:
+            return
+        if self.moving:
+            x, y = self.field.position_of(target, timestamp_ns)
         else:
-            # Standard random target generation for other modes
-            x = random.randint(30, self.window.width - 30)
-            y = random.randint(30, self.window.height - 30)
-            self.current_target = Target(x, y, 20)
-            
-        self.target_appear_time = time.time()
+            x, y = target.x, target.y
+        self.aim.record(pos[0] - x, pos[1] - y, target.size, hit)
+
+    def handle_motion(self, pos, timestamp_ns):
+        if self.state == "playing":
+            self.telemetry.record(telemetry.MOTION, timestamp_ns, pos[0], pos[1])
 
-    def start_game(self, mode_key):
+    def start_game(self, mode_key, seed=None):
         self.current_mode = mode_key
+        self.seed = seed if seed is not None else new_seed()
+        self.schedule = None
         self.max_clicks = GameMode.get_mode_info(mode_key)["targets"]
+        ROUNDS_STARTED.labels(mode_key).inc()
+        if self.aim is None:
+            from accuracy import AccuracyMap  # NumPy; loaded before the countdown rather than mid-round
+            self.aim = AccuracyMap()
+        self.multi_target = "concurrent" in GameMode.get_mode_info(mode_key)
         self.reset_game()
+        self.moving = "speed" in GameMode.get_mode_info(mode_key)
+        if self.moving:
+            from physics import MoverField  # NumPy is only loaded once a moving mode is played
+            width, height = (self.window.width, self.window.height) if self.window else (0, 0)
+            self.field = MoverField(width, height)
+        elif not isinstance(self.field, TargetField):
+            self.field = TargetField()
         self.state = "countdown"  # Changed from "playing" to "countdown"
         self.countdown_time = 5
         self.countdown_start = time.time()
+        width, height = (self.window.width, self.window.height) if self.window else (0, 0)
+        self.recorder.start(mode_key, self.seed, width, height)
 
-    def handle_click(self, pos):
+    def handle_click(self, pos, timestamp_ns=None):
+        click_ns = timestamp_ns if timestamp_ns is not None else now_ns()
+        self.recorder.record(recording.CLICK, click_ns, pos[0], pos[1])
         if self.state == "mode_select":
             mode = self.window.get_clicked_mode(pos)
-            if mode:
+            if mode and self.versus is not None:
+                self.versus.propose(self, mode)  # Both kiosks start together once the host agrees
+            elif mode:
                 self.start_game(mode)
             elif self.window.is_clear_scores_clicked(pos):
                 self.state = "confirm_clear"
@@ -108,32 +177,64 @@ class Game:
         elif self.state == "ended":
             if self.window.is_continue_button_clicked(pos):
                 self.state = "name_input"
-        elif self.state == "playing" and self.current_target:
-            if self.current_target.is_clicked(*pos):
-                reaction_time = time.time() - self.target_appear_time
+        elif self.state == "playing":
+            target = self.target_at(pos, click_ns)
+            if target:
+                self.telemetry.record(telemetry.HIT, click_ns, pos[0], pos[1], target=target.index)
+                self.record_aim(pos, target, True, click_ns)
+                reaction_time = self.timer.target_hit(target, click_ns)
                 self.target_clicked(reaction_time)
+                HITS.inc()
+                REACTION_TIME.labels(self.current_mode).observe(reaction_time)
+                if self.versus is not None:
+                    self.versus.shot(self.clicks, reaction_time, click_ns)
+                if self.multi_target:
+                    self.field.remove(target)
+                    self.target_pool.release(target)
+                    if target is self.current_target:
+                        self.current_target = None
                 if self.clicks >= self.max_clicks:
                     print(f"Game Over! Average reaction time: {self.average_reaction_time():.3f} seconds")
                     self.state = "ended"
-                else:
-                    self.generate_target()
+                    self.window.invalidate_scene("ended")  # New time and rank
+                    ROUNDS_COMPLETED.labels(self.current_mode).inc()
+                    ROUND_AVERAGE.labels(self.current_mode).observe(self.average_reaction_time())
+                    self.recorder.finish(self.average_reaction_time(), self.clicks)
+                    if self.versus is not None:
+                        self.versus.finished(self.average_reaction_time(), self.clicks, click_ns)
+                    self.save_telemetry()
+                elif self.spawned < self.max_clicks:
+                    self.generate_target(click_ns)
+            else:
+                MISSES.inc()
+                self.telemetry.record(telemetry.MISS, click_ns, pos[0], pos[1])
+                self.record_aim(pos, self.aimed_at(pos, click_ns), False, click_ns)
 
-    def handle_keydown(self, event):
+    def handle_keydown(self, event, timestamp_ns=None):
+        self.recorder.record(recording.KEY, timestamp_ns if timestamp_ns is not None else now_ns(), event.key, ord(event.unicode[:1] or "\0"))
         if self.state == "name_input":
+            # Imported here so headless tools (replays) can use Game without loading pygame
+            import pygame
             if event.key == pygame.K_RETURN:
                 if self.input_text.strip():
                     self.highscores.add_score(
                         self.input_text,
                         self.average_reaction_time(),
-                        self.current_mode
+                        self.current_mode,
+                        seed=self.seed,
+                        screen=(self.window.width, self.window.height),
+                        recording=self.save_recording(self.input_text),
+                        aim=self.aim
                     )
                     self.state = "mode_select"
             elif event.key == pygame.K_BACKSPACE:
                 self.input_text = self.input_text[:-1]
+                self.window.invalidate_scene("name_input")
             else:
                 if len(self.input_text) < 15:  # Limit name length
                     if event.unicode.isalnum() or event.unicode.isspace():
                         self.input_text += event.unicode
+                        self.window.invalidate_scene("name_input")
 
     def target_clicked(self, reaction_time):
         self.score += 1
@@ -145,25 +246,72 @@ class Game:
             return 0
         return sum(self.reaction_times) / self.clicks
 
+    def save_telemetry(self):
+        """Queue the finished round's events to be written as a session file"""
+        if self.telemetry_dir is None:
+            return
+        os.makedirs(self.telemetry_dir, exist_ok=True)
+        path = os.path.join(self.telemetry_dir, f"{time.time_ns()}-{self.current_mode}.fpst")
+        meta = {
+            "mode": self.current_mode,
+            "width": self.window.width,
+            "height": self.window.height,
+            "saved_at": time.time(),
+            "average_reaction_time": self.average_reaction_time()
+        }
+        self.highscores.store.writer.submit(telemetry.write_session, path, self.telemetry.snapshot(), meta)
+
+    def save_recording(self, name):
+        """Queue the finished round's input recording to be written; returns its file name"""
+        if self.recordings_dir is None or self.recorder.header is None or self.recorder.active:
+            return None
+        os.makedirs(self.recordings_dir, exist_ok=True)
+        filename = f"{time.time_ns()}-{self.current_mode}.json"
+        data = self.recorder.to_dict(name=name)
+        self.highscores.store.writer.submit(recording.write_recording, os.path.join(self.recordings_dir, filename), data)
+        return filename
+
     def reset_game(self):
+        if self.memory is not None:
+            self.memory.round_started(self)  # Before clearing, so the sample sees the finished round
         self.score = 0
         self.clicks = 0
         self.reaction_times = []
+        if self.aim is not None:
+            self.aim.clear()
+        self.timer.reset()
+        self.telemetry.reset()
+        # Return every live target to the pool exactly once
+        if self.current_target is not None and self.current_target not in self.field:
+            self.target_pool.release(self.current_target)
+        for target in self.field:
+            self.target_pool.release(target)
+        self.current_target = None
+        self.field.clear()
+        self.spawned = 0
         self.state = "mode_select"
-        self.burst_count = 0
-        self.burst_center = None
-        self.burst_direction = None
-        self.burst_speed = None
-        self.current_group = 0
         self.countdown_time = None
         self.countdown_start = None
 
     def update(self):
+        self.highscores.poll_remote()
+        if self.versus is not None:
+            self.versus.update(self)
+        if self.state == "playing" and self.moving:
+            self.field.advance(now_ns())  # Whole fixed steps only; render interpolates the rest
         if self.state == "countdown":
             current_time = time.time()
             elapsed = current_time - self.countdown_start
             self.countdown_time = 5 - int(elapsed)
             
             if self.countdown_time <= 0:
-                self.state = "playing"
-                self.generate_target()
\ No newline at end of file
+                self.begin_play()
+
+    def begin_play(self, timestamp_ns=None):
+        """End the countdown and spawn the round's first targets"""
+        play_ns = timestamp_ns if timestamp_ns is not None else now_ns()
+        self.recorder.record(recording.PLAY, play_ns)
+        self.state = "playing"
+        mode_info = GameMode.get_mode_info(self.current_mode)
+        for _ in range(min(mode_info.get("concurrent", 1), self.max_clicks)):
+            self.generate_target(play_ns)
\ No newline at end of file
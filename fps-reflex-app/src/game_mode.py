@@ -3,7 +3,11 @@ class GameMode:
         "quick": {"name": "10 Targets", "targets": 10},
         "normal": {"name": "20 Targets", "targets": 20},
         "burst": {"name": "Burst - 30 Targets", "targets": 30},
-        "extended": {"name": "50 Targets", "targets": 50}
+        "extended": {"name": "50 Targets", "targets": 50},
+        # Many targets of varying radius on screen at once; each hit spawns a replacement
+        "grid": {"name": "Grid - 100 Targets", "targets": 100, "concurrent": 40, "sizes": (12, 32)},
+        # Targets drift and bounce off the screen edges; speed in px/s, accel in px/s^2
+        "tracking": {"name": "Tracking - 40 Targets", "targets": 40, "concurrent": 6, "sizes": (18, 30), "speed": (120, 360), "accel": 240}
     }
 
     @staticmethod
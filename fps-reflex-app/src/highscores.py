@@ -1,68 +1,198 @@
-import json
 import os
+import time
 from datetime import datetime
+from game_mode import GameMode
+from history import ScoreHistory
+from profiles import Profile, ProfileStore
+from scorestore import LOAD_ERRORS, ScoreStore
+import metrics
+
+SCORES_SAVED = metrics.REGISTRY.counter("fps_scores_saved_total", "Scores entered on the name screen", ("mode",))
 
 class Highscores:
-    def __init__(self):
-        # Initialize with empty lists for each mode including burst
-        self.scores = {
-            "quick": [],     # 10 targets
-            "normal": [],    # 20 targets
-            "burst": [],     # 30 targets
-            "extended": []   # 50 targets
-        }
-        self.filename = "highscores.json"
+    def __init__(self, filename="highscores.json", store=None, history=None, remote=None, profiles=None):
+        # Initialize with empty lists for each mode
+        self.scores = self._empty_scores()
+        self.filename = filename
+        self.store = store if store is not None else ScoreStore(filename)
+        # Full run history; self.scores only keeps the top 10 per mode for the UI
+        if history is None:
+            history = ScoreHistory(os.path.splitext(filename)[0] + ".db", self.store.writer)
+        self.history = history
+        self.remote = remote  # Optional LeaderboardClient for a board shared between machines
+        # One shard per player next to the scores file; only profiles in use are loaded
+        if profiles is None:
+            profiles = ProfileStore(os.path.join(os.path.dirname(filename), "players"), self.store.writer, seed=self._profile_from_history)
+        self.profiles = profiles
+        self.remote_version = None
         self.last_player_name = ""
+        self.version = 0  # Bumped whenever score data changes so caches can invalidate
+        self.listeners = []  # Called with no arguments after every change
         self.load_scores()
 
     def load_scores(self):
-        try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
-                    loaded_scores = data.get('scores', {})
-                    # Update mode names in loaded data including burst
-                    self.scores = {
-                        "quick": loaded_scores.get("quick", []),
-                        "normal": loaded_scores.get("normal", []),
-                        "burst": loaded_scores.get("burst", []),
-                        "extended": loaded_scores.get("extended", [])
-                    }
-                    self.last_player_name = data.get('last_player', "")
-        except:
-            # Reset scores with all modes including burst
-            self.scores = {
-                "quick": [],
-                "normal": [],
-                "burst": [],
-                "extended": []
-            }
-            self.last_player_name = ""
+        # Snapshot first, then replay whatever was logged after it
+        data = self.store.read_snapshot()
+        loaded_scores = data.get('scores', {})
+        self.scores = {mode: loaded_scores.get(mode, []) for mode in GameMode.MODES}
+        self.last_player_name = data.get('last_player', "")
+        for record in self.store.replay():
+            try:
+                self._apply(record)
+            except (KeyError, TypeError, AttributeError) as e:
+                # Valid JSON but not a record this version understands; skip it rather than fail to start
+                print(f"Skipping unreadable highscore record ({e!r})")
+                LOAD_ERRORS.labels("record").inc()
+        if self.store.pending:
+            self.store.compact(self._snapshot)  # Start each session with an empty log
+        if self.history.is_empty():
+            self._import_history()
+        if self.last_player_name:
+            self.profiles.get(self.last_player_name)  # The player most likely to play next
+        self._changed()
+
+    def _profile_from_history(self, name):
+        # Players from before profiles existed start from their runs in the history database
+        profile = None
+        for mode in GameMode.MODES:
+            runs = self.history.player_history(name, mode, Profile.RECENT)
+            if runs:
+                profile = profile or Profile(name)
+                profile.bests[mode] = self.history.personal_best(name, mode)
+                profile.recent[mode] = [[run['time'], run['played_at'], None] for run in reversed(runs)]
+                profile.runs += len(runs)
+        return profile
+
+    def _import_history(self):
+        # Seed a new history database with leaderboard entries from before it existed
+        rows = []
+        for mode, entries in self.scores.items():
+            for entry in entries:
+                try:
+                    played_at = datetime.strptime(entry.get('date', ''), '%m/%d/%y').timestamp()
+                except ValueError:
+                    played_at = time.time()
+                rows.append((mode, entry['name'], entry['time'], played_at, entry.get('seed'), entry.get('accuracy')))
+        if rows:
+            self.history.add_runs(rows)
 
     def save_scores(self):
-        with open(self.filename, 'w') as f:
-            json.dump({
-                'scores': self.scores,
-                'last_player': self.last_player_name
-            }, f)
-
-    def add_score(self, name, reaction_time, mode):
-        self.last_player_name = name
-        self.scores[mode].append({
-            'name': name, 
+        """Write a full snapshot (in the background)"""
+        self.store.compact(self._snapshot)
+
+    def add_score(self, name, reaction_time, mode, seed=None, screen=None, recording=None, aim=None):
+        entry = {
+            'name': name,
             'time': reaction_time,
             'date': datetime.now().strftime('%m/%d/%y')
-        })
-        self.scores[mode].sort(key=lambda x: x['time'])
-        self.scores[mode] = self.scores[mode][:10]  # Keep only top 10
-        self.save_scores()
+        }
+        # Seed and screen size regenerate the exact targets the run was played on
+        if seed is not None:
+            entry['seed'] = seed
+        if screen is not None:
+            entry['screen'] = list(screen)
+        if recording is not None:
+            entry['recording'] = recording  # Input recording file, for replaying disputed runs
+        accuracy = None
+        if aim is not None and aim.clicks:
+            # The round's AccuracyMap: its hit rate ranks the run, its offsets add to the player's heatmap
+            accuracy = entry['accuracy'] = aim.accuracy
+            self.history.record_aim(name, mode, aim)
+        # Before the history insert is queued, so a profile seeded from history doesn't count this run twice
+        self.profiles.record_run(name, mode, reaction_time, accuracy=accuracy)
+        self.history.record_run(mode, name, reaction_time, seed=seed, accuracy=accuracy)
+        SCORES_SAVED.labels(mode).inc()
+        if self.remote is not None:
+            self.remote.submit(mode, name, reaction_time, seed=seed)
+        self._record({'op': 'add', 'mode': mode, 'entry': entry})
 
-    def get_top_scores(self, mode, limit=10):
+    def get_top_scores(self, mode, limit=10, rank_by="time"):
+        """Best runs by raw time, or by accuracy-weighted time with rank_by="weighted" """
+        if rank_by != "time":
+            return self.history.top_scores(mode, limit, rank_by)  # The shared board only ranks by time
+        if self.remote is not None:
+            shared = self.remote.top_scores(mode)
+            if shared is not None and limit <= self.remote.top_limit:
+                return shared[:limit]
+        if limit > 10:
+            return self.history.top_scores(mode, limit)
         return self.scores.get(mode, [])[:limit]
 
+    def get_rank(self, mode, reaction_time, accuracy=None, rank_by="time"):
+        return self.history.rank_of(mode, reaction_time, accuracy, rank_by)
+
+    def get_player_aim(self, name, mode):
+        """The player's AccuracyMap over all their submitted runs, or None"""
+        return self.history.player_aim(name, mode)
+
+    def get_profile(self, name, create=False):
+        """The player's Profile (settings, bests, recent runs), loaded from their shard on first use"""
+        return self.profiles.get(name, create)
+
+    def get_personal_best(self, name, mode):
+        profile = self.profiles.get(name)
+        return profile.personal_best(mode) if profile is not None else None
+
+    def get_rolling_average(self, name, mode, window=10):
+        if window > Profile.RECENT:
+            return self.history.rolling_average(name, mode, window)
+        profile = self.profiles.get(name)
+        return profile.rolling_average(mode, window) if profile is not None else None
+
     def clear_scores(self, mode=None):
-        if mode:
-            self.scores[mode] = []
-        else:
-            self.scores = {"quick": [], "normal": [], "burst": [], "extended": []}
-        self.save_scores()
+        self.history.clear(mode)
+        self.profiles.clear_runs(mode)
+        self._record({'op': 'clear', 'mode': mode})
+
+    def poll_remote(self):
+        """Pick up a refreshed shared board; cheap enough to call every frame"""
+        if self.remote is not None and self.remote.version != self.remote_version:
+            self.remote_version = self.remote.version
+            self._changed()
+
+    def flush(self):
+        """Block until all queued writes are on disk"""
+        self.store.flush()
+
+    def close(self):
+        if self.remote is not None:
+            self.remote.close()
+        self.store.flush()
+        self.history.close()
+        self.store.close()
+
+    def _record(self, record):
+        self._apply(record)
+        self.store.append(record, self._snapshot)
+
+    def _apply(self, record):
+        if record['op'] == 'add':
+            entry = record['entry']
+            mode = record['mode']
+            self.last_player_name = entry['name']
+            self.scores.setdefault(mode, []).append(entry)
+            self.scores[mode].sort(key=lambda x: x['time'])
+            self.scores[mode] = self.scores[mode][:10]  # Keep only top 10
+        elif record['op'] == 'clear':
+            if record.get('mode'):
+                self.scores[record['mode']] = []
+            else:
+                self.scores = self._empty_scores()
+        self._changed()
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _changed(self):
+        self.version += 1
+        for callback in self.listeners:
+            callback()
+
+    def _empty_scores(self):
+        return {mode: [] for mode in GameMode.MODES}
+
+    def _snapshot(self):
+        return {
+            'scores': self.scores,
+            'last_player': self.last_player_name
+        }
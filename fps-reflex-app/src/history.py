@@ -0,0 +1,286 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+def weighted_time(reaction_time, accuracy):
+    """Average reaction time per shot fired rather than per hit: 0.250 s at 80% ranks as 0.3125 s.
+
+    The Python side of ScoreHistory.WEIGHTED, for ranks and for display.
+    """
+    return reaction_time / accuracy if accuracy else reaction_time
+
+class ScoreHistory:
+    """Every submitted run in SQLite, indexed by mode, player and date.
+
+    Leaderboard queries walk the (mode, time) index and per-player queries the
+    (name, mode, ...) indexes, so they never scan the whole table. Ranks come
+    from rank_tree, a Fenwick tree per mode and ordering over fixed-width
+    buckets of the score that every insert updates, so rank_of is O(log n)
+    however far down the board a run lands. Writes go through a
+    BackgroundWriter on their own connection; reads use a separate
+    connection, and WAL mode lets them run while a write is committing.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            mode TEXT NOT NULL,
+            name TEXT NOT NULL,
+            time REAL NOT NULL,
+            played_at REAL NOT NULL,
+            date TEXT NOT NULL,
+            seed INTEGER,
+            accuracy REAL
+        )""",
+        "CREATE INDEX IF NOT EXISTS runs_mode_time ON runs (mode, time)",
+        "CREATE INDEX IF NOT EXISTS runs_player_best ON runs (name, mode, time)",
+        "CREATE INDEX IF NOT EXISTS runs_player_recent ON runs (name, mode, played_at)",
+        "CREATE INDEX IF NOT EXISTS runs_played_at ON runs (played_at)",
+        # Each player's click offsets, summed over every submitted run (see accuracy.AccuracyMap)
+        """CREATE TABLE IF NOT EXISTS aim (
+            name TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            counts BLOB NOT NULL,
+            hits INTEGER NOT NULL,
+            misses INTEGER NOT NULL,
+            sum_dx REAL NOT NULL,
+            sum_dy REAL NOT NULL,
+            sum_distance REAL NOT NULL,
+            PRIMARY KEY (name, mode)
+        )""",
+        # Node `node` of the Fenwick tree counting each ordering's runs per score bucket (see rank_of)
+        """CREATE TABLE IF NOT EXISTS rank_tree (
+            mode TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            node INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (mode, kind, node)
+        ) WITHOUT ROWID"""
+    ]
+
+    # Accuracy-weighted time (weighted_time); runs from before accuracy was tracked count as 100%.
+    # Queries must use this exact expression for SQLite to walk the index below.
+    WEIGHTED = "time / COALESCE(accuracy, 1.0)"
+    ORDER = {"time": "time", "weighted": WEIGHTED}
+
+    # Rank buckets are 1/8192 s wide: a power of two, so bucket edges are exact in floating point and
+    # Python and SQLite agree on every score's bucket. Scores of 16 s or more share the last bucket.
+    RANK_SCALE = 8192
+    RANK_BUCKETS = 1 << 17
+
+    def __init__(self, path, writer=None):
+        self.path = path
+        self.writer = writer
+        self.conn = self._connect()
+        with self.conn:
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(runs)")]
+            if "seed" not in columns:
+                self.conn.execute("ALTER TABLE runs ADD COLUMN seed INTEGER")
+            if "accuracy" not in columns:
+                self.conn.execute("ALTER TABLE runs ADD COLUMN accuracy REAL")
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS runs_mode_weighted ON runs (mode, {self.WEIGHTED})")
+            if self.conn.execute("SELECT 1 FROM rank_tree LIMIT 1").fetchone() is None and not self.is_empty():
+                self._build_rank_tree()  # Once, for a database from before rank_tree
+        self.write_conn = None  # Opened on the writer thread
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record_run(self, mode, name, reaction_time, played_at=None, seed=None, accuracy=None):
+        """Queue a run for insertion (runs on the writer thread when there is one)"""
+        row = (mode, name, reaction_time, played_at if played_at is not None else time.time(), seed, accuracy)
+        if self.writer is not None:
+            self.writer.submit(self.add_runs, [row])
+        else:
+            self.add_runs([row])
+
+    def add_runs(self, rows):
+        """Insert (mode, name, time, played_at, seed) rows, each optionally followed by the run's accuracy"""
+        values = []
+        buckets = {}  # (mode, kind, bucket) -> runs
+        for mode, name, t, at, seed, *accuracy in rows:
+            accuracy = accuracy[0] if accuracy else None
+            values.append((mode, name, t, at, datetime.fromtimestamp(at).strftime('%m/%d/%y'), seed, accuracy))
+            for kind in self.ORDER:
+                key = (mode, kind, self._rank_bucket(self._score(t, accuracy, kind)))
+                buckets[key] = buckets.get(key, 0) + 1
+        with self.lock:
+            if self.write_conn is None:
+                self.write_conn = self._connect()
+            with self.write_conn:
+                self.write_conn.executemany(
+                    "INSERT INTO runs (mode, name, time, played_at, date, seed, accuracy) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    values
+                )
+                self._add_to_rank_tree(self.write_conn, buckets)
+
+    def _score(self, reaction_time, accuracy, kind):
+        """What a run is ranked by: the same value as ORDER[kind] computes in SQL"""
+        return weighted_time(reaction_time, accuracy) if kind == "weighted" else reaction_time
+
+    def _rank_bucket(self, score):
+        return min(max(int(score * self.RANK_SCALE), 0), self.RANK_BUCKETS - 1)
+
+    def _add_to_rank_tree(self, conn, buckets):
+        # Every node covering a bucket, summed over the batch first: a batch touches each node once
+        nodes = {}
+        for (mode, kind, bucket), runs in buckets.items():
+            node = bucket + 1
+            while node <= self.RANK_BUCKETS:
+                key = (mode, kind, node)
+                nodes[key] = nodes.get(key, 0) + runs
+                node += node & -node
+        conn.executemany(
+            "INSERT INTO rank_tree (mode, kind, node, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (mode, kind, node) DO UPDATE SET count = count + excluded.count",
+            [key + (runs,) for key, runs in nodes.items()]
+        )
+
+    def _build_rank_tree(self):
+        buckets = {}
+        for kind, order in self.ORDER.items():
+            rows = self.conn.execute(
+                f"SELECT mode, MIN(MAX(CAST({order} * {self.RANK_SCALE} AS INTEGER), 0), {self.RANK_BUCKETS - 1}) AS bucket, COUNT(*) "
+                "FROM runs GROUP BY mode, bucket"
+            )
+            for mode, bucket, runs in rows:
+                buckets[(mode, kind, bucket)] = runs
+        self._add_to_rank_tree(self.conn, buckets)
+
+    def record_aim(self, name, mode, aim):
+        """Queue a round's AccuracyMap to be added to the player's"""
+        aim = aim.copy()  # The game reuses its map for the next round
+        if self.writer is not None:
+            self.writer.submit(self._add_aim, name, mode, aim)
+        else:
+            self._add_aim(name, mode, aim)
+
+    def _add_aim(self, name, mode, aim):
+        from accuracy import AccuracyMap  # NumPy; only needed once a round has been played
+        with self.lock:
+            if self.write_conn is None:
+                self.write_conn = self._connect()
+            with self.write_conn:
+                row = self.write_conn.execute(
+                    "SELECT counts, hits, misses, sum_dx, sum_dy, sum_distance FROM aim WHERE name = ? AND mode = ?",
+                    (name, mode)
+                ).fetchone()
+                if row is not None:
+                    aim.merge(AccuracyMap.from_row(row))
+                self.write_conn.execute(
+                    "INSERT OR REPLACE INTO aim (name, mode, counts, hits, misses, sum_dx, sum_dy, sum_distance) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, mode) + aim.to_row()
+                )
+
+    def player_aim(self, name, mode):
+        """The player's AccuracyMap over every submitted run, or None"""
+        row = self.conn.execute(
+            "SELECT counts, hits, misses, sum_dx, sum_dy, sum_distance FROM aim WHERE name = ? AND mode = ?",
+            (name, mode)
+        ).fetchone()
+        if row is None:
+            return None
+        from accuracy import AccuracyMap
+        return AccuracyMap.from_row(row)
+
+    def clear(self, mode=None):
+        if self.writer is not None:
+            self.writer.submit(self._clear, mode)
+        else:
+            self._clear(mode)
+
+    def _clear(self, mode):
+        with self.lock:
+            if self.write_conn is None:
+                self.write_conn = self._connect()
+            with self.write_conn:
+                if mode:
+                    self.write_conn.execute("DELETE FROM runs WHERE mode = ?", (mode,))
+                    self.write_conn.execute("DELETE FROM aim WHERE mode = ?", (mode,))
+                    self.write_conn.execute("DELETE FROM rank_tree WHERE mode = ?", (mode,))
+                else:
+                    self.write_conn.execute("DELETE FROM runs")
+                    self.write_conn.execute("DELETE FROM aim")
+                    self.write_conn.execute("DELETE FROM rank_tree")
+
+    def top_scores(self, mode, limit=10, rank_by="time"):
+        rows = self.conn.execute(
+            f"SELECT name, time, date, seed, accuracy FROM runs WHERE mode = ? ORDER BY {self.ORDER[rank_by]} LIMIT ?",
+            (mode, limit)
+        ).fetchall()
+        scores = []
+        for name, t, date, seed, accuracy in rows:
+            entry = {'name': name, 'time': t, 'date': date, 'seed': seed}
+            if accuracy is not None:
+                entry['accuracy'] = accuracy
+            scores.append(entry)
+        return scores
+
+    def rank_of(self, mode, reaction_time, accuracy=None, rank_by="time"):
+        """Leaderboard position a run with this time (and accuracy) would take (1 = best).
+
+        Runs in faster buckets are the sum of at most 17 rank_tree nodes; the
+        few runs sharing the score's bucket are counted exactly from the
+        (mode, time) or (mode, weighted) index. One statement, so both
+        counts come from the same snapshot.
+        """
+        order = self.ORDER[rank_by]
+        score = self._score(reaction_time, accuracy, rank_by)
+        bucket = self._rank_bucket(score)
+        nodes = []
+        node = bucket  # Prefix of buckets 0 .. bucket - 1
+        while node > 0:
+            nodes.append(node)
+            node -= node & -node
+        (faster,) = self.conn.execute(
+            f"SELECT (SELECT COALESCE(SUM(count), 0) FROM rank_tree WHERE mode = ? AND kind = ? AND node IN ({', '.join('?' * len(nodes))}))"
+            f" + (SELECT COUNT(*) FROM runs WHERE mode = ? AND {order} >= ? AND {order} < ?)",
+            (mode, rank_by, *nodes, mode, bucket / self.RANK_SCALE, score)
+        ).fetchone()
+        return faster + 1
+
+    def personal_best(self, name, mode):
+        (best,) = self.conn.execute(
+            "SELECT MIN(time) FROM runs WHERE name = ? AND mode = ?",
+            (name, mode)
+        ).fetchone()
+        return best
+
+    def rolling_average(self, name, mode, window=10):
+        """Average of the player's most recent `window` runs in a mode"""
+        (average,) = self.conn.execute(
+            "SELECT AVG(time) FROM (SELECT time FROM runs WHERE name = ? AND mode = ? ORDER BY played_at DESC LIMIT ?)",
+            (name, mode, window)
+        ).fetchone()
+        return average
+
+    def player_history(self, name, mode, limit=100):
+        """Most recent runs first"""
+        rows = self.conn.execute(
+            "SELECT time, played_at, date, seed FROM runs WHERE name = ? AND mode = ? ORDER BY played_at DESC LIMIT ?",
+            (name, mode, limit)
+        ).fetchall()
+        return [{'time': t, 'played_at': at, 'date': date, 'seed': seed} for t, at, date, seed in rows]
+
+    def count(self, mode=None):
+        if mode:
+            return self.conn.execute("SELECT COUNT(*) FROM runs WHERE mode = ?", (mode,)).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def is_empty(self):
+        # COUNT(*) walks the whole table; this stops at the first row
+        return self.conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is None
+
+    def close(self):
+        with self.lock:
+            if self.write_conn is not None:
+                self.write_conn.close()
+                self.write_conn = None
+        self.conn.close()
@@ -1,45 +1,204 @@
+import time
+STARTED_NS = time.perf_counter_ns()  # Before the imports, so they show up in the startup report
+
+import argparse
+import json
+import os
 import pygame
 from game import Game
+from highscores import Highscores
+from memory import MemoryMonitor
+from metrics import MetricsExporter
+from pacing import MODES as PACING_MODES, FramePacer
+from profiler import FrameProfiler
+from scheduler import FrameScheduler
+from scoreclient import LeaderboardClient
+from timing import StartupTimer, now_ns
 from ui.window import GameWindow
+from versus import VersusMatch, VersusPeer, parse_address
+
+def handle_event(game, event, event_ns):
+    if event.type == pygame.QUIT:
+        game.running = False
+    elif event.type == pygame.KEYDOWN:
+        if event.key == pygame.K_ESCAPE:
+            game.running = False
+        else:
+            game.handle_keydown(event, event_ns)
+    elif event.type == pygame.MOUSEBUTTONDOWN:
+        game.handle_click(event.pos, event_ns)
+    elif event.type == pygame.MOUSEMOTION:
+        game.handle_motion(event.pos, event_ns)
+    elif event.type == pygame.VIDEORESIZE and game.window is not None:
+        game.window.resize(event.w, event.h)
+
+def render_frame(game, window, overlay=None):
+    if game.versus is not None:
+        overlay = game.versus.status_lines() + (overlay or [])
+    window.update_display(
+        game.state,
+        game.visible_targets(),
+        game.clicks,
+        game.max_clicks,
+        game.average_reaction_time(),
+        game.highscores,
+        game.input_text,
+        game.current_mode,
+        game.countdown_time,  # Add countdown time parameter
+        overlay=overlay,
+        aim=game.aim
+    )
+    game.frame_presented(window.last_present_ns)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="FPS reflex target practice")
+    parser.add_argument("--profile", nargs="?", const="frame_profile.json", default=None, metavar="PATH",
+                        help="Time each frame phase (F3 toggles the overlay) and write histograms to PATH on exit")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print how long each startup phase took once the first frame is on screen")
+    parser.add_argument("--leaderboard", default=None, metavar="HOST:PORT",
+                        help="Also submit scores to, and show the boards of, a shared leaderboard service")
+    parser.add_argument("--kiosk", default=None, help="Name this machine reports to the leaderboard service")
+    parser.add_argument("--poll", action="store_true",
+                        help="Poll and render at 60 FPS on every screen instead of sleeping on menus until input arrives")
+    parser.add_argument("--cpu-report", action="store_true", help="Print wall and CPU time per game state on exit")
+    parser.add_argument("--data-dir", default=os.environ.get("FPS_REFLEX_DATA", "."), metavar="DIR",
+                        help="Where scores, player profiles, telemetry, recordings and caches are kept (default: $FPS_REFLEX_DATA or the current directory)")
+    parser.add_argument("--rank-by", choices=["time", "weighted"], default="time",
+                        help="Rank leaderboards by raw time or by time divided by accuracy; default time")
+    parser.add_argument("--pacing", choices=PACING_MODES, default="tick",
+                        help="How countdown and play frames are paced (see src/pacing.py); default tick")
+    parser.add_argument("--fps", type=int, default=None,
+                        help="Frame rate for tick, busy and refresh pacing (default 60; refresh: the display's rate)")
+    parser.add_argument("--late-latch", action="store_true",
+                        help="Wait before polling input instead of after presenting, so input is read as late as possible")
+    parser.add_argument("--versus-host", type=int, default=None, metavar="PORT",
+                        help="Wait on UDP PORT for another kiosk to race head-to-head")
+    parser.add_argument("--versus-join", default=None, metavar="HOST:PORT", help="Race the kiosk hosting at HOST:PORT")
+    parser.add_argument("--name", default=None, help="Name shown to the opponent (default: the last name entered)")
+    parser.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", default=None, metavar="PATH",
+                        help="Rewrite Prometheus metrics to PATH every --metrics-interval seconds")
+    parser.add_argument("--metrics-interval", type=float, default=15.0, metavar="SECONDS")
+    parser.add_argument("--memory-log", default=None, metavar="PATH",
+                        help="Trace allocations and append a memory sample to PATH (JSON lines) every --memory-interval rounds")
+    parser.add_argument("--memory-interval", type=int, default=10, metavar="ROUNDS")
+    parser.add_argument("--latency-report", action="store_true",
+                        help="Print the pacing mode's input-to-present latency and frame intervals on exit")
+    return parser.parse_args(argv)
+
+def connect_leaderboard(address, kiosk=None, data_dir="."):
+    host, _, port = address.rpartition(":")
+    return LeaderboardClient(host or "127.0.0.1", int(port), kiosk=kiosk,
+                             spool_path=os.path.join(data_dir, "leaderboard_spool.jsonl"))
+
+def main(argv=None):
+    startup = StartupTimer(STARTED_NS)
+    args = parse_args(argv)
+    startup.mark("imports")
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    # Only the subsystems the game uses; pygame.init() would also open audio and joysticks
+    pygame.display.init()
+    pygame.font.init()
 
-def main():
-    pygame.init()
-    
     # Get the current screen resolution
     info = pygame.display.Info()
-    window = GameWindow(info.current_w, info.current_h)
-    
-    game = Game()
+    window = GameWindow(info.current_w, info.current_h, font_cache=os.path.join(args.data_dir, "font_cache.json"))
+    window.rank_by = args.rank_by
+    startup.mark("display")
+
+    exporter = None
+    if args.metrics_port is not None or args.metrics_file:
+        exporter = MetricsExporter(port=args.metrics_port, path=args.metrics_file, interval=args.metrics_interval)
+
+    remote = connect_leaderboard(args.leaderboard, args.kiosk, args.data_dir) if args.leaderboard else None
+    highscores = Highscores(os.path.join(args.data_dir, "highscores.json"), remote=remote)
+    game = Game(highscores, telemetry_dir=os.path.join(args.data_dir, "telemetry"),
+                recordings_dir=os.path.join(args.data_dir, "recordings"))
     game.window = window
+    if args.memory_log:
+        game.memory = MemoryMonitor(args.memory_interval, args.memory_log).start()
+    if args.versus_host is not None or args.versus_join:
+        name = args.name or game.highscores.last_player_name or "PLAYER"
+        if args.versus_join:
+            peer = VersusPeer(name, remote=parse_address(args.versus_join), area=(window.width, window.height))
+        else:
+            peer = VersusPeer(name, port=args.versus_host, area=(window.width, window.height))
+        game.versus = VersusMatch(peer)
     game.generate_target()
-    
+    startup.mark("scores")
+
+    # Fonts resolve and load here, on first use
+    render_frame(game, window)
+    startup.mark("first_frame")
+    if args.startup_report:
+        resolver = window.fonts.resolver
+        print(startup.report())
+        print(f"  font resolve {resolver.resolve_ns / 1e6:.1f} ms ({'cached' if resolver.cache_hit else 'system font scan'})")
+        print(f"  font load    {window.fonts.load_ns / 1e6:.1f} ms ({len(window.fonts.fonts)} sizes)")
+
+    # Profiling is opt-in; when off the loop only pays for the `is not None` checks
+    profiler = FrameProfiler() if args.profile else None
+    # Menus sleep until input; countdown and play run at the frame rate
+    # (a head-to-head lobby wakes often enough to answer the other kiosk promptly)
+    scheduler = FrameScheduler(idle=not args.poll, pacer=FramePacer(args.pacing, args.fps, args.late_latch),
+                               idle_timeout_ms=50 if game.versus is not None else 1000)
+
     while game.running:
-        game.update()  # Add update call for countdown
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                game.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    game.running = False
-                else:
-                    game.handle_keydown(event)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                game.handle_click(pygame.mouse.get_pos())
-        
-        window.update_display(
-            game.state,
-            [game.current_target] if game.current_target else [],
-            game.clicks,
-            game.max_clicks,
-            game.average_reaction_time(),
-            game.highscores,
-            game.input_text,
-            game.current_mode,
-            game.countdown_time  # Add countdown time parameter
-        )
-        window.clock.tick(60)
+        if profiler is None:
+            game.update()  # Add update call for countdown
+            for event in scheduler.wait_events(game.state):
+                handle_event(game, event, now_ns())  # Stamp as soon as the event is dequeued
+
+            render_frame(game, window)
+            scheduler.tick(game.state, window.last_present_ns)
+        else:
+            run_profiled_frame(game, window, profiler, scheduler)
 
+    if profiler is not None:
+        profiler.dump(args.profile)
+    if args.cpu_report:
+        print(json.dumps(scheduler.report(), indent=2))
+    if args.latency_report:
+        print(json.dumps(scheduler.pacer.report(), indent=2))
+    if game.versus is not None:
+        game.versus.peer.close()
+    game.highscores.close()  # Let queued score writes reach the disk
+    if exporter is not None:
+        exporter.close()
     window.close()
 
+def run_profiled_frame(game, window, profiler, scheduler):
+    """The same frame as the plain loop in main(), with every phase timed"""
+    frame_start = now_ns()
+    game.update()
+    update_end = now_ns()
+    profiler.record("update", update_end - frame_start)
+
+    first_input_ns = None
+    for event in scheduler.wait_events(game.state):
+        event_ns = now_ns()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.overlay = not profiler.overlay
+            continue
+        if first_input_ns is None and event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+            first_input_ns = event_ns
+        handle_event(game, event, event_ns)
+    events_end = now_ns()
+    profiler.record("events", events_end - update_end)
+
+    render_frame(game, window, profiler.overlay_lines() if profiler.overlay else None)
+    render_end = now_ns()
+    profiler.record("render", render_end - events_end)
+    if first_input_ns is not None:
+        profiler.record("event_latency", window.last_present_ns - first_input_ns)
+
+    scheduler.tick(game.state, window.last_present_ns)
+    frame_end = now_ns()
+    profiler.record("tick", frame_end - render_end)
+    profiler.end_frame(render_end - frame_start, frame_end - frame_start)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
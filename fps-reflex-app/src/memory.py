@@ -0,0 +1,172 @@
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import pygame
+
+# Allocations made by the instrumentation itself aren't the game's
+IGNORED = (__file__, tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource  # Peak rather than current RSS, but still shows growth
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+def count_objects(type_names=("Target",)):
+    """Live instances of the named Python classes, plus pygame Surfaces and Fonts.
+
+    Surfaces and fonts aren't tracked by the garbage collector, so they are
+    found through the containers and objects that refer to them.
+    """
+    counts = dict.fromkeys(type_names, 0)
+    media = {}
+    objects = gc.get_objects()
+    for obj in objects:
+        name = type(obj).__name__
+        if name in counts:
+            counts[name] += 1
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, (pygame.Surface, pygame.font.Font)):
+                media[id(referent)] = type(referent).__name__
+    counts["Surface"] = sum(1 for name in media.values() if name == "Surface")
+    counts["Font"] = len(media) - counts["Surface"]
+    counts["gc_objects"] = len(objects)
+    return counts
+
+def game_sizes(game):
+    """Lengths of the containers that grow with play"""
+    sizes = {
+        "reaction_times": len(game.reaction_times),
+        "pooled_targets": len(game.target_pool.free),
+        "telemetry_events": len(game.telemetry)
+    }
+    scores = getattr(game.highscores, "scores", None)
+    if scores is not None:
+        sizes["scores"] = sum(len(board) for board in scores.values())
+    profiles = getattr(game.highscores, "profiles", None)
+    if profiles is not None:
+        sizes["profiles"] = len(profiles.profiles)
+    window = game.window
+    if window is not None and hasattr(window, "text_cache"):
+        sizes["text_cache"] = len(window.text_cache)
+        sizes["scenes"] = len(window.scenes.scenes) + len(window.scenes.spares)
+        sizes["fonts"] = len(window.fonts.fonts)
+    return sizes
+
+class MemoryMonitor:
+    """Opt-in memory instrumentation for games left running for days.
+
+    Game.reset_game calls round_started() at every round boundary. Every
+    `interval` rounds a sample is taken: RSS, traced heap size, live
+    Surface/Font/Target counts and the sizes of the game's containers,
+    plus a tracemalloc snapshot diffed by allocation site against the
+    first one. That first snapshot is the baseline, so the caches filled
+    during the first `interval` rounds don't count as growth. With `path`
+    each sample is appended there as one JSON line as soon as it is taken.
+    """
+
+    def __init__(self, interval=10, path=None, frames=1, top=5):
+        self.interval = interval
+        self.path = path
+        self.frames = frames  # Stack depth per allocation; 1 is cheapest
+        self.top = top
+        self.rounds = 0
+        self.samples = []
+        self.baseline = None
+        self.latest = None
+        self.started_here = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_here = True
+        return self
+
+    def stop(self):
+        if self.started_here:
+            tracemalloc.stop()
+            self.started_here = False
+
+    def round_started(self, game):
+        self.rounds += 1
+        if self.rounds % self.interval == 0:
+            self.sample(game)
+
+    def sample(self, game):
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in IGNORED])
+        if self.baseline is None:
+            self.baseline = snapshot
+        self.latest = snapshot
+        traced, peak = tracemalloc.get_traced_memory()
+        sample = {
+            "round": self.rounds,
+            "time": time.time(),
+            "rss_bytes": rss_bytes(),
+            "traced_bytes": traced,
+            "traced_peak_bytes": peak,
+            "objects": count_objects(),
+            "sizes": game_sizes(game),
+            "growth_sites": self.growth_sites(self.top)
+        }
+        self.samples.append(sample)
+        if self.path is not None:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(sample) + "\n")
+        return sample
+
+    def growth_sites(self, limit=None):
+        """Allocation sites that grew most since the baseline snapshot"""
+        if self.latest is None or self.latest is self.baseline:
+            return []
+        stats = [stat for stat in self.latest.compare_to(self.baseline, "lineno") if stat.size_diff > 0]
+        return [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff
+            }
+            for stat in stats[:limit]
+        ]
+
+    def growth(self):
+        """Change from the first sample to the last, overall and per round"""
+        if len(self.samples) < 2:
+            return None
+        first, last = self.samples[0], self.samples[-1]
+        rounds = last["round"] - first["round"]
+        return {
+            "rounds": rounds,
+            "rss_bytes": last["rss_bytes"] - first["rss_bytes"],
+            "traced_bytes": last["traced_bytes"] - first["traced_bytes"],
+            "traced_bytes_per_round": (last["traced_bytes"] - first["traced_bytes"]) / rounds,
+            "objects": {name: count - first["objects"].get(name, 0) for name, count in last["objects"].items()},
+            "sizes": {name: size - first["sizes"].get(name, 0) for name, size in last["sizes"].items()}
+        }
+
+    def check(self, max_bytes_per_round=None, max_rss_growth=None):
+        """Reasons the run exceeded the growth thresholds; empty when it didn't"""
+        growth = self.growth()
+        if growth is None:
+            return ["not enough samples to measure growth"]
+        failures = []
+        if max_bytes_per_round is not None and growth["traced_bytes_per_round"] > max_bytes_per_round:
+            failures.append(f"heap grew {growth['traced_bytes_per_round']:.0f} bytes/round (limit {max_bytes_per_round})")
+        if max_rss_growth is not None and growth["rss_bytes"] > max_rss_growth:
+            failures.append(f"RSS grew {growth['rss_bytes']} bytes (limit {max_rss_growth})")
+        return failures
+
+    def summary(self):
+        return {
+            "interval": self.interval,
+            "samples": len(self.samples),
+            "growth": self.growth(),
+            "growth_sites": self.growth_sites(self.top)
+        }
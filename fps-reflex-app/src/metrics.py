@@ -0,0 +1,283 @@
+import argparse
+import os
+import threading
+import time
+from profiler import Histogram
+
+# Reaction and frame times sit well under a second; the top buckets catch stalls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.0167, 0.025, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1.0, 2.5, 5.0)
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+class Gauge:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0
+        self.function = None  # Read on the exporter's thread instead of `value`, when set
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set_function(self, function):
+        self.function = function
+
+    def read(self):
+        return self.function() if self.function is not None else self.value
+
+class LatencyHistogram(Histogram):
+    """The profiler's fixed-array histogram; Prometheus buckets are only worked out when scraped"""
+
+    def observe(self, seconds):
+        self.record(int(seconds * 1e9))
+
+    observe_ns = Histogram.record
+
+KINDS = {"counter": Counter, "gauge": Gauge, "histogram": LatencyHistogram}
+
+class Family:
+    """A named metric and its children, one per combination of label values.
+
+    labels() creates a child the first time a combination is seen and is a
+    dict lookup after that; metrics without labels have a single child and
+    forward inc/set/observe to it.
+    """
+
+    def __init__(self, name, help, kind, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self.children = {}
+        if not self.labelnames:
+            child = self.labels()
+            for method in ("inc", "dec", "set", "set_function", "observe", "observe_ns"):
+                if hasattr(child, method):
+                    setattr(self, method, getattr(child, method))
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            child = self.children[values] = KINDS[self.kind]()
+        return child
+
+    def render(self, lines):
+        lines.append(f"# HELP {self.name} {_escape(self.help, help=True)}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for values, child in list(self.children.items()):
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+            if self.kind == "histogram":
+                self._render_histogram(lines, labels, child)
+            else:
+                value = child.read() if self.kind == "gauge" else child.value
+                lines.append(f"{self.name}{_labels(labels)} {_number(value)}")
+
+    def _render_histogram(self, lines, labels, histogram):
+        # Each fixed bucket counts the recorded values whose bucket lower bound is
+        # at or below it, so a boundary is accurate to the histogram's ~3%
+        counts = [0] * len(self.buckets)
+        total = 0
+        for bucket, count in enumerate(histogram.counts):
+            if count:
+                total += count
+                seconds = histogram.lower_bound(bucket) / 1e9
+                for i, bound in enumerate(self.buckets):
+                    if seconds <= bound:
+                        counts[i] += count
+                        break
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            le = 'le="' + _number(bound) + '"'
+            lines.append(f"{self.name}_bucket{_labels(labels + [le])} {cumulative}")
+        le = 'le="+Inf"'
+        lines.append(f"{self.name}_bucket{_labels(labels + [le])} {total}")
+        lines.append(f"{self.name}_sum{_labels(labels)} {_number(histogram.sum / 1e9)}")
+        lines.append(f"{self.name}_count{_labels(labels)} {total}")
+
+class Registry:
+    """All metrics of the process, rendered in the Prometheus text format.
+
+    Updates happen on the game loop (and the writer thread) with no lock:
+    each child is written by one thread only, and a scrape reads plain
+    attribute values, so at worst it sees a histogram mid-update whose
+    count is off by one until the next scrape.
+    """
+
+    def __init__(self):
+        self.families = {}
+        self.lock = threading.Lock()  # Guards registration only
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(name, help, "counter", labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        return self._register(name, help, "gauge", labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(name, help, "histogram", labelnames, buckets)
+
+    def _register(self, name, help, kind, labelnames, buckets=DEFAULT_BUCKETS):
+        with self.lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = Family(name, help, kind, labelnames, buckets)
+            elif family.kind != kind or family.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name} is already registered as a different {family.kind}")
+            return family
+
+    def render(self):
+        lines = []
+        for family in list(self.families.values()):
+            family.render(lines)
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+def _escape(value, help=False):
+    value = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+    return value if help else value.replace('"', '\\"')
+
+def _labels(labels):
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+class MetricsExporter:
+    """Serves the registry over HTTP on a local port and/or rewrites it to a file periodically.
+
+    Both run on daemon threads. The file is replaced atomically, so it can
+    be picked up by node_exporter's textfile collector.
+    """
+
+    def __init__(self, registry=REGISTRY, port=None, host="127.0.0.1", path=None, interval=15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.server = None
+        self.threads = []
+        self.stopping = threading.Event()
+        if port is not None:
+            from http.server import ThreadingHTTPServer  # Only loaded when serving; it's a slow import
+            self.server = ThreadingHTTPServer((host, port), self._handler())
+            self.server.daemon_threads = True
+            self.port = self.server.server_address[1]
+            self.threads.append(threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True))
+        if path is not None:
+            self.threads.append(threading.Thread(target=self._write_loop, name="metrics-file", daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    def write(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(self.registry.render())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        self.stopping.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        for thread in self.threads:
+            thread.join(5)
+        if self.path is not None:
+            self.write()  # Final values
+
+    def _write_loop(self):
+        while not self.stopping.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Could not write metrics to {self.path}: {e}")
+
+    def _handler(self):
+        from http.server import BaseHTTPRequestHandler
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        return Handler
+
+def benchmark(iterations=1_000_000):
+    """Nanoseconds per update call, and per scrape of a populated registry"""
+    registry = Registry()
+    counter = registry.counter("bench_total", "Counter")
+    labeled = registry.counter("bench_labeled_total", "Labeled counter", ("mode",))
+    histogram = registry.histogram("bench_seconds", "Histogram")
+    labeled.labels("quick")
+
+    results = {}
+    for name, call in (
+        ("counter_inc", lambda: counter.inc()),
+        ("labeled_counter_inc", lambda: labeled.labels("quick").inc()),
+        ("histogram_observe", lambda: histogram.observe_ns(1_234_567)),
+    ):
+        started = time.perf_counter_ns()
+        for _ in range(iterations):
+            call()
+        results[name + "_ns"] = (time.perf_counter_ns() - started) / iterations
+    # The loop and lambda call are part of each figure above; subtract an empty call
+    started = time.perf_counter_ns()
+    empty = lambda: None
+    for _ in range(iterations):
+        empty()
+    baseline = (time.perf_counter_ns() - started) / iterations
+    for name in list(results):
+        results[name] = max(results[name] - baseline, 0.0)
+
+    started = time.perf_counter_ns()
+    REGISTRY.render()
+    results["render_ms"] = (time.perf_counter_ns() - started) / 1e6
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure what metric updates cost the game loop")
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    # Register the game's, window's and highscores' metrics so the render time is realistic
+    import game
+    import ui.window
+
+    results = benchmark(args.iterations)
+    for name, value in results.items():
+        print(f"{name:<24} {value:10.3f}")
+    # GameWindow.update_display makes one observe, one inc and rarely a second inc per frame
+    per_frame = results["histogram_observe_ns"] + results["counter_inc_ns"]
+    print(f"per 60 Hz frame: {per_frame:.0f} ns of a 16.7 ms frame ({per_frame / 16_666_667:.6%})")
+
+if __name__ == "__main__":
+    main()
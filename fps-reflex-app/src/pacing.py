@@ -0,0 +1,201 @@
+import argparse
+import json
+import time
+import pygame
+from profiler import Histogram
+from timing import now_ns
+
+MODES = ("tick", "busy", "uncapped", "refresh")
+
+def display_refresh_rate(default=60):
+    """Refresh rate of the current display where pygame can report it, otherwise `default`"""
+    query = getattr(pygame.display, "get_current_refresh_rate", None)  # Not in every pygame build
+    rate = query() if query is not None else 0
+    return rate or default
+
+def wait_until(deadline_ns, spin_ns, now=now_ns, sleep=time.sleep):
+    """Sleep until `spin_ns` before the deadline, then spin the rest"""
+    remaining = deadline_ns - now()
+    if remaining > spin_ns:
+        sleep((remaining - spin_ns) / 1e9)
+    while now() < deadline_ns:
+        pass
+
+class FramePacer:
+    """How an active frame waits for the next one, and the input latency that costs.
+
+    tick      Clock.tick(fps): sleeps with the OS timer's granularity (the old behaviour)
+    busy      Clock.tick_busy_loop(fps): hits the frame time exactly but keeps a core busy
+    uncapped  no wait at all
+    refresh   a fixed present schedule at the display's refresh rate (or `fps`); sleeps
+              until `spin_ns` before each deadline and spins the rest
+
+    With `late_latch` the wait moves in front of input: the loop sleeps until
+    only the recent render cost plus `latch_margin_ns` is left before the
+    next frame is due, then polls events, renders and presents, so input
+    spends less of the frame waiting in the queue. It pays off where the
+    present waits for the display's refresh; on an unsynced display the
+    present already follows the poll closely, and `python src/pacing.py`
+    shows which is the case on a given machine.
+
+    An event read at a poll arrived some time after the previous poll, so
+    each frame records present minus the midpoint of the two polls as the
+    expected input-to-present latency, and present minus the previous poll
+    as the worst case.
+
+    `now` and `sleep` are the clock the refresh schedule, the latch and the
+    accounting run on; tests pass a simulated one. tick and busy wait on
+    pygame's own clock.
+    """
+
+    def __init__(self, mode="tick", fps=None, late_latch=False, latch_margin_ns=1_000_000, spin_ns=2_000_000,
+                 now=now_ns, sleep=time.sleep):
+        if mode not in MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}")
+        self.mode = mode
+        self.fps = fps or (display_refresh_rate() if mode == "refresh" else 60)
+        self.period_ns = int(1e9 / self.fps)
+        self.late_latch = late_latch and mode != "uncapped"
+        self.latch_margin_ns = latch_margin_ns
+        self.spin_ns = {"tick": 0, "busy": self.period_ns, "refresh": spin_ns}.get(mode, 0)
+        self.clock = pygame.time.Clock()
+        self.now = now
+        self.sleep = sleep
+
+        self.render_ns = 0  # Recent poll-to-present cost; rises at once, decays slowly
+        self.latency = Histogram()
+        self.worst_latency = Histogram()
+        self.intervals = Histogram()  # Present to present
+        self.frames = 0
+        self.wall_ns = 0
+        self.cpu_s = 0.0
+        self.pause()
+
+    def pause(self):
+        """Forget frame timing while the loop is idle, so the next active frame starts fresh"""
+        self.deadline_ns = None  # When the next frame is due
+        self.poll_ns = None
+        self.previous_poll_ns = None
+        self.present_ns = None
+        self.started = None  # (wall ns, cpu s) at the first frame of this active stretch
+
+    def latch(self):
+        """Called right before input is polled"""
+        if self.late_latch and self.deadline_ns is not None:
+            self._wait_until(self.deadline_ns - self.render_ns - self.latch_margin_ns)
+        self.previous_poll_ns = self.poll_ns
+        self.poll_ns = self.now()
+
+    def frame_done(self, present_ns):
+        """Called after the present; records latency and waits for the next frame"""
+        if self.poll_ns is not None and present_ns is not None:
+            work = present_ns - self.poll_ns
+            self.render_ns = max(work, self.render_ns - (self.render_ns - work) // 8)
+            if self.previous_poll_ns is not None:
+                self.latency.record(present_ns - (self.previous_poll_ns + self.poll_ns) // 2)
+                self.worst_latency.record(present_ns - self.previous_poll_ns)
+            if self.present_ns is not None:
+                self.intervals.record(present_ns - self.present_ns)
+            self.present_ns = present_ns
+        self._account()
+
+        if self.mode == "tick":
+            self.clock.tick(self.fps)
+        elif self.mode == "busy":
+            self.clock.tick_busy_loop(self.fps)
+        elif self.mode == "refresh":
+            # Absolute schedule, so the wait's own overshoot doesn't accumulate; a missed
+            # frame moves the schedule instead of rushing the next ones to catch up
+            deadline = (self.deadline_ns or self.now()) + self.period_ns
+            if self.late_latch:
+                deadline = max(deadline, self.now())  # The latch already waited for this frame
+            elif deadline > self.now():
+                self._wait_until(deadline)
+            else:
+                deadline = self.now()
+            self.deadline_ns = deadline
+            return
+        self.deadline_ns = self.now() + self.period_ns
+
+    def _wait_until(self, deadline_ns):
+        wait_until(deadline_ns, self.spin_ns, self.now, self.sleep)
+
+    def _account(self):
+        wall = self.now()
+        cpu = time.process_time()
+        if self.started is not None:
+            self.wall_ns += wall - self.started[0]
+            self.cpu_s += cpu - self.started[1]
+            self.frames += 1
+        self.started = (wall, cpu)
+
+    def report(self):
+        return {
+            "mode": self.mode,
+            "fps": self.fps,
+            "late_latch": self.late_latch,
+            "frames": self.frames,
+            "achieved_fps": self.frames * 1e9 / self.wall_ns if self.wall_ns else 0.0,
+            "cpu_percent": 100 * self.cpu_s * 1e9 / self.wall_ns if self.wall_ns else 0.0,
+            "input_to_present_ms": _summary(self.latency),
+            "worst_input_to_present_ms": _summary(self.worst_latency),
+            "frame_interval_ms": _summary(self.intervals)
+        }
+
+def _summary(histogram):
+    return {
+        "mean": histogram.mean() / 1e6,
+        "p50": histogram.percentile(0.50) / 1e6,
+        "p95": histogram.percentile(0.95) / 1e6,
+        "p99": histogram.percentile(0.99) / 1e6,
+        "max": histogram.max / 1e6
+    }
+
+def benchmark(window, game, seconds, fps=None):
+    """Play the same round under every pacing mode, with and without late latching"""
+    results = []
+    for mode in MODES:
+        for late_latch in ((False,) if mode == "uncapped" else (False, True)):
+            pacer = FramePacer(mode, fps, late_latch)
+            game.start_game("tracking")
+            game.begin_play()
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                game.update()
+                pacer.latch()
+                pygame.event.pump()
+                window.update_display(game.state, game.visible_targets(), game.clicks, game.max_clicks,
+                                      current_mode=game.current_mode)
+                pacer.frame_done(window.last_present_ns)
+            results.append(pacer.report())
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare frame pacing modes on this machine")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Time spent in each mode")
+    parser.add_argument("--fps", type=int, default=None, help="Frame rate for tick/busy/refresh (default 60, refresh: the display's)")
+    args = parser.parse_args(argv)
+
+    from game import Game
+    from replay import NoScores
+    from ui.window import GameWindow
+
+    pygame.display.init()
+    pygame.font.init()
+    info = pygame.display.Info()
+    window = GameWindow(info.current_w, info.current_h, font_cache="font_cache.json")
+    game = Game(NoScores())
+    game.window = window
+    results = benchmark(window, game, args.seconds, args.fps)
+    window.close()
+
+    print(json.dumps(results, indent=2))
+    print(f"{'mode':<10} {'latch':<6} {'fps':>7} {'cpu %':>6} {'latency ms':>11} {'p99':>7} {'worst p99':>10}")
+    for result in results:
+        latency = result["input_to_present_ms"]
+        print(f"{result['mode']:<10} {'yes' if result['late_latch'] else 'no':<6} {result['achieved_fps']:7.1f} "
+              f"{result['cpu_percent']:6.1f} {latency['mean']:11.2f} {latency['p99']:7.2f} "
+              f"{result['worst_input_to_present_ms']['p99']:10.2f}")
+
+if __name__ == "__main__":
+    main()
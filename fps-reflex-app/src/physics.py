@@ -0,0 +1,159 @@
+import numpy as np
+
+STEP_NS = 1_000_000_000 // 240  # Fixed simulation step, independent of the frame rate
+
+class MoverField:
+    """Moving targets simulated in fixed steps on NumPy arrays, one slot per target.
+
+    advance() runs however many whole steps fit before a timestamp; every
+    step updates all slots at once. Positions seen by the player (sync) and
+    by hit tests are interpolated between the last two steps at the exact
+    timestamp, so what is hit is what was drawn. The state at any time
+    depends only on the start time and the inserts, not on when advance()
+    was called, which keeps replays exact.
+
+    Exposes the same container interface as TargetField.
+    """
+
+    def __init__(self, width, height, capacity=64, step_ns=STEP_NS, max_speed=900.0):
+        self.width = width
+        self.height = height
+        self.step_ns = step_ns
+        self.dt = step_ns / 1e9
+        self.max_speed = max_speed
+        self.sim_ns = None  # Time of the current step; set by the first insert
+        self.pos = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.acc = np.zeros((capacity, 2))
+        self.radius = np.zeros((capacity, 1))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.rank = np.zeros(capacity, dtype=np.int64)  # Insertion number; higher is drawn on top
+        self.slots = {}  # target -> slot; dicts keep insertion (draw) order
+        self.owners = [None] * capacity  # slot -> target
+        self.free = list(range(capacity - 1, -1, -1))
+        self.next_rank = 0
+
+    def _grow(self):
+        capacity = len(self.alive)
+        for name in ("pos", "prev", "vel", "acc", "radius", "alive", "rank"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+        self.owners.extend([None] * capacity)
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def insert(self, target, vx=0.0, vy=0.0, ax=0.0, ay=0.0, timestamp_ns=None):
+        if self.sim_ns is None:
+            self.sim_ns = timestamp_ns if timestamp_ns is not None else 0
+        elif timestamp_ns is not None:
+            self.advance(timestamp_ns)
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        self.pos[slot] = self.prev[slot] = (target.x, target.y)
+        self.vel[slot] = (vx, vy)
+        self.acc[slot] = (ax, ay)
+        self.radius[slot] = target.size
+        self.alive[slot] = True
+        self.rank[slot] = self.next_rank
+        self.next_rank += 1
+        self.slots[target] = slot
+        self.owners[slot] = target
+
+    def remove(self, target):
+        slot = self.slots.pop(target)
+        self.alive[slot] = False
+        self.owners[slot] = None
+        self.free.append(slot)
+
+    def clear(self):
+        for target in list(self.slots):
+            self.remove(target)
+
+    def step(self):
+        """One fixed step for every slot (dead slots are simulated too; nobody reads them)"""
+        self.prev[:] = self.pos
+        self.vel += self.acc * self.dt
+        speed = np.sqrt(np.einsum("ij,ij->i", self.vel, self.vel))[:, None]
+        np.multiply(self.vel, np.minimum(1.0, self.max_speed / np.maximum(speed, 1e-9)), out=self.vel)
+        self.pos += self.vel * self.dt
+
+        # Reflect off the screen edges; acceleration flips with velocity so movers don't pin to a wall
+        low = self.radius
+        high = np.array([self.width, self.height]) - self.radius
+        below = self.pos < low
+        above = self.pos > high
+        self.pos[:] = np.where(below, 2 * low - self.pos, np.where(above, 2 * high - self.pos, self.pos))
+        np.clip(self.pos, low, high, out=self.pos)  # A mover faster than the screen is wide stays on screen
+        bounced = below | above
+        direction = np.where(below, 1.0, -1.0)
+        self.vel[:] = np.where(bounced, direction * np.abs(self.vel), self.vel)
+        self.acc[:] = np.where(bounced, direction * np.abs(self.acc), self.acc)
+        self.sim_ns += self.step_ns
+
+    def advance(self, timestamp_ns):
+        """Run every whole step that ends at or before timestamp_ns"""
+        if self.sim_ns is None:
+            return
+        while timestamp_ns - self.sim_ns >= self.step_ns:
+            self.step()
+
+    def positions_at(self, timestamp_ns):
+        """Interpolated (capacity, 2) positions at a timestamp no earlier than the last step"""
+        self.advance(timestamp_ns)
+        alpha = min(max((timestamp_ns - self.sim_ns) / self.step_ns, 0.0), 1.0)
+        return self.prev + (self.pos - self.prev) * alpha
+
+    def sync(self, timestamp_ns):
+        """Move the Target objects to where they are at timestamp_ns, for drawing"""
+        if not self.slots:
+            return
+        positions = self.positions_at(timestamp_ns)
+        slots = list(self.slots.values())
+        for target, (x, y) in zip(self.slots, positions[slots].tolist()):
+            target.x = x
+            target.y = y
+
+    def hit_test(self, x, y, nearest=False, timestamp_ns=None):
+        """Return the clicked target (topmost, or nearest center if `nearest`) at timestamp_ns, or None"""
+        if not self.slots:
+            return None
+        positions = self.positions_at(timestamp_ns) if timestamp_ns is not None else self.pos
+        offset = positions - (x, y)
+        distance_squared = np.einsum("ij,ij->i", offset, offset)
+        hits = self.alive & (distance_squared <= self.radius[:, 0] ** 2)
+        if not hits.any():
+            return None
+        candidates = np.flatnonzero(hits)
+        if nearest:
+            slot = candidates[np.argmin(distance_squared[candidates])]
+        else:
+            slot = candidates[np.argmax(self.rank[candidates])]
+        return self.owners[slot]
+
+    def nearest(self, x, y, timestamp_ns=None):
+        """The target whose center is closest at timestamp_ns, hit or not"""
+        if not self.slots:
+            return None
+        positions = self.positions_at(timestamp_ns) if timestamp_ns is not None else self.pos
+        offset = positions - (x, y)
+        distance_squared = np.where(self.alive, np.einsum("ij,ij->i", offset, offset), np.inf)
+        return self.owners[int(np.argmin(distance_squared))]
+
+    def position_of(self, target, timestamp_ns=None):
+        positions = self.positions_at(timestamp_ns) if timestamp_ns is not None else self.pos
+        x, y = positions[self.slots[target]]
+        return float(x), float(y)
+
+    @property
+    def targets(self):
+        return list(self.slots)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, target):
+        return target in self.slots
+
+    def __iter__(self):
+        return iter(self.slots)
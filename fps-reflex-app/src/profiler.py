@@ -0,0 +1,114 @@
+import json
+from array import array
+
+class Histogram:
+    """Log-linear (HDR-style) histogram of nanosecond durations in a fixed-size array.
+
+    Values below 32 get exact buckets; above that every power of two is split
+    into 32 buckets, so any recorded value is within ~3% of its bucket's
+    lower bound. Recording is a couple of integer ops and one array store.
+    """
+
+    SUB_BUCKETS = 32
+    MAX_SHIFT = 36  # Covers durations up to ~40 minutes
+
+    def __init__(self):
+        self.counts = array('q', bytes(8 * self.SUB_BUCKETS * (self.MAX_SHIFT + 2)))
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def bucket(self, value):
+        if value < self.SUB_BUCKETS:
+            return max(value, 0)
+        shift = min(value.bit_length() - 6, self.MAX_SHIFT)
+        return min(self.SUB_BUCKETS * (shift + 1) + (value >> shift) - self.SUB_BUCKETS, len(self.counts) - 1)
+
+    def lower_bound(self, bucket):
+        if bucket < self.SUB_BUCKETS:
+            return bucket
+        shift = bucket // self.SUB_BUCKETS - 1
+        return (self.SUB_BUCKETS + bucket % self.SUB_BUCKETS) << shift
+
+    def record(self, value):
+        self.counts[self.bucket(value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        if not self.total:
+            return 0
+        threshold = fraction * self.total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return self.lower_bound(bucket)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0
+
+    def to_dict(self):
+        return {
+            "count": self.total,
+            "mean_ns": self.mean(),
+            "max_ns": self.max,
+            "p50_ns": self.percentile(0.50),
+            "p95_ns": self.percentile(0.95),
+            "p99_ns": self.percentile(0.99),
+            # [bucket lower bound in ns, count] for every non-empty bucket
+            "buckets": [[self.lower_bound(b), c] for b, c in enumerate(self.counts) if c]
+        }
+
+class FrameProfiler:
+    """Per-phase timings for the main loop, plus an optional on-screen summary"""
+
+    PHASES = ("update", "events", "render", "tick", "frame", "event_latency")
+
+    def __init__(self, budget_ns=16_666_667):
+        self.budget_ns = budget_ns
+        self.histograms = {phase: Histogram() for phase in self.PHASES}
+        self.frames = 0
+        self.over_budget = 0  # Frames (excluding the pacing sleep) that missed the budget
+        self.overlay = False
+        self.last = {phase: 0 for phase in self.PHASES}
+        self.lines = []
+
+    def record(self, phase, duration_ns):
+        self.histograms[phase].record(duration_ns)
+        self.last[phase] = duration_ns
+
+    def end_frame(self, busy_ns, frame_ns):
+        """busy_ns is the frame's work before the pacing sleep; frame_ns is the whole frame"""
+        self.record("frame", frame_ns)
+        self.frames += 1
+        if busy_ns > self.budget_ns:
+            self.over_budget += 1
+
+    def overlay_lines(self):
+        # Percentiles walk the whole histogram, so refresh the text a few times a second
+        if self.frames % 15 == 0 or not self.lines:
+            self.lines = self._format_lines()
+        return self.lines
+
+    def _format_lines(self):
+        frame = self.histograms["frame"]
+        latency = self.histograms["event_latency"]
+        return [
+            f"frame {self.last['frame'] / 1e6:5.2f} ms  p99 {frame.percentile(0.99) / 1e6:5.2f}",
+            f"render {self.last['render'] / 1e6:5.2f} ms  update {self.last['update'] / 1e6:5.2f} ms",
+            f"event->present p50 {latency.percentile(0.50) / 1e6:5.2f} ms  p99 {latency.percentile(0.99) / 1e6:5.2f}",
+            f"over budget {self.over_budget}/{self.frames}"
+        ]
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump({
+                "budget_ns": self.budget_ns,
+                "frames": self.frames,
+                "over_budget": self.over_budget,
+                "phases": {phase: hist.to_dict() for phase, hist in self.histograms.items()}
+            }, f, indent=2)
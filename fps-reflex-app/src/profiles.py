@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+class Profile:
+    """One player's settings, personal bests and recent runs per mode"""
+
+    RECENT = 50  # Runs kept per mode; older ones are only in the history database
+
+    def __init__(self, name):
+        self.name = name
+        self.settings = {}
+        self.bests = {}  # mode -> best time
+        self.recent = {}  # mode -> [[time, played_at, accuracy], ...], oldest first
+        self.runs = 0  # Runs recorded in this profile (a seeded profile starts with the ones it imported)
+
+    def add_run(self, mode, reaction_time, played_at=None, accuracy=None):
+        best = self.bests.get(mode)
+        if best is None or reaction_time < best:
+            self.bests[mode] = reaction_time
+        recent = self.recent.setdefault(mode, [])
+        recent.append([reaction_time, played_at if played_at is not None else time.time(), accuracy])
+        del recent[:-self.RECENT]
+        self.runs += 1
+
+    def personal_best(self, mode):
+        return self.bests.get(mode)
+
+    def rolling_average(self, mode, window=10):
+        recent = self.recent.get(mode, [])[-window:]
+        return sum(run[0] for run in recent) / len(recent) if recent else None
+
+    def clear_runs(self, mode=None):
+        for runs in (self.bests, self.recent):
+            if mode:
+                runs.pop(mode, None)
+            else:
+                runs.clear()
+        if not mode:
+            self.runs = 0
+
+    def to_dict(self):
+        return {"name": self.name, "settings": self.settings, "bests": self.bests, "recent": self.recent, "runs": self.runs}
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls(data["name"])
+        profile.settings = data.get("settings", {})
+        profile.bests = data.get("bests", {})
+        profile.recent = data.get("recent", {})
+        profile.runs = data.get("runs", 0)
+        return profile
+
+class ProfileStore:
+    """Player profiles stored one JSON shard per player under `directory`.
+
+    Shards are named by a hash of the player name and spread over 256
+    subdirectories, so no directory grows past a few entries per site and
+    opening the store reads nothing. A profile is loaded the first time it
+    is asked for; at most `capacity` stay in memory and the least recently
+    used is dropped first, so startup time and memory don't grow with the
+    number of players. Every change is written straight away on the writer
+    thread, so an evicted profile never has unsaved changes.
+
+    `seed(name)` builds the profile of a player who has no shard yet (one
+    who played before profiles existed), or returns None.
+
+    Clearing runs rewrites every shard on the writer thread. Until it is
+    done, each clear stays in `pending_clears` and is applied again to any
+    profile read from disk (or seeded), so nothing waits for the rewrite.
+    """
+
+    def __init__(self, directory, writer=None, capacity=64, seed=None):
+        self.directory = directory
+        self.writer = writer
+        self.capacity = capacity
+        self.seed = seed
+        self.profiles = OrderedDict()  # name -> Profile, least recently used first
+        self.loads = 0
+        self.evictions = 0
+        self.clears = 0  # Clears requested
+        self.cleared = 0  # Clears whose shard rewrite has finished (set on the writer thread)
+        self.pending_clears = []  # (clear number, mode), oldest first
+
+    def path(self, name):
+        key = hashlib.sha1(name.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, name, create=False):
+        """The player's profile, or None when they have none (and `create` is false)"""
+        profile = self.profiles.get(name)
+        if profile is not None:
+            self.profiles.move_to_end(name)
+            return profile
+        profile = self._load(name)
+        if profile is None and self.seed is not None:
+            profile = self.seed(name)
+            if profile is not None:
+                self._apply_pending_clears(profile)
+                self.save(profile)
+        elif profile is not None:
+            self._apply_pending_clears(profile)
+        if profile is None and create:
+            profile = Profile(name)
+        if profile is not None:
+            self._keep(profile)
+        return profile
+
+    def record_run(self, name, mode, reaction_time, played_at=None, accuracy=None):
+        profile = self.get(name, create=True)
+        profile.add_run(mode, reaction_time, played_at, accuracy)
+        self.save(profile)
+
+    def set_setting(self, name, key, value):
+        profile = self.get(name, create=True)
+        profile.settings[key] = value
+        self.save(profile)
+
+    def clear_runs(self, mode=None):
+        """Forget bests and recent runs (of one mode) for every player, on disk too"""
+        for profile in self.profiles.values():
+            profile.clear_runs(mode)
+        self.clears += 1
+        self.pending_clears.append((self.clears, mode))
+        self._submit(self._clear_shards, mode, self.clears)
+
+    def save(self, profile):
+        # Serialized here, so the writer thread never sees a profile that is still changing
+        self._submit(self._write, self.path(profile.name), json.dumps(profile.to_dict()))
+
+    def stats(self):
+        return {"loaded": len(self.profiles), "capacity": self.capacity, "loads": self.loads, "evictions": self.evictions}
+
+    def _load(self, name):
+        try:
+            with open(self.path(name), 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Could not read the profile of {name}: {e}")
+            return None
+        self.loads += 1
+        return Profile.from_dict(data)
+
+    def _apply_pending_clears(self, profile):
+        # A shard read before the writer rewrote it still has the cleared runs
+        cleared = self.cleared
+        self.pending_clears = [clear for clear in self.pending_clears if clear[0] > cleared]
+        for _, mode in self.pending_clears:
+            profile.clear_runs(mode)
+
+    def _keep(self, profile):
+        self.profiles[profile.name] = profile
+        while len(self.profiles) > self.capacity:
+            self.profiles.popitem(last=False)
+            self.evictions += 1
+
+    def _submit(self, func, *args):
+        if self.writer is not None:
+            self.writer.submit(func, *args)
+        else:
+            func(*args)
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+
+    def _clear_shards(self, mode, number):
+        if os.path.isdir(self.directory):
+            for shard in os.listdir(self.directory):
+                shard_dir = os.path.join(self.directory, shard)
+                if not os.path.isdir(shard_dir):
+                    continue
+                for filename in os.listdir(shard_dir):
+                    if not filename.endswith(".json"):
+                        continue
+                    path = os.path.join(shard_dir, filename)
+                    try:
+                        with open(path, 'r') as f:
+                            profile = Profile.from_dict(json.load(f))
+                        profile.clear_runs(mode)
+                        self._write(path, json.dumps(profile.to_dict()))
+                    except (OSError, ValueError) as e:
+                        print(f"Could not clear the profile in {path}: {e}")
+        self.cleared = number
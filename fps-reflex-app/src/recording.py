@@ -0,0 +1,59 @@
+import json
+import os
+import time
+from timing import now_ns
+
+# Event kinds
+PLAY = 0     # Countdown finished and the first targets spawned
+PRESENT = 1  # First present of a newly spawned target
+CLICK = 2    # (x, y)
+KEY = 3      # (key code, unicode)
+
+VERSION = 1
+
+class InputRecorder:
+    """Everything Game needs to recompute a round: seed, screen size and the
+    stamped input stream from start_game until the round ends.
+
+    Timestamps are stored relative to the start of the round, so replays can
+    feed them straight back in without a real clock.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.header = None
+        self.events = []  # [kind, t_ns, a, b]
+        self.start_ns = 0
+
+    def start(self, mode, seed, width, height, start_ns=None):
+        self.start_ns = now_ns() if start_ns is None else start_ns
+        self.header = {"mode": mode, "seed": seed, "width": width, "height": height}
+        self.events = []
+        self.active = True
+
+    def record(self, kind, timestamp_ns, a=0, b=0):
+        if self.active:
+            self.events.append([kind, timestamp_ns - self.start_ns, a, b])
+
+    def finish(self, average_reaction_time, hits):
+        """Stop recording; the result is what the game scored, for later verification"""
+        if self.active:
+            self.header["average_reaction_time"] = average_reaction_time
+            self.header["hits"] = hits
+            self.active = False
+
+    def to_dict(self, **extra):
+        return dict(self.header, version=VERSION, recorded_at=time.time(), events=self.events, **extra)
+
+def write_recording(path, recording):
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(recording, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+def load_recording(path):
+    with open(path, 'r') as f:
+        recording = json.load(f)
+    if recording.get("version") != VERSION:
+        raise ValueError(f"{path}: unsupported recording version {recording.get('version')}")
+    return recording
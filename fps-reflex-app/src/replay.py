@@ -0,0 +1,173 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import time
+from game import Game
+from timing import now_ns
+import recording
+
+class ReplayWindow:
+    """Stands in for GameWindow during playback; spawns only need the screen size"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def invalidate_scene(self, game_state=None):
+        pass
+
+class ReplayKey:
+    def __init__(self, key, unicode):
+        self.key = key
+        self.unicode = unicode
+
+class NoScores:
+    """Replays never submit scores"""
+    last_player_name = ""
+
+    def poll_remote(self):
+        pass
+
+def new_replay_game():
+    """One Game can be reused for any number of replays"""
+    return Game(NoScores())
+
+def apply_event(game, event):
+    kind, timestamp_ns, a, b = event
+    if kind == recording.CLICK:
+        game.handle_click((a, b), timestamp_ns)
+    elif kind == recording.PRESENT:
+        game.frame_presented(timestamp_ns)
+    elif kind == recording.PLAY:
+        game.begin_play(timestamp_ns)
+    elif kind == recording.KEY:
+        game.handle_keydown(ReplayKey(a, chr(b) if b else ""), timestamp_ns)
+
+def replay(data, game=None):
+    """Feed a recording through Game as fast as possible; returns what it scores"""
+    game = game or new_replay_game()
+    game.window = ReplayWindow(data["width"], data["height"])
+    game.start_game(data["mode"], data["seed"])
+    for event in data["events"]:
+        apply_event(game, event)
+    return {
+        "average_reaction_time": game.average_reaction_time(),
+        "hits": game.clicks,
+        "completed": game.state == "ended"
+    }
+
+def verify(data, game=None, tolerance=1e-9):
+    """None if the recording reproduces its recorded score, otherwise why not"""
+    result = replay(data, game)
+    if not result["completed"]:
+        return "round did not finish"
+    if result["hits"] != data.get("hits"):
+        return f"hits {result['hits']} != recorded {data.get('hits')}"
+    recorded = data.get("average_reaction_time")
+    if recorded is None or abs(result["average_reaction_time"] - recorded) > tolerance:
+        return f"average {result['average_reaction_time']:.6f} != recorded {recorded}"
+    return None
+
+def recording_paths(paths):
+    """Recording files from a mix of files and directories"""
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            result.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            result.append(path)
+    return result
+
+def verify_many(paths):
+    game = new_replay_game()
+    mismatches = []
+    errors = []
+    started = time.perf_counter()
+    files = recording_paths(paths)
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence per-round game output
+        for path in files:
+            try:
+                reason = verify(recording.load_recording(path), game)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                errors.append({"file": path, "error": str(e)})
+                continue
+            if reason is not None:
+                mismatches.append({"file": path, "reason": reason})
+    elapsed = time.perf_counter() - started
+    return {
+        "checked": len(files),
+        "mismatches": mismatches,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "runs_per_s": len(files) / elapsed if elapsed else 0
+    }
+
+def play(data, speed=1.0):
+    """Show a recording on screen in real time (or scaled by `speed`)"""
+    import pygame
+    from ui.window import GameWindow
+
+    pygame.display.init()
+    pygame.font.init()
+    info = pygame.display.Info()
+    window = GameWindow(info.current_w, info.current_h, font_cache="font_cache.json")
+    game = new_replay_game()
+    game.window = ReplayWindow(data["width"], data["height"])
+    game.start_game(data["mode"], data["seed"])
+
+    events = data["events"]
+    index = 0
+    started = now_ns()
+    finished_at = None
+    while True:
+        elapsed_ns = (now_ns() - started) * speed
+        while index < len(events) and events[index][1] <= elapsed_ns:
+            apply_event(game, events[index])
+            index += 1
+        if index == len(events) and finished_at is None:
+            finished_at = now_ns()
+        if finished_at is not None and now_ns() - finished_at > 3_000_000_000:
+            break
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                window.close()
+                return
+
+        countdown = max(1, 5 - int(elapsed_ns // 1_000_000_000)) if game.state == "countdown" else None
+        window.update_display(
+            game.state,
+            game.visible_targets(),
+            game.clicks,
+            game.max_clicks,
+            game.average_reaction_time(),
+            None,
+            "",
+            game.current_mode,
+            countdown
+        )
+        window.clock.tick(60)
+    window.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify or watch recorded runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    verify_parser = commands.add_parser("verify", help="Recompute recorded runs headlessly and report mismatches")
+    verify_parser.add_argument("paths", nargs="*", default=["recordings"], help="Recording files or directories")
+    play_parser = commands.add_parser("play", help="Watch a recorded run")
+    play_parser.add_argument("path")
+    play_parser.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "verify":
+        report = verify_many(args.paths)
+        print(json.dumps(report, indent=2))
+        return 1 if report["mismatches"] or report["errors"] else 0
+    play(recording.load_recording(args.path), args.speed)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+import time
+import pygame
+from pacing import FramePacer
+
+class FrameScheduler:
+    """Decides how each main-loop iteration waits for work.
+
+    During countdown and play the loop polls events and `pacer` paces the
+    frames. On the menu screens it blocks in pygame.event.wait until
+    input arrives or `idle_timeout_ms` passes (so Game.update still runs
+    for shared-leaderboard refreshes), and mouse motion is filtered out so
+    moving the mouse over an idle kiosk doesn't wake it. Wall and CPU time
+    are accounted per state so the two behaviours can be compared.
+
+    `events` is the event queue (pygame.event unless a test passes a
+    stand-in), and `wall` and `cpu` the clocks the usage is measured with.
+    """
+
+    ACTIVE_STATES = ("countdown", "playing")
+
+    def __init__(self, idle=True, pacer=None, idle_timeout_ms=1000, events=None,
+                 wall=time.perf_counter, cpu=time.process_time):
+        self.idle = idle  # False keeps the old behaviour: poll and tick in every state
+        self.pacer = pacer or FramePacer()
+        self.idle_timeout_ms = idle_timeout_ms
+        self.events = events if events is not None else pygame.event
+        self.wall = wall
+        self.cpu = cpu
+        self.motion_blocked = False
+        self.state = None
+        self.last_wall = wall()
+        self.last_cpu = cpu()
+        self.usage = {}  # state -> [wall seconds, cpu seconds, iterations]
+
+    def is_active(self, state):
+        return not self.idle or state in self.ACTIVE_STATES
+
+    def wait_events(self, state):
+        """Events for this iteration; blocks in idle states until there is one (or the timeout)"""
+        self._account()
+        self.state = state
+        if self.is_active(state):
+            if self.motion_blocked:
+                self.events.set_allowed(pygame.MOUSEMOTION)  # Play records the cursor path
+                self.motion_blocked = False
+            self.pacer.latch()
+            return self.events.get()
+
+        self.pacer.pause()
+        if not self.motion_blocked:
+            self.events.set_blocked(pygame.MOUSEMOTION)
+            self.motion_blocked = True
+        event = self.events.wait(self.idle_timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + self.events.get()
+
+    def tick(self, state, present_ns):
+        """Frame pacing; idle iterations already waited in wait_events"""
+        if self.is_active(state):
+            self.pacer.frame_done(present_ns)
+
+    def _account(self):
+        wall = self.wall()
+        cpu = self.cpu()
+        if self.state is not None:
+            usage = self.usage.setdefault(self.state, [0.0, 0.0, 0])
+            usage[0] += wall - self.last_wall
+            usage[1] += cpu - self.last_cpu
+            usage[2] += 1
+        self.last_wall = wall
+        self.last_cpu = cpu
+
+    def report(self):
+        """Per state and per kind (active/idle): wall and CPU seconds, CPU % of one core, loop rate"""
+        self._account()
+        result = {"states": {}, "kinds": {}}
+        for state, (wall, cpu, iterations) in self.usage.items():
+            kind = "active" if self.is_active(state) else "idle"
+            result["states"][state] = _usage(kind, wall, cpu, iterations)
+            totals = result["kinds"].setdefault(kind, [0.0, 0.0, 0])
+            totals[0] += wall
+            totals[1] += cpu
+            totals[2] += iterations
+        result["kinds"] = {kind: _usage(kind, *totals) for kind, totals in result["kinds"].items()}
+        return result
+
+def _usage(kind, wall, cpu, iterations):
+    return {
+        "loop": kind,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_percent": 100 * cpu / wall if wall else 0.0,
+        "iterations_per_s": iterations / wall if wall else 0.0
+    }
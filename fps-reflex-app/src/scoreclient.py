@@ -0,0 +1,187 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from itertools import islice
+
+class LeaderboardClient:
+    """Talks to a LeaderboardServer from a background thread.
+
+    submit() only appends to a queue, so the game loop never waits on the
+    network. The thread sends queued scores in batches over one persistent
+    connection, reconnecting with exponential backoff when the server is
+    slow or gone; until then unsent scores are kept in memory and spooled
+    to `spool_path` so they survive a restart. The top of each board is
+    fetched every `refresh_interval` seconds and read from that cache.
+    """
+
+    def __init__(self, host, port, kiosk=None, spool_path=None, batch_size=200,
+                 flush_interval=0.25, refresh_interval=10.0, timeout=3.0, top_limit=10):
+        self.address = (host, port)
+        self.kiosk = kiosk or socket.gethostname()
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.top_limit = top_limit
+
+        self.pending = deque(self._read_spool())  # Scores not yet acknowledged, oldest first
+        self.top = {}  # mode -> cached entries from the server
+        self.version = 0  # Bumped whenever self.top is replaced
+        self.sent = 0
+        self.failures = 0
+        self.connected = False
+        self.sock = None
+        self.reader = None
+        self.next_refresh = 0.0
+        self.backoff = 0.0
+        self.spooled = len(self.pending)  # Pending scores the spool file already holds
+
+        self.lock = threading.Lock()  # Guards copying `pending` while the game appends to it
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="leaderboard-client", daemon=True)
+        self.thread.start()
+
+    def submit(self, mode, name, reaction_time, seed=None, played_at=None):
+        score = {
+            "id": uuid.uuid4().hex,  # Lets the server drop a batch it already stored
+            "mode": mode,
+            "name": name,
+            "time": reaction_time,
+            "played_at": played_at if played_at is not None else time.time(),
+            "seed": seed,
+            "kiosk": self.kiosk
+        }
+        with self.lock:
+            self.pending.append(score)
+        if len(self.pending) >= self.batch_size:
+            self.wake.set()
+
+    def top_scores(self, mode):
+        """Cached board for a mode, or None until the first refresh succeeds"""
+        return self.top.get(mode)
+
+    def refresh(self):
+        """Ask for a top-N refresh on the next pass of the background thread"""
+        self.next_refresh = 0.0
+        self.wake.set()
+
+    def flush(self, timeout=5.0):
+        """Wait until every submitted score has been acknowledged; False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            self.wake.set()
+            time.sleep(0.01)
+        return not self.pending
+
+    def close(self, timeout=2.0):
+        """Try to deliver what is queued, then spool the rest for the next start"""
+        self.flush(timeout)
+        self.stopping = True
+        self.wake.set()
+        self.thread.join(timeout)
+        self._disconnect()
+        self._write_spool()
+
+    def _run(self):
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            if self.stopping:
+                break
+            try:
+                self._send_pending()
+                if time.monotonic() >= self.next_refresh:
+                    self._refresh_top()
+                self.backoff = 0.0
+            except (OSError, ValueError) as e:
+                self.failures += 1
+                self._disconnect()
+                self._write_spool()
+                # Exponential backoff, capped so a recovered server is found within half a minute
+                self.backoff = min(max(self.backoff * 2, 0.5), 30.0)
+                if self.failures == 1 or self.backoff == 30.0:
+                    print(f"Leaderboard service unavailable ({e}); keeping scores locally")
+                self._sleep(self.backoff)
+
+    def _sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while not self.stopping and time.monotonic() < deadline:
+            time.sleep(min(0.05, seconds))
+
+    def _send_pending(self):
+        while self.pending:
+            with self.lock:
+                batch = list(islice(self.pending, self.batch_size))
+            response = self._request({"op": "submit", "scores": batch})
+            if not response.get("ok"):
+                raise ValueError(response.get("error", "submit failed"))
+            for _ in batch:
+                self.pending.popleft()
+            self.sent += len(batch)
+        if self.spooled:
+            self._write_spool()
+
+    def _refresh_top(self):
+        response = self._request({"op": "top", "limit": self.top_limit})
+        if not response.get("ok"):
+            raise ValueError(response.get("error", "top failed"))
+        self.top = response["top"]
+        self.version += 1
+        self.next_refresh = time.monotonic() + self.refresh_interval
+
+    def _request(self, message):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.address, timeout=self.timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.reader = self.sock.makefile("rb")
+            self.connected = True
+        self.sock.sendall(json.dumps(message).encode() + b"\n")
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    def _disconnect(self):
+        if self.sock is not None:
+            try:
+                self.reader.close()
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = None
+        self.reader = None
+        self.connected = False
+
+    def _read_spool(self):
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return []
+        scores = []
+        with open(self.spool_path, 'r') as f:
+            for line in f:
+                try:
+                    scores.append(json.loads(line))
+                except ValueError:
+                    continue  # A torn last line from a crash mid-write
+        return scores
+
+    def _write_spool(self):
+        if not self.spool_path:
+            return
+        with self.lock:
+            scores = list(self.pending)
+        if not scores:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+        else:
+            temp_path = self.spool_path + ".tmp"
+            with open(temp_path, 'w') as f:
+                for score in scores:
+                    f.write(json.dumps(score) + "\n")
+            os.replace(temp_path, self.spool_path)
+        self.spooled = len(scores)
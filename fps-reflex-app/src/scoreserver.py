@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import bisect
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from game_mode import GameMode
+from history import ScoreHistory
+from writer import BackgroundWriter
+
+# Protocol: one JSON object per line in each direction, one response per request.
+#   {"op": "submit", "scores": [{"id", "mode", "name", "time", "played_at", "seed", "kiosk"}, ...]}
+#       -> {"ok": true, "accepted": n, "duplicates": n, "rejected": n}
+#   {"op": "top", "modes": [...], "limit": n}
+#       -> {"ok": true, "top": {mode: [{"name", "time", "date", "seed"}, ...]}}
+
+MAX_LINE = 4 * 1024 * 1024
+MIN_SEED = -2 ** 63  # SQLite INTEGER range
+MAX_SEED = 2 ** 63 - 1
+
+class LeaderboardServer:
+    """Shared leaderboard for many kiosks, served over TCP with asyncio.
+
+    Each submit batch is validated and inserted into ScoreHistory with one
+    executemany on a background thread, so the event loop only parses JSON.
+    A batch is acknowledged only once that insert has committed; if it
+    fails the client gets an error and keeps the scores to retry. The top
+    of every board is kept sorted in memory and answers reads without
+    touching SQLite. Score ids already stored are acknowledged but not
+    stored again, which makes client retries safe; a retry of a batch
+    whose insert is still running waits for that insert and is answered
+    with its outcome.
+    """
+
+    def __init__(self, db_path, top_size=100, remember_ids=100000):
+        self.writer = BackgroundWriter("leaderboard-db")
+        self.history = ScoreHistory(db_path, self.writer)
+        self.top_size = top_size
+        self.top = {mode: self.history.top_scores(mode, top_size) for mode in GameMode.MODES}  # Sorted by time
+        self.seen_ids = OrderedDict()
+        self.storing = {}  # Score id -> future of the insert that is storing it
+        self.remember_ids = remember_ids
+        self.submissions = 0
+        self.server = None
+        self.port = None
+
+    async def start(self, host="127.0.0.1", port=7777):
+        self.server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request):
+        op = request["op"]
+        if op == "submit":
+            return await self.submit(request["scores"])
+        if op == "top":
+            limit = min(int(request.get("limit", 10)), self.top_size)
+            modes = request.get("modes") or list(self.top)
+            return {"ok": True, "top": {mode: self.top.get(mode, [])[:limit] for mode in modes}}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def submit(self, scores):
+        rows = []
+        ids = set()
+        waits = set()  # Inserts of other batches that are storing some of these ids
+        duplicates = rejected = 0
+        for score in scores:
+            score_id = score.get("id")
+            if score_id is not None and (score_id in self.seen_ids or score_id in ids or score_id in self.storing):
+                if score_id in self.storing:
+                    waits.add(self.storing[score_id])
+                duplicates += 1
+                continue
+            mode = score.get("mode")
+            name = score.get("name")
+            reaction_time = score.get("time")
+            played_at = score.get("played_at", time.time())
+            seed = score.get("seed")
+            if (mode not in self.top or not isinstance(name, str) or not isinstance(played_at, (int, float))
+                    or not isinstance(reaction_time, (int, float)) or reaction_time <= 0 or not valid_seed(seed)):
+                rejected += 1
+                continue
+            if score_id is not None:
+                ids.add(score_id)
+            rows.append((mode, name[:15], float(reaction_time), float(played_at), seed))
+        if rows:
+            stored = self._store(rows)
+            for score_id in ids:
+                self.storing[score_id] = stored
+            try:
+                await stored
+            except Exception as e:
+                return {"ok": False, "error": f"could not store scores: {e}"}
+            finally:
+                for score_id in ids:
+                    del self.storing[score_id]
+            for score_id in ids:
+                self.seen_ids[score_id] = True
+            while len(self.seen_ids) > self.remember_ids:
+                self.seen_ids.popitem(last=False)
+            for row in rows:
+                self._add_top(row)
+            self.submissions += len(rows)
+        if waits:
+            try:
+                await asyncio.gather(*waits)
+            except Exception as e:
+                return {"ok": False, "error": f"could not store scores: {e}"}  # The client retries the whole batch
+        return {"ok": True, "accepted": len(rows), "duplicates": duplicates, "rejected": rejected}
+
+    def _store(self, rows):
+        """Insert rows on the writer thread; the returned future resolves once they are committed"""
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def store():
+            try:
+                self.history.add_runs(rows)
+            except Exception as e:
+                loop.call_soon_threadsafe(done.set_exception, e)
+                raise  # Counted and logged by the writer
+            loop.call_soon_threadsafe(done.set_result, None)
+
+        self.writer.submit(store)
+        return done
+
+    def _add_top(self, row):
+        mode, name, reaction_time, played_at, seed = row
+        board = self.top[mode]
+        if len(board) >= self.top_size and reaction_time >= board[-1]['time']:
+            return
+        entry = {'name': name, 'time': reaction_time, 'date': datetime.fromtimestamp(played_at).strftime('%m/%d/%y'), 'seed': seed}
+        bisect.insort(board, entry, key=lambda item: item['time'])
+        del board[self.top_size:]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.writer.flush()
+        self.history.close()
+        self.writer.close()
+
+def valid_seed(seed):
+    return seed is None or (isinstance(seed, int) and not isinstance(seed, bool) and MIN_SEED <= seed <= MAX_SEED)
+
+async def serve(db_path, host, port):
+    server = LeaderboardServer(db_path)
+    await server.start(host, port)
+    print(f"Leaderboard service listening on {host}:{server.port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared leaderboard service for several kiosks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--db", default="leaderboard.db", help="SQLite database of every submitted run")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.db, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import json
+import os
+import time
+import metrics
+from writer import BackgroundWriter
+
+WRITE_SECONDS = metrics.REGISTRY.histogram("fps_highscore_write_seconds", "Time to write and fsync a highscore change", ("kind",))
+LOG_WRITE_SECONDS = WRITE_SECONDS.labels("log")
+SNAPSHOT_WRITE_SECONDS = WRITE_SECONDS.labels("snapshot")
+LOAD_ERRORS = metrics.REGISTRY.counter("fps_highscore_load_errors_total", "Unreadable highscore data found while loading", ("source",))
+WRITE_QUEUE = metrics.REGISTRY.gauge("fps_highscore_write_queue", "Highscore writes waiting for the background writer")
+
+class ScoreStore:
+    """Crash-safe highscore storage: a JSON snapshot plus an append-only log of changes.
+
+    Every change is appended (and fsynced) to `<path>.log` by a background
+    writer. Every `compact_every` records the full state is written to a temp
+    file and atomically renamed over `<path>`, after which the log is emptied.
+    Records carry a sequence number and the snapshot stores the last one it
+    includes, so a crash between the rename and the log truncation never
+    replays a record twice.
+    """
+
+    def __init__(self, path, compact_every=64, writer=None):
+        self.path = path
+        self.log_path = path + ".log"
+        self.compact_every = compact_every
+        self.writer = writer if writer is not None else BackgroundWriter("highscores-writer")
+        self.seq = 0  # Sequence number of the last record
+        self.snapshot_seq = 0
+        self.pending = 0  # Records logged since the last snapshot
+        self.log_file = None  # Only touched on the writer thread
+        self.writes = 0  # Log appends and snapshots that reached the disk
+        WRITE_QUEUE.set_function(self.writer.queue.qsize)
+
+    def read_snapshot(self):
+        """Return the snapshot dict, or {} if there is none or it is unreadable"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or not isinstance(data.get('seq', 0), int):
+                raise ValueError("not a highscores snapshot")
+        except (OSError, ValueError) as e:
+            # Keep the damaged file for inspection rather than overwriting it
+            print(f"Highscores snapshot {self.path} is unreadable ({e}); moved aside")
+            LOAD_ERRORS.labels("snapshot").inc()
+            self._quarantine(self.path)
+            return {}
+        self.snapshot_seq = self.seq = data.get('seq', 0)
+        return data
+
+    def replay(self):
+        """Yield the logged records that are newer than the snapshot"""
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'r') as f:
+            for line in f:
+                self.pending += 1  # Any leftover log content gets compacted away
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    LOAD_ERRORS.labels("log").inc()
+                    continue  # Torn write from a crash mid-append
+                seq = record.get('seq', 0) if isinstance(record, dict) else None
+                if not isinstance(seq, int) or isinstance(seq, bool):
+                    LOAD_ERRORS.labels("log").inc()
+                    continue  # Valid JSON, but not a record
+                if seq <= self.snapshot_seq:
+                    continue
+                self.seq = max(self.seq, seq)
+                yield record
+
+    def append(self, record, snapshot):
+        """Log a record; `snapshot` is called for the full state when it's time to compact"""
+        self.seq += 1
+        line = json.dumps(dict(record, seq=self.seq)) + "\n"
+        self.writer.submit(self._write_log, line)
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact(snapshot)
+
+    def compact(self, snapshot):
+        # Serialize now so the writer thread never sees state the game is mutating
+        data = dict(snapshot(), seq=self.seq)
+        self.pending = 0
+        self.writer.submit(self._write_snapshot, json.dumps(data))
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        if self.writer.closed:
+            return
+        self.writer.flush()
+        self.writer.submit(self._close_log)
+        self.writer.close()
+
+    def _write_log(self, line):
+        started = time.perf_counter_ns()
+        if self.log_file is None:
+            self.log_file = open(self.log_path, 'a')
+        self.log_file.write(line)
+        self.log_file.flush()
+        os.fsync(self.log_file.fileno())
+        self.writes += 1
+        LOG_WRITE_SECONDS.observe_ns(time.perf_counter_ns() - started)
+
+    def _write_snapshot(self, text):
+        started = time.perf_counter_ns()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._fsync_directory()
+
+        # Everything logged so far is in the snapshot now
+        self._close_log()
+        open(self.log_path, 'w').close()
+        self.writes += 1
+        SNAPSHOT_WRITE_SECONDS.observe_ns(time.perf_counter_ns() - started)
+
+    def _close_log(self):
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+    def _fsync_directory(self):
+        # Makes the rename itself durable; not supported on Windows
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _quarantine(self, path):
+        try:
+            os.replace(path, path + ".corrupt")
+        except OSError:
+            pass
@@ -0,0 +1,249 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# The harness never opens a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game import Game
+from game_mode import GameMode
+from highscores import Highscores
+from main import handle_event, render_frame
+from memory import MemoryMonitor, rss_bytes
+from timing import now_ns
+from ui.window import GameWindow
+
+class PerfectAim:
+    """Clicks the exact target center on the first frame it is visible"""
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def aim(self, target):
+        return (int(target.x), int(target.y))
+
+    def ready(self, frames_visible):
+        return True
+
+class GaussianAim(PerfectAim):
+    """Clicks around the target center with normally distributed error (pixels)"""
+
+    def __init__(self, sigma=8.0, rng=None):
+        super().__init__(rng)
+        self.sigma = sigma
+
+    def aim(self, target):
+        return (
+            int(round(target.x + self.rng.gauss(0, self.sigma))),
+            int(round(target.y + self.rng.gauss(0, self.sigma)))
+        )
+
+class DelayedReaction:
+    """Wraps another policy and waits a number of frames before each shot"""
+
+    def __init__(self, policy, delay_frames=12, jitter_frames=4, rng=None):
+        self.policy = policy
+        self.delay_frames = delay_frames
+        self.jitter_frames = jitter_frames
+        self.rng = rng or random.Random()
+        self.wait = self._next_wait()
+
+    def _next_wait(self):
+        return max(0, self.delay_frames + self.rng.randint(-self.jitter_frames, self.jitter_frames))
+
+    def aim(self, target):
+        self.wait = self._next_wait()
+        return self.policy.aim(target)
+
+    def ready(self, frames_visible):
+        return frames_visible >= self.wait
+
+BOTS = {
+    "perfect": lambda args, rng: PerfectAim(rng),
+    "gaussian": lambda args, rng: GaussianAim(args.sigma, rng),
+    "delayed": lambda args, rng: DelayedReaction(GaussianAim(args.sigma, rng), args.delay_frames, rng=rng)
+}
+
+class SyntheticPlayer:
+    """Turns game state into the mouse/keyboard events a player would produce"""
+
+    def __init__(self, policy, mode, name="BOT"):
+        self.policy = policy
+        self.mode = mode
+        self.name = name
+        self.target = None
+        self.spawned = None
+        self.frames_visible = 0
+
+    def events(self, game, window):
+        if game.state == "mode_select":
+            return [self._click(window.mode_buttons[self.mode].center)]
+        if game.state == "ended":
+            return [self._click(window.continue_button_rect.center)]
+        if game.state == "name_input":
+            if not game.input_text.strip():
+                return [self._key(pygame.K_UNKNOWN, char) for char in self.name]
+            return [self._key(pygame.K_RETURN, "\r")]
+        targets = game.visible_targets()
+        if game.state == "playing" and targets:
+            # Targets are pooled objects, so a new spawn is detected by the spawn count
+            if game.spawned != self.spawned or self.target not in targets:
+                self.target = targets[-1]  # Topmost
+                self.spawned = game.spawned
+                self.frames_visible = 0
+            self.frames_visible += 1
+            if self.policy.ready(self.frames_visible):
+                return [self._click(self.policy.aim(self.target))]
+        return []
+
+    def _click(self, pos):
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+    def _key(self, key, unicode):
+        return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+def run_simulation(policy, modes, rounds, scores_file, max_frames_per_round=10000, memory=None):
+    """Play `rounds` rounds of each mode and return a report dict; `memory` is an optional MemoryMonitor.
+
+    A round still unfinished after `max_frames_per_round` frames is abandoned
+    and counted in the report's "timed_out" instead of "rounds".
+    """
+    pygame.display.init()
+    pygame.font.init()
+    info = pygame.display.Info()
+    window = GameWindow(info.current_w, info.current_h)
+    data_dir = os.path.dirname(scores_file)
+    game = Game(Highscores(scores_file), os.path.join(data_dir, "telemetry"), os.path.join(data_dir, "recordings"))
+    game.window = window
+    game.memory = memory
+
+    writes_start = game.highscores.store.writes
+    frame_times = []
+    rounds_played = {}
+    timed_out = {}
+    rss_start = rss_bytes()
+    started = time.perf_counter()
+
+    for mode in modes:
+        player = SyntheticPlayer(policy, mode)
+        rounds_played[mode] = timed_out[mode] = 0
+        while rounds_played[mode] + timed_out[mode] < rounds:
+            frames = 0
+            round_started = False
+            finished = False
+            while frames < max_frames_per_round:
+                frame_start = now_ns()
+                game.update()
+                if game.state == "countdown":
+                    game.countdown_start = time.time() - 5  # Skip the countdown
+                    game.update()
+
+                for event in player.events(game, window):
+                    pygame.event.post(event)
+                for event in pygame.event.get():
+                    handle_event(game, event, now_ns())
+
+                render_frame(game, window)
+                frame_times.append(now_ns() - frame_start)
+                frames += 1
+
+                if game.state != "mode_select":
+                    round_started = True
+                elif round_started:
+                    finished = True
+                    break
+            if finished:
+                rounds_played[mode] += 1
+            else:
+                timed_out[mode] += 1
+                game.reset_game()  # Back to mode select for the next round
+
+    elapsed = time.perf_counter() - started
+    rss_end = rss_bytes()
+    game.highscores.flush()  # Wait for the background writer to drain
+    highscore_writes = game.highscores.store.writes - writes_start
+    game.highscores.close()
+    window.close()
+
+    frame_times.sort()
+    report = {
+        "rounds": rounds_played,
+        "timed_out": timed_out,
+        "frames": len(frame_times),
+        "elapsed_s": elapsed,
+        "frame_ms": {
+            "p50": percentile(frame_times, 0.50) / 1e6,
+            "p95": percentile(frame_times, 0.95) / 1e6,
+            "p99": percentile(frame_times, 0.99) / 1e6,
+            "max": (frame_times[-1] if frame_times else 0) / 1e6
+        },
+        "rss_start_bytes": rss_start,
+        "rss_end_bytes": rss_end,
+        "rss_growth_bytes": rss_end - rss_start,
+        "highscore_writes": highscore_writes,
+        "text_cache": window.text_cache.stats(),
+        "scene_cache": window.scenes.stats()
+    }
+    if memory is not None:
+        report["memory"] = memory.summary()
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game headless with a synthetic player")
+    parser.add_argument("--rounds", type=int, default=100, help="Rounds to play per mode")
+    parser.add_argument("--modes", nargs="+", default=list(GameMode.MODES), choices=list(GameMode.MODES))
+    parser.add_argument("--bot", default="gaussian", choices=list(BOTS))
+    parser.add_argument("--sigma", type=float, default=6.0, help="Aim error in pixels (gaussian/delayed)")
+    parser.add_argument("--delay-frames", type=int, default=12, help="Frames to wait before shooting (delayed)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-frames", type=int, default=10000,
+                        help="Frames after which an unfinished round is abandoned; any abandoned round makes the exit status 1")
+    parser.add_argument("--scores", default=None, help="Highscores file to use (default: a temp file)")
+    parser.add_argument("--memory-interval", type=int, default=None, metavar="ROUNDS",
+                        help="Trace allocations and sample memory every ROUNDS rounds (default 10 when a memory option is given)")
+    parser.add_argument("--memory-log", default=None, help="Append each memory sample to this JSON lines file")
+    parser.add_argument("--max-heap-growth", type=float, default=None, metavar="BYTES",
+                        help="Exit with status 1 if the traced heap grows more than BYTES per round after the first sample")
+    parser.add_argument("--max-rss-growth", type=int, default=None, metavar="BYTES",
+                        help="Exit with status 1 if RSS grows more than BYTES after the first sample")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    scores_file = args.scores or os.path.join(tempfile.mkdtemp(prefix="fps-reflex-sim-"), "highscores.json")
+    memory = None
+    if any(option is not None for option in (args.memory_interval, args.memory_log, args.max_heap_growth, args.max_rss_growth)):
+        memory = MemoryMonitor(args.memory_interval or 10, args.memory_log).start()
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence per-round game output
+        report = run_simulation(BOTS[args.bot](args, rng), args.modes, args.rounds, scores_file, args.max_frames, memory)
+    print(json.dumps(report, indent=2))
+    status = 0
+    for mode, count in report["timed_out"].items():
+        if count:
+            print(f"{count} {mode} round(s) did not finish within {args.max_frames} frames", file=sys.stderr)
+            status = 1
+    if memory is not None:
+        memory.stop()
+        failures = memory.check(args.max_heap_growth, args.max_rss_growth)
+        if failures and (args.max_heap_growth is not None or args.max_rss_growth is not None):
+            for failure in failures:
+                print(f"Memory check failed: {failure}", file=sys.stderr)
+            status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import math
+import random
+from array import array
+from game_mode import GameMode
+
+class SpawnSchedule:
+    """Every target position and size for one round, precomputed from a seed.
+
+    The same (seed, mode, width, height) always yields the same sequence, so
+    kiosks can share layouts and any recorded run can be regenerated.
+    """
+
+    def __init__(self, seed, mode, width, height):
+        self.seed = seed
+        self.mode = mode
+        self.width = width
+        self.height = height
+        mode_info = GameMode.get_mode_info(mode) or {"targets": 20}
+        count = mode_info["targets"]
+        self.x = array('f', bytes(4 * count))
+        self.y = array('f', bytes(4 * count))
+        self.size = array('f', bytes(4 * count))
+
+        rng = random.Random(seed)
+        if mode == "burst":
+            self._generate_burst(rng, count)
+        elif "sizes" in mode_info:
+            self._generate_sized(rng, count, *mode_info["sizes"])
+        else:
+            self._generate_standard(rng, count)
+
+        # Velocity and acceleration for moving-target modes; drawn after the positions
+        self.moving = "speed" in mode_info
+        if self.moving:
+            self.vx = array('f', bytes(4 * count))
+            self.vy = array('f', bytes(4 * count))
+            self.ax = array('f', bytes(4 * count))
+            self.ay = array('f', bytes(4 * count))
+            self._generate_motion(rng, count, *mode_info["speed"], mode_info.get("accel", 0))
+
+    def _generate_standard(self, rng, count):
+        for i in range(count):
+            self.x[i] = rng.randint(30, self.width - 30)
+            self.y[i] = rng.randint(30, self.height - 30)
+            self.size[i] = 20
+
+    def _generate_sized(self, rng, count, min_size, max_size):
+        for i in range(count):
+            size = rng.randint(min_size, max_size)
+            self.x[i] = rng.randint(size, self.width - size)
+            self.y[i] = rng.randint(size, self.height - size)
+            self.size[i] = size
+
+    def _generate_burst(self, rng, count):
+        # Groups of three: a center, then two targets along a direction at a set spacing
+        for i in range(count):
+            position_in_group = i % 3
+            if position_in_group == 0:
+                center_x = rng.randint(150, self.width - 150)
+                center_y = rng.randint(150, self.height - 150)
+                direction = rng.uniform(0, 2 * math.pi)
+                speed = rng.randint(40, 100)
+                x, y = center_x, center_y
+            else:
+                offset = position_in_group * speed
+                x = center_x + offset * math.cos(direction) + rng.uniform(-5, 5)
+                y = center_y + offset * math.sin(direction) + rng.uniform(-5, 5)
+
+            # Ensure target stays within screen bounds
+            self.x[i] = max(50, min(self.width - 50, x))
+            self.y[i] = max(50, min(self.height - 50, y))
+            self.size[i] = 20
+
+    def _generate_motion(self, rng, count, min_speed, max_speed, max_accel):
+        for i in range(count):
+            direction = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(min_speed, max_speed)
+            self.vx[i] = speed * math.cos(direction)
+            self.vy[i] = speed * math.sin(direction)
+            # Acceleration at an angle to the velocity makes movers curve
+            turn = direction + rng.uniform(-math.pi / 2, math.pi / 2)
+            accel = rng.uniform(0, max_accel)
+            self.ax[i] = accel * math.cos(turn)
+            self.ay[i] = accel * math.sin(turn)
+
+    def motion(self, index):
+        """(vx, vy, ax, ay) in pixels per second (squared)"""
+        return self.vx[index], self.vy[index], self.ax[index], self.ay[index]
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, index):
+        return self.x[index], self.y[index], self.size[index]
+
+def new_seed():
+    return random.getrandbits(32)
@@ -1,11 +1,33 @@
-import math
-
 class Target:
-    def __init__(self, x, y, size):
+    __slots__ = ("x", "y", "size", "index")
+
+    def __init__(self, x, y, size, index=-1):
         self.x = x
         self.y = y
         self.size = size
+        self.index = index  # Spawn number within the round; identifies the target in telemetry
 
     def is_clicked(self, mouse_x, mouse_y):
-        distance = math.sqrt((mouse_x - self.x)**2 + (mouse_y - self.y)**2)
-        return distance <= self.size
\ No newline at end of file
+        # Compare squared distances; no sqrt needed for a radius check
+        dx = mouse_x - self.x
+        dy = mouse_y - self.y
+        return dx * dx + dy * dy <= self.size * self.size
+
+class TargetPool:
+    """Reuses Target objects instead of allocating one per spawn"""
+
+    def __init__(self):
+        self.free = []
+
+    def acquire(self, x, y, size, index=-1):
+        if self.free:
+            target = self.free.pop()
+            target.x = x
+            target.y = y
+            target.size = size
+            target.index = index
+            return target
+        return Target(x, y, size, index)
+
+    def release(self, target):
+        self.free.append(target)
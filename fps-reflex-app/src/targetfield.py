@@ -0,0 +1,92 @@
+class TargetField:
+    """Many simultaneous targets, indexed by a uniform grid for O(1) average hit tests.
+
+    Each target is registered in every cell its bounding box overlaps, so a
+    click only has to check the targets listed in the one cell it lands in.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of targets
+        self.order = {}  # target -> insertion number; higher is drawn on top
+        self.next_order = 0
+
+    def _cells_for(self, target):
+        size = self.cell_size
+        left = int((target.x - target.size) // size)
+        right = int((target.x + target.size) // size)
+        top = int((target.y - target.size) // size)
+        bottom = int((target.y + target.size) // size)
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                yield (cell_x, cell_y)
+
+    def insert(self, target):
+        self.order[target] = self.next_order
+        self.next_order += 1
+        for cell in self._cells_for(target):
+            self.cells.setdefault(cell, []).append(target)
+
+    def insert_many(self, targets):
+        for target in targets:
+            self.insert(target)
+
+    def remove(self, target):
+        del self.order[target]
+        for cell in self._cells_for(target):
+            occupants = self.cells[cell]
+            occupants.remove(target)
+            if not occupants:
+                del self.cells[cell]
+
+    def remove_many(self, targets):
+        for target in targets:
+            self.remove(target)
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def hit_test(self, x, y, nearest=False):
+        """Return the clicked target (topmost, or nearest center if `nearest`) or None"""
+        occupants = self.cells.get((int(x // self.cell_size), int(y // self.cell_size)))
+        if not occupants:
+            return None
+        best = None
+        best_key = None
+        for target in occupants:
+            dx = x - target.x
+            dy = y - target.y
+            distance_squared = dx * dx + dy * dy
+            if distance_squared > target.size * target.size:
+                continue
+            key = distance_squared if nearest else -self.order[target]
+            if best is None or key < best_key:
+                best = target
+                best_key = key
+        return best
+
+    def nearest(self, x, y):
+        """The target whose center is closest, hit or not (a linear scan; used for misses)"""
+        best = None
+        best_distance = None
+        for target in self.order:
+            distance_squared = (x - target.x) ** 2 + (y - target.y) ** 2
+            if best is None or distance_squared < best_distance:
+                best = target
+                best_distance = distance_squared
+        return best
+
+    @property
+    def targets(self):
+        """Targets in draw order (bottom first); dicts keep insertion order"""
+        return list(self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, target):
+        return target in self.order
+
+    def __iter__(self):
+        return iter(self.order)
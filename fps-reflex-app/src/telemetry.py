@@ -0,0 +1,131 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+
+# Event kinds
+MOTION = 0
+MISS = 1
+HIT = 2
+SPAWN = 3
+PRESENT = 4
+
+# Column name -> array typecode; the file stores each column contiguously
+COLUMNS = (
+    ("kind", "B"),
+    ("t_ns", "q"),
+    ("x", "f"),
+    ("y", "f"),
+    ("size", "f"),
+    ("target", "i")  # Spawn number of the target a SPAWN, PRESENT or HIT is about; -1 otherwise
+)
+
+MAGIC = b"FPSTEL1\0"
+ALIGN = 8
+
+class TelemetryRecorder:
+    """Per-session event recorder backed by preallocated ring buffers.
+
+    Recording writes one slot in each column array; nothing is appended and
+    no per-event container is created, so it keeps up with 1000 Hz mice.
+    When the ring is full the oldest events are overwritten.
+    """
+
+    def __init__(self, capacity=1 << 18):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.columns = {
+            name: array(typecode, bytes(array(typecode).itemsize * capacity))
+            for name, typecode in COLUMNS
+        }
+        self.kind = self.columns["kind"]
+        self.t_ns = self.columns["t_ns"]
+        self.x = self.columns["x"]
+        self.y = self.columns["y"]
+        self.size = self.columns["size"]
+        self.target = self.columns["target"]
+        self.count = 0  # Events recorded this session, including overwritten ones
+
+    def record(self, kind, t_ns, x, y, size=0.0, target=-1):
+        i = self.count & self.mask
+        self.kind[i] = kind
+        self.t_ns[i] = t_ns
+        self.x[i] = x
+        self.y[i] = y
+        self.size[i] = size
+        self.target[i] = target
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def snapshot(self):
+        """Copy the recorded events out in chronological order: {column: bytes}"""
+        rows = len(self)
+        start = self.count & self.mask if self.count > self.capacity else 0
+        result = {}
+        for name, typecode in COLUMNS:
+            column = self.columns[name]
+            if start:
+                data = column[start:].tobytes() + column[:start].tobytes()
+            else:
+                data = column[:rows].tobytes()
+            result[name] = data
+        return result
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+def write_session(path, columns, meta):
+    """Write a snapshot() as a columnar file: magic, header length, JSON header, aligned columns"""
+    rows = len(columns["kind"]) // array("B").itemsize
+    # Column offsets depend on the header size, so repeat until the header fits before them
+    header = b""
+    while True:
+        data_start = _aligned(len(MAGIC) + 4 + len(header))
+        offset = data_start
+        layout = []
+        for name, typecode in COLUMNS:
+            layout.append({"name": name, "type": typecode, "offset": offset})
+            offset = _aligned(offset + len(columns[name]))
+        header = json.dumps({"rows": rows, "columns": layout, "meta": meta}).encode("utf-8")
+        if len(MAGIC) + 4 + len(header) <= data_start:
+            break
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for column in layout:
+            f.write(b"\0" * (column["offset"] - f.tell()))
+            f.write(columns[column["name"]])
+    os.replace(temp_path, path)
+
+def load_session(path):
+    """Memory-map a session file; returns (meta, {column: memoryview}) without parsing rows.
+
+    The memoryviews stay valid while referenced; NumPy users can wrap them
+    with numpy.frombuffer for zero-copy arrays.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a telemetry session")
+    (header_len,) = struct.unpack_from("<I", mapped, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(bytes(mapped[start:start + header_len]).decode("utf-8"))
+    rows = header["rows"]
+    view = memoryview(mapped)
+    columns = {}
+    for column in header["columns"]:
+        itemsize = array(column["type"]).itemsize
+        offset = column["offset"]
+        columns[column["name"]] = view[offset:offset + rows * itemsize].cast(column["type"])
+    return header["meta"], columns
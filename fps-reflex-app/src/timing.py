@@ -0,0 +1,79 @@
+import time
+
+def now_ns():
+    return time.perf_counter_ns()
+
+class ReactionTimer:
+    """Times each target from spawn to first present on screen, and from present to click.
+
+    Grid and tracking keep several targets live at once, so every target
+    has its own stamps and a hit is timed from the target that was hit.
+    """
+
+    def __init__(self):
+        self.live = {}  # target -> [spawn_ns, present_ns or None]
+        self.unseen = []  # Targets spawned since the last present
+        self.shots = []  # (spawn_to_present_ns, present_to_click_ns) per hit target
+
+    def target_spawned(self, target, timestamp_ns=None):
+        self.live[target] = [now_ns() if timestamp_ns is None else timestamp_ns, None]
+        self.unseen.append(target)
+
+    def frame_presented(self, timestamp_ns=None):
+        """Stamp the targets on screen for the first time; returns them"""
+        # Only the first present after a spawn is when the target became visible
+        if not self.unseen:
+            return []
+        present_ns = now_ns() if timestamp_ns is None else timestamp_ns
+        shown = [target for target in self.unseen if target in self.live]
+        for target in shown:
+            self.live[target][1] = present_ns
+        self.unseen = []
+        return shown
+
+    def target_hit(self, target, timestamp_ns=None):
+        """Record a hit on `target` and return the reaction time in seconds"""
+        click_ns = now_ns() if timestamp_ns is None else timestamp_ns
+        stamps = self.live.pop(target, None)
+        if stamps is None:
+            return 0.0
+        spawn_ns, present_ns = stamps
+        # A click can't legitimately precede the present; fall back to the spawn stamp
+        if present_ns is None:
+            present_ns = spawn_ns
+            self.unseen.remove(target)
+        present_ns = min(present_ns, click_ns)
+        self.shots.append((present_ns - spawn_ns, click_ns - present_ns))
+        return (click_ns - present_ns) / 1e9
+
+    def breakdown(self):
+        """Per-shot timings in milliseconds"""
+        return [
+            {"spawn_to_present_ms": spawn / 1e6, "present_to_click_ms": click / 1e6}
+            for spawn, click in self.shots
+        ]
+
+    def reset(self):
+        self.live.clear()
+        self.unseen = []
+        self.shots = []
+
+class StartupTimer:
+    """Durations of consecutive startup phases, each measured from the end of the previous one"""
+
+    def __init__(self, start_ns=None):
+        self.last_ns = now_ns() if start_ns is None else start_ns
+        self.phases = []  # (name, duration_ns)
+
+    def mark(self, phase):
+        timestamp = now_ns()
+        self.phases.append((phase, timestamp - self.last_ns))
+        self.last_ns = timestamp
+
+    def total_ns(self):
+        return sum(duration for _, duration in self.phases)
+
+    def report(self):
+        lines = [f"{phase:<12} {duration / 1e6:8.1f} ms" for phase, duration in self.phases]
+        lines.append(f"{'total':<12} {self.total_ns() / 1e6:8.1f} ms")
+        return "\n".join(lines)
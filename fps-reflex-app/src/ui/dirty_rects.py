@@ -0,0 +1,50 @@
+import pygame
+
+class DirtyRectTracker:
+    """Tracks what was drawn last frame so only changed regions get presented"""
+
+    # States whose frames are redrawn incrementally; everything else repaints the whole screen
+    INCREMENTAL_STATES = ("playing",)
+
+    def __init__(self, incremental_states=None):
+        if incremental_states is not None:
+            self.INCREMENTAL_STATES = incremental_states
+        self.state = None
+        self.full_redraw = True
+        self.previous = []  # (rect tuple, content key) pairs drawn last frame
+        self.current = []
+
+    def begin_frame(self, state):
+        if state != self.state or state not in self.INCREMENTAL_STATES:
+            self.full_redraw = True
+        self.state = state
+        self.current = []
+        return self.full_redraw
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def erase(self, surface, color):
+        # Clear everything drawn last frame; unchanged items are redrawn on top
+        for rect, key in self.previous:
+            surface.fill(color, rect)
+
+    def add(self, rect, key=None):
+        self.current.append((tuple(rect), key))
+
+    def changed_rects(self):
+        previous = set(self.previous)
+        current = set(self.current)
+        rects = [rect for rect, key in self.current if (rect, key) not in previous]
+        rects += [rect for rect, key in self.previous if (rect, key) not in current]
+        return rects
+
+    def present(self):
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            rects = self.changed_rects()
+            if rects:
+                pygame.display.update(rects)
+        self.previous = self.current
+        self.full_redraw = False
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import sys
+import time
+import pygame
+
+# Directories whose contents decide which system fonts exist. Installing or
+# removing a font changes a directory mtime here (or in fontconfig's cache).
+FONT_DIRS = {
+    "linux": [
+        "/usr/share/fonts",
+        "/usr/local/share/fonts",
+        "~/.fonts",
+        "~/.local/share/fonts",
+        "/var/cache/fontconfig",
+        "~/.cache/fontconfig"
+    ],
+    "darwin": [
+        "/System/Library/Fonts",
+        "/Library/Fonts",
+        "~/Library/Fonts"
+    ],
+    "win32": [
+        os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+        os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts")
+    ]
+}
+
+def font_state_fingerprint():
+    """Hash of the font directories' mtimes (one level deep) and the pygame version"""
+    platform = "linux" if sys.platform.startswith("linux") else sys.platform
+    state = [pygame.version.ver]
+    for directory in FONT_DIRS.get(platform, FONT_DIRS["linux"]):
+        directory = os.path.expanduser(directory)
+        try:
+            state.append((directory, os.stat(directory).st_mtime_ns))
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        state.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+        except OSError:
+            continue
+    return hashlib.sha1(json.dumps(sorted(map(str, state))).encode()).hexdigest()
+
+class FontResolver:
+    """Maps a preference list of font names to one font file, cached on disk.
+
+    pygame's SysFont enumerates every system font on first use (fc-list on
+    Linux), which dominates a cold start. The result of resolving our list is
+    stored in `cache_path` keyed by the list and a fingerprint of the system
+    font directories, so later starts skip the enumeration entirely.
+    """
+
+    def __init__(self, names, bold=True, cache_path=None):
+        self.names = list(names)
+        self.bold = bold
+        self.cache_path = cache_path
+        self.path = None
+        self.synthetic_bold = bold  # Fake bold unless a real bold face is found
+        self.resolved = False
+        self.cache_hit = False
+        self.resolve_ns = 0
+
+    def key(self):
+        return json.dumps([self.names, self.bold])
+
+    def resolve(self):
+        """Return (font file or None for pygame's default font, synthetic_bold)"""
+        if self.resolved:
+            return self.path, self.synthetic_bold
+        started = time.perf_counter_ns()
+        fingerprint = font_state_fingerprint()
+        entries = self._read_cache()
+        entry = entries.get(self.key())
+        if entry and entry["fingerprint"] == fingerprint and (entry["path"] is None or os.path.exists(entry["path"])):
+            self.path = entry["path"]
+            self.synthetic_bold = entry["synthetic_bold"]
+            self.cache_hit = True
+        else:
+            self._match()
+            if self.cache_path:
+                # Entries for an older font state are dropped rather than kept around
+                entries = {key: value for key, value in entries.items() if value.get("fingerprint") == fingerprint}
+                entries[self.key()] = {"fingerprint": fingerprint, "path": self.path, "synthetic_bold": self.synthetic_bold}
+                self._write_cache(entries)
+        self.resolved = True
+        self.resolve_ns = time.perf_counter_ns() - started
+        return self.path, self.synthetic_bold
+
+    def _match(self):
+        # Same choice SysFont makes: the first listed name that exists, with a real bold face if it has one
+        plain = pygame.font.match_font(self.names)
+        styled = pygame.font.match_font(self.names, bold=self.bold)
+        self.path = styled or plain
+        self.synthetic_bold = self.bold and (styled is None or styled == plain)
+
+    def _read_cache(self):
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self, entries):
+        temp_path = self.cache_path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not write font cache: {e}")
+
+class LazyFonts:
+    """Fonts from one resolved file, loaded the first time each size is asked for"""
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+        self.fonts = {}
+        self.load_ns = 0
+
+    def get(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            path, synthetic_bold = self.resolver.resolve()
+            started = time.perf_counter_ns()
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(path, size)
+            font.set_bold(synthetic_bold)
+            self.load_ns += time.perf_counter_ns() - started
+            self.fonts[size] = font
+        return font
@@ -0,0 +1,39 @@
+import numpy as np
+import pygame
+
+def heat_colors(counts):
+    """(rows, columns) counts as (rows, columns, 3) black-red-yellow-white pixels"""
+    peak = counts.max()
+    if not peak:
+        return np.zeros(counts.shape + (3,), dtype=np.uint8)
+    level = np.sqrt(counts / peak)  # Square root, so bins with a single click still show
+    rgb = np.stack([np.clip(3 * level - channel, 0.0, 1.0) for channel in range(3)], axis=-1)
+    return (rgb * 255).astype(np.uint8)
+
+class HeatmapCache:
+    """A rendered AccuracyMap, rebuilt only when the map changes or a new size is asked for"""
+
+    def __init__(self):
+        self.surface = None
+        self.key = None
+        self.renders = 0
+
+    def get(self, aim, size):
+        key = (id(aim), aim.version, size)
+        if key != self.key or self.surface is None:
+            self.surface = self._render(aim, size)
+            self.key = key
+            self.renders += 1
+        return self.surface
+
+    def _render(self, aim, size):
+        # surfarray is indexed [x, y]; the counts are [row (y), column (x)]
+        cells = pygame.surfarray.make_surface(heat_colors(aim.counts).transpose(1, 0, 2))
+        surface = pygame.transform.scale(cells, (size, size))
+        center = size // 2
+        outline = (90, 90, 90)
+        pygame.draw.circle(surface, outline, (center, center), round(size / (2 * aim.extent)), 1)  # The target's edge
+        pygame.draw.line(surface, outline, (center, 0), (center, size - 1))
+        pygame.draw.line(surface, outline, (0, center), (size - 1, center))
+        pygame.draw.rect(surface, outline, surface.get_rect(), 1)
+        return surface
@@ -0,0 +1,42 @@
+import pygame
+
+class SceneCache:
+    """Whole-screen surfaces for screens that are redrawn only when invalidated.
+
+    Invalidated surfaces are kept as spares and reused for the next render of
+    the same screen, so invalidation doesn't allocate a new screen-sized surface.
+    """
+
+    def __init__(self):
+        self.scenes = {}  # game state -> rendered surface
+        self.spares = {}  # game state -> surface to draw into next
+        self.hits = 0
+        self.renders = 0
+
+    def get(self, state):
+        scene = self.scenes.get(state)
+        if scene is not None:
+            self.hits += 1
+        return scene
+
+    def surface_for(self, state, size):
+        surface = self.spares.pop(state, None)
+        if surface is None or surface.get_size() != size:
+            surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()  # Same pixel format as the screen, for the fastest blit
+        return surface
+
+    def store(self, state, surface):
+        self.scenes[state] = surface
+        self.renders += 1
+
+    def invalidate(self, state=None):
+        states = list(self.scenes) if state is None else [state]
+        for name in states:
+            scene = self.scenes.pop(name, None)
+            if scene is not None:
+                self.spares[name] = scene
+
+    def stats(self):
+        return {"scenes": len(self.scenes), "hits": self.hits, "renders": self.renders}
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color)"""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)  # Evict least recently used
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        return {
+            "size": len(self.surfaces),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def __len__(self):
+        return len(self.surfaces)
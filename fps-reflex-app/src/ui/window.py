@@ -1,170 +1,237 @@
 import pygame
 import os
+import time
+import metrics
 from game_mode import GameMode
+from history import weighted_time
+from ui.text_cache import TextCache
+from ui.dirty_rects import DirtyRectTracker
+from ui.fonts import FontResolver, LazyFonts
+from ui.scene_cache import SceneCache
+
+FRAME_BUDGET_NS = 16_666_667
+FRAMES = metrics.REGISTRY.counter("fps_frames_total", "Frames drawn")
+FRAME_OVERRUNS = metrics.REGISTRY.counter("fps_frame_overruns_total", "Frames that took longer than 1/60 s to draw and present")
+RENDER_SECONDS = metrics.REGISTRY.histogram("fps_render_seconds", "Time to draw and present a frame")
 
 class GameWindow:
-    def __init__(self, width, height):
+    # Screens that only change on explicit events; each is drawn once into a cached surface
+    SCENE_STATES = ("menu", "mode_select", "confirm_clear", "ended", "name_input")
+
+    def __init__(self, width, height, font_cache=None):
         self.width = width
         self.height = height
         self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
         self.width, self.height = self.screen.get_size()  # Get actual screen size
         pygame.display.set_caption("Target Practice Game")
         self.clock = pygame.time.Clock()
-        pygame.font.init()
-        
-        # Try arcade-style system fonts in order of preference
-        font_names = ['Consolas', 'Courier New', 'Lucida Console', 'Monaco']
-        
-        # Find first available monospace font
-        selected_font = None
-        selected_font_name = None
-        for font_name in font_names:
-            try:
-                selected_font = pygame.font.SysFont(font_name, 36, bold=True)  # Bold for arcade feel
-                selected_font_name = font_name
-                break
-            except:
-                continue
-                
-        # Fallback to default if no system fonts work
-        if not selected_font:
-            selected_font = pygame.font.Font(None, 36)
-            selected_font_name = None
-            
-        self.font = selected_font
-        self.title_font = pygame.font.SysFont(selected_font_name if selected_font_name else None, 56, bold=True)  # Larger size for title
-        self.button_font = pygame.font.SysFont(selected_font_name if selected_font_name else None, 32, bold=True)  # Smaller font for buttons
-        self.countdown_font = pygame.font.SysFont(selected_font_name if selected_font_name else None, 120, bold=True)  # Countdown font
-            
-        # Standard button dimensions as instance variables
-        self.button_width = 400
-        self.button_height = 60
-        self.button_spacing = 40
-        
-        # Update all button rectangles with new width
-        self.button_rect = pygame.Rect(
-            width//2 - self.button_width//2,
-            height//2 - self.button_height//2,
-            self.button_width,
-            self.button_height
-        )
-        
-        self.continue_button_rect = pygame.Rect(
-            width//2 - self.button_width//2,
-            height//2 + 50,
-            self.button_width,
-            self.button_height
-        )
-        
-        # Clear button using same dimensions
-        self.clear_button_rect = pygame.Rect(
-            width//2 - self.button_width//2,
-            height - 150,
-            self.button_width,
-            self.button_height
-        )
-        
-        self.confirm_yes_rect = pygame.Rect(width//2 - 160, height//2 + 20, 120, 40)
-        self.confirm_no_rect = pygame.Rect(width//2 + 40, height//2 + 20, 120, 40)
+
+        # Arcade-style monospace fonts in order of preference. The font file is
+        # resolved once (and cached on disk when font_cache is given); each
+        # size is only loaded the first time something is drawn with it.
+        self.fonts = LazyFonts(FontResolver(['Consolas', 'Courier New', 'Lucida Console', 'Monaco'], bold=True, cache_path=font_cache))
+
+        # Rendered text is reused across frames; leaderboard lines are dropped when scores change
+        self.text_cache = TextCache(max_size=256)
+        self.scenes = SceneCache()
+        self.watched_scores = None  # Highscores this window gets change notifications from
+        self.rank_key = None
+        self.rank = None
+        self.rank_by = "time"  # Or "weighted": leaderboards rank by accuracy-weighted time
+        self.heatmaps = None  # HeatmapCache, created on the first ended screen (it loads NumPy)
+
+        # During play only the targets and HUD change, so only their regions are presented;
+        # a cached scene that is already on screen needs no present at all
+        self.dirty_rects = DirtyRectTracker(("playing",) + self.SCENE_STATES)
+        self.last_present_ns = None  # perf_counter_ns right after the last present
+
         self.input_text = ""
         self.input_active = False
+        self._layout(width, height)
 
-        # Create mode selection buttons with new dimensions - position on right side
-        self.mode_buttons = {}
-        button_section_width = self.width // 3  # Right third of screen
-        button_x = self.width - button_section_width + (button_section_width - self.button_width) // 2
-        y_pos = height//2 - 150  # Start higher up to accommodate all buttons
-        
-        for mode_key, mode_info in GameMode.get_all_modes().items():
-            self.mode_buttons[mode_key] = pygame.Rect(
-                button_x,
-                y_pos,
-                self.button_width,
-                self.button_height
-            )
-            y_pos += self.button_height + self.button_spacing
+    @property
+    def font(self):
+        return self.fonts.get(36)
 
-        # Add padding for leaderboard layout
-        self.leaderboard_padding = 20
-        self.score_height = 25  # Height per score entry
+    @property
+    def title_font(self):
+        return self.fonts.get(56)
 
-        # Add clear scores button at bottom of screen
-        self.clear_scores_button = pygame.Rect(
-            width//2 - self.button_width//2,
-            height - 100,  # Position near bottom
-            self.button_width,
-            self.button_height
-        )
+    @property
+    def button_font(self):
+        return self.fonts.get(32)
 
-    def update_display(self, game_state, targets, remaining_targets=0, max_targets=0, avg_reaction_time=0, highscores=None, input_text="", current_mode=None, countdown_time=None):
-        self.screen.fill((0, 0, 0))  # Changed from white to black
+    @property
+    def countdown_font(self):
+        return self.fonts.get(120)
+
+    def update_display(self, game_state, targets, remaining_targets=0, max_targets=0, avg_reaction_time=0, highscores=None, input_text="", current_mode=None, countdown_time=None, overlay=None, aim=None):
+        started_ns = time.perf_counter_ns()
+        if highscores is not None and highscores is not self.watched_scores:
+            highscores.add_listener(self.scores_changed)
+            self.watched_scores = highscores
+            self.scores_changed()
+
+        full_redraw = self.dirty_rects.begin_frame(game_state)
+        if game_state in self.SCENE_STATES:
+            # The whole screen comes from a surface rendered once per invalidation; it also
+            # covers last frame's overlay, so only a new render needs a full present
+            scene = self.scenes.get(game_state)
+            if scene is None:
+                scene = self.scenes.surface_for(game_state, (self.width, self.height))
+                scene.fill((0, 0, 0))
+                self._draw_scene(scene, game_state, highscores, input_text, current_mode, avg_reaction_time, aim)
+                self.scenes.store(game_state, scene)
+                self.dirty_rects.invalidate()
+            self.screen.blit(scene, (0, 0))
+        elif full_redraw:
+            self.screen.fill((0, 0, 0))  # Changed from white to black
+        else:
+            self.dirty_rects.erase(self.screen, (0, 0, 0))
+
+        if game_state == "countdown":
+            # Draw countdown text
+            if countdown_time is not None:
+                countdown_text = str(countdown_time)
+                text = self.text_cache.render(self.countdown_font, countdown_text, (255, 255, 255))
+                text_rect = text.get_rect(center=(self.width//2, self.height//2))
+                self.screen.blit(text, text_rect)
+                
+                # Draw "Get Ready!" text
+                ready_text = self.text_cache.render(self.font, "Get Ready!", (255, 255, 255))
+                ready_rect = ready_text.get_rect(center=(self.width//2, self.height//2 - 100))
+                self.screen.blit(ready_text, ready_rect)
+                
+                # Draw selected mode
+                if current_mode:
+                    mode_info = GameMode.get_mode_info(current_mode)
+                    mode_text = self.text_cache.render(self.font, mode_info['name'], (255, 255, 255))
+                    mode_rect = mode_text.get_rect(center=(self.width//2, self.height//2 + 100))
+                    self.screen.blit(mode_text, mode_rect)
+
+        elif game_state not in self.SCENE_STATES:
+            # Draw targets
+            for target in targets:
+                rect = pygame.draw.circle(self.screen, (255, 0, 0), (target.x, target.y), target.size)
+                self.dirty_rects.add(rect, (target.x, target.y, target.size))
+            
+            # Draw target counter with white text for better visibility on black
+            counter_text = f"Targets: {remaining_targets}/{max_targets}"  # Changed from max_targets - remaining_targets
+            text = self.text_cache.render(self.font, counter_text, (255, 255, 255))
+            rect = self.screen.blit(text, (10, 10))
+            self.dirty_rects.add(rect, counter_text)
         
+        if overlay:
+            self._draw_overlay(overlay)
+
+        self.dirty_rects.present()
+        self.last_present_ns = time.perf_counter_ns()
+        render_ns = self.last_present_ns - started_ns
+        FRAMES.inc()
+        RENDER_SECONDS.observe_ns(render_ns)
+        if render_ns > FRAME_BUDGET_NS:
+            FRAME_OVERRUNS.inc()
+
+    def scores_changed(self):
+        """Highscores listener: every screen showing scores has to be redrawn"""
+        self.text_cache.clear()
+        self.scenes.invalidate()
+
+    def invalidate_scene(self, game_state=None):
+        """Redraw a static screen (or all of them) on its next frame"""
+        self.scenes.invalidate(game_state)
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+        self._layout(width, height)
+        self.scenes.invalidate()
+        self.dirty_rects.invalidate()
+
+    def _draw_scene(self, surface, game_state, highscores, input_text, current_mode, avg_reaction_time, aim=None):
+        """Draw one of the static screens (SCENE_STATES) onto `surface`"""
         if game_state == "menu":
             # Draw start button
-            pygame.draw.rect(self.screen, (0, 255, 0), self.button_rect)
-            text = self.font.render("Start", True, (0, 0, 0))
+            pygame.draw.rect(surface, (0, 255, 0), self.button_rect)
+            text = self.text_cache.render(self.font, "Start", (0, 0, 0))
             text_rect = text.get_rect(center=self.button_rect.center)
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
             
             # Draw leaderboard
             if highscores and highscores.get_top_scores():
                 # Draw title
-                title = self.title_font.render("Top 10 Scores:", True, (255, 255, 255))
+                title = self.text_cache.render(self.title_font, "Top 10 Scores:", (255, 255, 255))
                 title_rect = title.get_rect(center=(self.width//2, 50))
-                self.screen.blit(title, title_rect)
+                surface.blit(title, title_rect)
                 
                 # Draw scores with ranking numbers
                 for i, score in enumerate(highscores.get_top_scores(10)):
                     date_str = score.get('date', 'N/A')  # Fallback for old scores
                     score_text = f"#{i+1}. {score['name']}: {score['time']:.3f}s ({date_str})"
-                    text = self.font.render(score_text, True, (255, 255, 255))
+                    text = self.text_cache.render(self.font, score_text, (255, 255, 255))
                     text_rect = text.get_rect(center=(self.width//2, 120 + i * 40))
-                    self.screen.blit(text, text_rect)
+                    surface.blit(text, text_rect)
                     
             # Draw clear leaderboard button with smaller font
-            pygame.draw.rect(self.screen, (255, 50, 50), self.clear_button_rect)
-            clear_text = self.button_font.render("Clear Scores", True, (0, 0, 0))
+            pygame.draw.rect(surface, (255, 50, 50), self.clear_button_rect)
+            clear_text = self.text_cache.render(self.button_font, "Clear Scores", (0, 0, 0))
             clear_rect = clear_text.get_rect(center=self.clear_button_rect.center)
-            self.screen.blit(clear_text, clear_rect)
+            surface.blit(clear_text, clear_rect)
 
         elif game_state == "name_input":
             # Draw name input field
-            prompt = self.font.render("Enter your name:", True, (255, 255, 255))
-            self.screen.blit(prompt, (self.width//2 - 100, self.height//2 - 100))
+            prompt = self.text_cache.render(self.font, "Enter your name:", (255, 255, 255))
+            surface.blit(prompt, (self.width//2 - 100, self.height//2 - 100))
             
             input_bg = pygame.Rect(self.width//2 - 100, self.height//2 - 50, 200, 40)
-            pygame.draw.rect(self.screen, (255, 255, 255), input_bg)
+            pygame.draw.rect(surface, (255, 255, 255), input_bg)
             
-            text_surface = self.font.render(input_text, True, (0, 0, 0))
-            self.screen.blit(text_surface, (input_bg.x + 5, input_bg.y + 5))
+            text_surface = self.text_cache.render(self.font, input_text, (0, 0, 0))
+            surface.blit(text_surface, (input_bg.x + 5, input_bg.y + 5))
             
-            instruction = self.font.render("Press ENTER to submit", True, (255, 255, 255))
-            self.screen.blit(instruction, (self.width//2 - 100, self.height//2 + 20))
+            instruction = self.text_cache.render(self.font, "Press ENTER to submit", (255, 255, 255))
+            surface.blit(instruction, (self.width//2 - 100, self.height//2 + 20))
             
         elif game_state == "ended":
             # Draw score text
             score_text = f"Average Reaction Time: {avg_reaction_time:.3f} seconds"
-            text = self.font.render(score_text, True, (255, 255, 255))
+            text = self.text_cache.render(self.font, score_text, (255, 255, 255))
             text_rect = text.get_rect(center=(self.width//2, self.height//2 - 50))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
+
+            if aim is not None and aim.clicks:
+                self._draw_aim(surface, aim)
+
+            # Draw where this run would place on the full leaderboard
+            if highscores is not None and current_mode:
+                accuracy = aim.accuracy if aim is not None else None
+                rank_text = f"Leaderboard Rank: #{self._get_rank(highscores, current_mode, avg_reaction_time, accuracy)}"
+                if self.rank_by == "weighted":
+                    rank_text += " (accuracy-weighted)"
+                text = self.text_cache.render(self.button_font, rank_text, (255, 255, 255))
+                text_rect = text.get_rect(center=(self.width//2, self.height//2))
+                surface.blit(text, text_rect)
             
             # Draw continue button
-            pygame.draw.rect(self.screen, (0, 255, 0), self.continue_button_rect)
-            continue_text = self.font.render("Continue", True, (0, 0, 0))
+            pygame.draw.rect(surface, (0, 255, 0), self.continue_button_rect)
+            continue_text = self.text_cache.render(self.font, "Continue", (0, 0, 0))
             continue_rect = continue_text.get_rect(center=self.continue_button_rect.center)
-            self.screen.blit(continue_text, continue_rect)
+            surface.blit(continue_text, continue_rect)
 
         elif game_state == "confirm_clear":
             # Draw confirmation dialog
             # Title
-            title = self.title_font.render("Clear All Leaderboards?", True, (255, 255, 255))
+            title = self.text_cache.render(self.title_font, self._clear_label(highscores) + "?", (255, 255, 255))
             title_rect = title.get_rect(center=(self.width//2, self.height//2 - 80))
-            self.screen.blit(title, title_rect)
+            surface.blit(title, title_rect)
             
             # Warning message
-            warning = self.font.render("This action cannot be undone!", True, (255, 50, 50))
+            warning = self.text_cache.render(self.font, "This action cannot be undone!", (255, 50, 50))
             warning_rect = warning.get_rect(center=(self.width//2, self.height//2 - 20))
-            self.screen.blit(warning, warning_rect)
+            surface.blit(warning, warning_rect)
+            if self._shared_board(highscores):
+                note = self.text_cache.render(self.font, "The shared leaderboard is not affected", (200, 200, 200))
+                surface.blit(note, note.get_rect(center=(self.width//2, self.height//2 + 100)))
 
             # Yes/No buttons
             button_configs = [
@@ -173,123 +240,205 @@ class GameWindow:
             ]
             
             for rect, text, color in button_configs:
-                pygame.draw.rect(self.screen, color, rect)
-                button_text = self.button_font.render(text, True, (0, 0, 0))
+                pygame.draw.rect(surface, color, rect)
+                button_text = self.text_cache.render(self.button_font, text, (0, 0, 0))
                 text_rect = button_text.get_rect(center=rect.center)
-                self.screen.blit(button_text, text_rect)
+                surface.blit(button_text, text_rect)
 
         elif game_state == "mode_select":
             # Draw title
-            title = self.title_font.render("FPS Reflex Practice", True, (255, 255, 255))
+            title = self.text_cache.render(self.title_font, "FPS Reflex Practice", (255, 255, 255))
             title_rect = title.get_rect(center=(self.width//2, 50))
-            self.screen.blit(title, title_rect)
+            surface.blit(title, title_rect)
 
             # Draw mode buttons on right side
             for mode_key, button_rect in self.mode_buttons.items():
                 mode_info = GameMode.get_mode_info(mode_key)
-                pygame.draw.rect(self.screen, (0, 255, 0), self.mode_buttons[mode_key])
+                pygame.draw.rect(surface, (0, 255, 0), self.mode_buttons[mode_key])
                 mode_text = mode_info['name']
-                text = self.button_font.render(mode_text, True, (0, 0, 0))
+                text = self.text_cache.render(self.button_font, mode_text, (0, 0, 0))
                 text_rect = text.get_rect(center=self.mode_buttons[mode_key].center)
-                self.screen.blit(text, text_rect)
+                surface.blit(text, text_rect)
 
             # Draw all leaderboards in left two-thirds of screen
             leaderboard_width = (2 * self.width) // 3 - self.leaderboard_padding * 2
-            top_modes = ["quick", "normal"]
-            bottom_modes = ["burst", "extended"]
+            modes = list(GameMode.MODES)
+            rows = [modes[i:i + 2] for i in range(0, len(modes), 2)]  # Two leaderboards per row
+            row_spacing = (self.height - 270) // len(rows)
             
-            # Top row leaderboards
             x_pos = self.leaderboard_padding
             y_pos = 120
-            self._draw_leaderboard_row(x_pos, y_pos, top_modes, highscores, leaderboard_width)
-
-            # Bottom row leaderboards
-            y_pos = self.height // 2
-            self._draw_leaderboard_row(x_pos, y_pos, bottom_modes, highscores, leaderboard_width)
+            for row_modes in rows:
+                self._draw_leaderboard_row(surface, x_pos, y_pos, row_modes, highscores, leaderboard_width)
+                y_pos += row_spacing
 
             # Draw clear scores button at bottom
-            pygame.draw.rect(self.screen, (255, 50, 50), self.clear_scores_button)
-            clear_text = self.button_font.render("Clear All Leaderboards", True, (0, 0, 0))
+            pygame.draw.rect(surface, (255, 50, 50), self.clear_scores_button)
+            clear_text = self.text_cache.render(self.button_font, self._clear_label(highscores), (0, 0, 0))
             clear_rect = clear_text.get_rect(center=self.clear_scores_button.center)
-            self.screen.blit(clear_text, clear_rect)
+            surface.blit(clear_text, clear_rect)
 
-        elif game_state == "countdown":
-            # Draw countdown text
-            if countdown_time is not None:
-                countdown_text = str(countdown_time)
-                text = self.countdown_font.render(countdown_text, True, (255, 255, 255))
-                text_rect = text.get_rect(center=(self.width//2, self.height//2))
-                self.screen.blit(text, text_rect)
-                
-                # Draw "Get Ready!" text
-                ready_text = self.font.render("Get Ready!", True, (255, 255, 255))
-                ready_rect = ready_text.get_rect(center=(self.width//2, self.height//2 - 100))
-                self.screen.blit(ready_text, ready_rect)
-                
-                # Draw selected mode
-                if current_mode:
-                    mode_info = GameMode.get_mode_info(current_mode)
-                    mode_text = self.font.render(mode_info['name'], True, (255, 255, 255))
-                    mode_rect = mode_text.get_rect(center=(self.width//2, self.height//2 + 100))
-                    self.screen.blit(mode_text, mode_rect)
+    def _layout(self, width, height):
+        """Button and leaderboard positions for a screen size"""
+        # Standard button dimensions as instance variables
+        self.button_width = 400
+        self.button_height = 60
+        self.button_spacing = 40
+        
+        # Update all button rectangles with new width
+        self.button_rect = pygame.Rect(
+            width//2 - self.button_width//2,
+            height//2 - self.button_height//2,
+            self.button_width,
+            self.button_height
+        )
+        
+        self.continue_button_rect = pygame.Rect(
+            width//2 - self.button_width//2,
+            height//2 + 50,
+            self.button_width,
+            self.button_height
+        )
+        
+        # Clear button using same dimensions
+        self.clear_button_rect = pygame.Rect(
+            width//2 - self.button_width//2,
+            height - 150,
+            self.button_width,
+            self.button_height
+        )
+        
+        self.confirm_yes_rect = pygame.Rect(width//2 - 160, height//2 + 20, 120, 40)
+        self.confirm_no_rect = pygame.Rect(width//2 + 40, height//2 + 20, 120, 40)
 
-        else:
-            # Draw targets
-            for target in targets:
-                pygame.draw.circle(self.screen, (255, 0, 0), (target.x, target.y), target.size)
-            
-            # Draw target counter with white text for better visibility on black
-            counter_text = f"Targets: {remaining_targets}/{max_targets}"  # Changed from max_targets - remaining_targets
-            text = self.font.render(counter_text, True, (255, 255, 255))
-            self.screen.blit(text, (10, 10))
+        # Create mode selection buttons with new dimensions - position on right side
+        self.mode_buttons = {}
+        button_section_width = self.width // 3  # Right third of screen
+        button_x = self.width - button_section_width + (button_section_width - self.button_width) // 2
+        # Center the column of buttons vertically
+        y_pos = height//2 - (len(GameMode.MODES) * (self.button_height + self.button_spacing)) // 2
         
-        pygame.display.flip()
+        for mode_key, mode_info in GameMode.get_all_modes().items():
+            self.mode_buttons[mode_key] = pygame.Rect(
+                button_x,
+                y_pos,
+                self.button_width,
+                self.button_height
+            )
+            y_pos += self.button_height + self.button_spacing
+
+        # Add padding for leaderboard layout
+        self.leaderboard_padding = 20
+        self.score_height = 25  # Height per score entry
+
+        # Add clear scores button at bottom of screen
+        self.clear_scores_button = pygame.Rect(
+            width//2 - self.button_width//2,
+            height - 100,  # Position near bottom
+            self.button_width,
+            self.button_height
+        )
+
+    def _draw_overlay(self, lines):
+        """Helper method to draw debug text in the top right corner"""
+        y_pos = 10
+        for line in lines:
+            text = self.text_cache.render(self.button_font, line, (255, 255, 0))
+            rect = text.get_rect(topright=(self.width - 10, y_pos))
+            self.screen.fill((0, 0, 0), rect)
+            self.screen.blit(text, rect)
+            self.dirty_rects.add(rect, line)
+            y_pos += rect.height
+
+    def _get_rank(self, highscores, mode, reaction_time, accuracy=None):
+        """Helper method to query the rank only when the run or the scores change"""
+        key = (mode, reaction_time, accuracy, self.rank_by, highscores.version)
+        if key != self.rank_key:
+            self.rank_key = key
+            self.rank = highscores.get_rank(mode, reaction_time, accuracy, self.rank_by)
+        return self.rank
+
+    def _draw_aim(self, surface, aim):
+        """Helper method to draw the round's click heatmap and accuracy above the results"""
+        if self.heatmaps is None:
+            from ui.heatmap import HeatmapCache
+            self.heatmaps = HeatmapCache()
+        size = max(0, min(240, self.height // 2 - 170))
+        if size:
+            heatmap = self.heatmaps.get(aim, size)
+            surface.blit(heatmap, heatmap.get_rect(midtop=(self.width//2, 30)))
+        bias_x, bias_y = aim.bias()
+        lines = [
+            f"Accuracy: {aim.accuracy:.0%} ({aim.hits}/{aim.clicks} clicks)",
+            f"Aim bias: {abs(bias_x):.2f} {'right' if bias_x >= 0 else 'left'}, {abs(bias_y):.2f} {'down' if bias_y >= 0 else 'up'} (target radii)"
+        ]
+        y_pos = 30 + size + 5
+        for line in lines:
+            text = self.text_cache.render(self.button_font, line, (255, 255, 255))
+            surface.blit(text, text.get_rect(midtop=(self.width//2, y_pos)))
+            y_pos += text.get_height()
+
+    def _shared_board(self, highscores):
+        return highscores is not None and highscores.remote is not None
+
+    def _clear_label(self, highscores):
+        """What the clear button empties: with a shared board attached only this kiosk's scores are cleared"""
+        return "Clear Local Scores" if self._shared_board(highscores) else "Clear All Leaderboards"
+
+    def _score_line(self, rank, score):
+        """One leaderboard entry; weighted boards show the weighted time and the accuracy behind it"""
+        accuracy = score.get('accuracy')
+        if self.rank_by == "weighted":
+            weighted = weighted_time(score['time'], accuracy)
+            accuracy_text = f"{accuracy:.0%}" if accuracy is not None else "n/a"
+            return f"#{rank}. {score['name']}: {weighted:.3f}s ({accuracy_text})"
+        return f"#{rank}. {score['name']}: {score['time']:.3f}s ({score.get('date', 'N/A')})"
 
-    def _draw_leaderboard_column(self, x_pos, y_pos, modes, highscores):
+    def _draw_leaderboard_column(self, surface, x_pos, y_pos, modes, highscores):
         """Helper method to draw a column of leaderboards"""
         for mode_key in modes:
             mode_info = GameMode.get_mode_info(mode_key)
-            scores = highscores.get_top_scores(mode_key, 5)  # Show top 5 for each mode
+            scores = highscores.get_top_scores(mode_key, 5, self.rank_by)  # Show top 5 for each mode
             
             # Draw mode title
-            title = self.font.render(f"{mode_info['name']} - Top Scores:", True, (255, 255, 255))
-            self.screen.blit(title, (x_pos, y_pos))
+            title = self.text_cache.render(self.font, f"{mode_info['name']} - Top Scores:", (255, 255, 255))
+            surface.blit(title, (x_pos, y_pos))
             y_pos += 35
 
             # Draw scores
             if scores:
                 for i, score in enumerate(scores):
-                    score_text = f"#{i+1}. {score['name']}: {score['time']:.3f}s ({score.get('date', 'N/A')})"
-                    text = self.button_font.render(score_text, True, (255, 255, 255))
-                    self.screen.blit(text, (x_pos + 20, y_pos))
+                    score_text = self._score_line(i + 1, score)
+                    text = self.text_cache.render(self.button_font, score_text, (255, 255, 255))
+                    surface.blit(text, (x_pos + 20, y_pos))
                     y_pos += self.score_height
             else:
-                text = self.button_font.render("No scores yet", True, (255, 255, 255))
-                self.screen.blit(text, (x_pos + 20, y_pos))
+                text = self.text_cache.render(self.button_font, "No scores yet", (255, 255, 255))
+                surface.blit(text, (x_pos + 20, y_pos))
             
             y_pos += 40  # Add space between different mode leaderboards
 
-    def _draw_leaderboard_row(self, x_pos, y_pos, modes, highscores, total_width):
+    def _draw_leaderboard_row(self, surface, x_pos, y_pos, modes, highscores, total_width):
         """Helper method to draw a row of leaderboards"""
         width_per_board = total_width // len(modes)
         
         for i, mode_key in enumerate(modes):
             mode_info = GameMode.get_mode_info(mode_key)
-            scores = highscores.get_top_scores(mode_key, 5)
+            scores = highscores.get_top_scores(mode_key, 5, self.rank_by)
             
             # Draw mode title
-            title = self.font.render(f"{mode_info['name']} - Top Scores:", True, (255, 255, 255))
-            self.screen.blit(title, (x_pos + i * width_per_board, y_pos))
+            title = self.text_cache.render(self.font, f"{mode_info['name']} - Top Scores:", (255, 255, 255))
+            surface.blit(title, (x_pos + i * width_per_board, y_pos))
             
             # Draw scores
             if scores:
                 for j, score in enumerate(scores):
-                    score_text = f"#{j+1}. {score['name']}: {score['time']:.3f}s ({score.get('date', 'N/A')})"
-                    text = self.button_font.render(score_text, True, (255, 255, 255))
-                    self.screen.blit(text, (x_pos + i * width_per_board + 20, y_pos + 35 + j * self.score_height))
+                    score_text = self._score_line(j + 1, score)
+                    text = self.text_cache.render(self.button_font, score_text, (255, 255, 255))
+                    surface.blit(text, (x_pos + i * width_per_board + 20, y_pos + 35 + j * self.score_height))
             else:
-                text = self.button_font.render("No scores yet", True, (255, 255, 255))
-                self.screen.blit(text, (x_pos + i * width_per_board + 20, y_pos + 35))
+                text = self.text_cache.render(self.button_font, "No scores yet", (255, 255, 255))
+                surface.blit(text, (x_pos + i * width_per_board + 20, y_pos + 35))
 
     def handle_mouse_click(self, pos):
         return pos  # Return the position of the mouse click
@@ -0,0 +1,392 @@
+import heapq
+import json
+import random
+import socket
+import time
+import uuid
+from collections import deque
+from spawns import new_seed
+from timing import now_ns
+
+# Protocol: one JSON object per datagram, "t" is the message type.
+#   hello {v, name, id, area} -> welcome {name}       handshake, repeated until answered
+#                             | busy | refuse {why}   area is the play area [width, height]
+#   ping {c} -> pong {c, r}                           clock offset: c = sender's clock, r = receiver's
+#   ack {s}                                           acknowledges a reliable message
+# Reliable (carry a sequence number "s", resent until acknowledged, delivered once):
+#   propose {mode}                                    joiner asks the host to start a round
+#   start {mode, seed, at, area}                      host's clock time the countdown ends, host's play area
+#   shot {i, rt, at}                                  i-th hit, reaction time (s), ns after the start
+#   finish {avg, hits}
+#   bye
+PROTOCOL = 1
+COUNTDOWN_NS = 5_000_000_000  # Game's countdown
+MAX_DATAGRAM = 1200
+MAX_PER_POLL = 64  # Datagrams handled per frame; the rest wait for the next one
+
+class LossyLink:
+    """Outgoing datagrams with simulated loss, delay and jitter, for tests and network rehearsals"""
+
+    def __init__(self, loss=0.0, delay_ms=0.0, jitter_ms=0.0, rng=None):
+        self.loss = loss
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.rng = rng or random.Random()
+        self.queue = []  # (due ns, counter, data, address)
+        self.counter = 0
+        self.dropped = 0
+
+    def sendto(self, sock, data, address):
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        due = now_ns() + int((self.delay_ms + self.rng.uniform(0, self.jitter_ms)) * 1e6)
+        heapq.heappush(self.queue, (due, self.counter, data, address))
+        self.counter += 1
+
+    def flush(self, sock):
+        now = now_ns()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data, address = heapq.heappop(self.queue)
+            _send(sock, data, address)
+
+def _send(sock, data, address):
+    try:
+        sock.sendto(data, address)
+    except OSError:
+        pass  # Same as a lost datagram; reliable messages are resent
+
+class VersusPeer:
+    """One side of a head-to-head connection over UDP.
+
+    The host binds a port and takes the first player whose hello arrives;
+    the joiner is given the host's address. Nothing here ever waits: poll()
+    reads whatever datagrams have arrived, resends unacknowledged reliable
+    messages and sends the periodic ping, and is cheap enough to call once
+    per frame. Pings estimate the offset between the two monotonic clocks
+    from the round trip with the lowest delay, which is the least affected
+    by jitter.
+
+    Spawn positions depend on the play area, so the host only accepts a
+    joiner whose `area` (width, height) is the same as its own.
+    """
+
+    def __init__(self, name, port=0, host="0.0.0.0", remote=None, link=None, clock=now_ns,
+                 resend_ms=150, ping_ms=500, timeout_s=5.0, area=None):
+        self.name = name[:15]
+        self.area = list(area) if area is not None else None
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind((host, port))
+        self.port = self.sock.getsockname()[1]
+        if remote is not None:
+            remote = (socket.gethostbyname(remote[0]), remote[1])  # Replies come from the numeric address
+        self.remote = remote  # The other player's address; a host learns it from the first hello
+        self.peer_id = None  # Their connection id; a restarted joiner gets a new one
+        self.hosting = remote is None
+        self.link = link
+        self.clock = clock
+        self.resend_ns = int(resend_ms * 1e6)
+        self.ping_ns = int(ping_ms * 1e6)
+        self.timeout_ns = int(timeout_s * 1e9)
+        self.id = uuid.uuid4().hex
+
+        self.connected = False
+        self.lost = False  # Connected once, then the other side went quiet
+        self.error = None
+        self.opponent = None  # Their name
+        self.last_heard = None
+        self.next_hello = 0
+        self.next_ping = 0
+
+        self.next_seq = 0
+        self.unacked = {}  # seq -> [datagram, next resend ns]
+        self.received = set()  # Reliable sequence numbers already delivered
+        self.inbox = []  # Reliable messages waiting for poll() to hand out
+        self.samples = deque(maxlen=16)  # (round trip ns, offset ns)
+        self.offset_ns = 0  # Their clock minus ours
+        self.rtt_ns = None
+
+    def send(self, message):
+        """Queue a reliable message; it is resent until acknowledged"""
+        message = dict(message, s=self.next_seq)
+        self.next_seq += 1
+        data = json.dumps(message).encode()
+        self.unacked[message["s"]] = [data, self.clock() + self.resend_ns]
+        if self.remote is not None:
+            self._sendto(data)
+
+    def poll(self):
+        """Handle what has arrived and resend what is due; returns newly delivered reliable messages"""
+        now = self.clock()
+        for _ in range(MAX_PER_POLL):
+            try:
+                data, address = self.sock.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                continue  # An ICMP error from an earlier send, reported on some platforms
+            try:
+                message = json.loads(data)
+                self._receive(message, address, now)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue  # Not ours, or corrupt
+
+        if self.remote is not None:
+            if not self.connected and not self.hosting and not self.lost and now >= self.next_hello:
+                self._send_raw({"t": "hello", "v": PROTOCOL, "name": self.name, "id": self.id, "area": self.area})
+                self.next_hello = now + self.resend_ns
+            if self.connected:
+                if now >= self.next_ping:
+                    self._send_raw({"t": "ping", "c": now})
+                    self.next_ping = now + self.ping_ns
+                for entry in self.unacked.values():
+                    if now >= entry[1]:
+                        self._sendto(entry[0])
+                        entry[1] = now + self.resend_ns
+                if now - self.last_heard > self.timeout_ns:
+                    self.connected = False
+                    self.lost = True
+        if self.link is not None:
+            self.link.flush(self.sock)
+
+        messages = self.inbox
+        self.inbox = []
+        return messages
+
+    def to_local(self, remote_ns):
+        return remote_ns - self.offset_ns
+
+    def close(self):
+        if self.connected:
+            self._send_raw({"t": "bye"})
+            if self.link is not None:
+                self.link.flush(self.sock)
+        self.sock.close()
+
+    def _receive(self, message, address, now):
+        kind = message["t"]
+        if kind == "hello":
+            if message.get("v") != PROTOCOL:
+                return
+            if not self.hosting:
+                return
+            if message.get("area") != self.area:
+                why = f"play areas differ: {_area_text(message.get('area'))} here, {_area_text(self.area)} on the host"
+                _send(self.sock, json.dumps({"t": "refuse", "why": why}).encode(), address)
+                return
+            if self.connected and (address != self.remote or message["id"] != self.peer_id):
+                _send(self.sock, json.dumps({"t": "busy"}).encode(), address)
+                return
+            if not self.connected:
+                if message["id"] != self.peer_id:
+                    self._new_session()
+                self.remote = address
+                self.peer_id = message["id"]
+                self.opponent = str(message["name"])[:15]
+                self._connected(now)
+            self._send_raw({"t": "welcome", "name": self.name})  # Every time; a welcome can be lost too
+            return
+        if address != self.remote:
+            return
+        self.last_heard = now
+        if kind == "welcome":
+            if not self.connected:
+                self.opponent = str(message["name"])[:15]
+                self._connected(now)
+        elif kind == "busy":
+            self.error = "that kiosk is already in a match"
+        elif kind == "refuse":
+            self.error = str(message["why"])
+        elif kind == "ping":
+            self._send_raw({"t": "pong", "c": message["c"], "r": self.clock()})
+        elif kind == "pong":
+            self._clock_sample(message["c"], message["r"], now)
+        elif kind == "ack":
+            self.unacked.pop(message["s"], None)
+        elif kind == "bye":
+            self.connected = False
+            self.lost = True
+        elif "s" in message:
+            self._send_raw({"t": "ack", "s": message["s"]})
+            if message["s"] not in self.received:
+                self.received.add(message["s"])
+                self.inbox.append(message)
+
+    def _new_session(self):
+        """A different joiner: its sequence numbers and clock start over"""
+        self.unacked.clear()
+        self.received.clear()
+        self.inbox = []
+        self.samples.clear()
+        self.offset_ns = 0
+        self.rtt_ns = None
+
+    def _connected(self, now):
+        self.connected = True
+        self.lost = False
+        self.last_heard = now
+        self.next_ping = now
+        for entry in self.unacked.values():
+            entry[1] = now  # Anything queued before the handshake goes out now
+
+    def _clock_sample(self, sent_ns, remote_ns, now):
+        rtt = now - sent_ns
+        if rtt < 0:
+            return
+        # Their clock read halfway through the round trip, assuming symmetric delays
+        self.samples.append((rtt, remote_ns - (sent_ns + now) // 2))
+        self.rtt_ns, self.offset_ns = min(self.samples)
+
+    def _send_raw(self, message):
+        self._sendto(json.dumps(message).encode())
+
+    def _sendto(self, data):
+        if self.link is not None:
+            self.link.sendto(self.sock, data, self.remote)
+        else:
+            _send(self.sock, data, self.remote)
+
+class Progress:
+    def __init__(self):
+        self.hits = 0
+        self.reaction_times = []
+        self.average = None  # Set when the round is finished
+        self.finished_ns = None  # Since the start
+
+class VersusMatch:
+    """Races the local Game against the other kiosk's on the same seeded round.
+
+    The host picks the seed and the moment the countdown ends, in its own
+    clock; the joiner converts that moment to its clock with the estimated
+    offset, so both rounds start together. Each side measures its own
+    reaction times with its own clock and only reports the results, so
+    network delay and jitter can't change anyone's score.
+
+    Nothing starts before the first pong has measured the clock offset:
+    until then a local pick is ignored, and a proposal or start from the
+    other kiosk waits in `proposed` / `starting`. They also wait while
+    this kiosk is still on the previous round's screens, so its score is
+    saved first; a start whose countdown has ended by then is dropped.
+    """
+
+    def __init__(self, peer):
+        self.peer = peer
+        self.proposed = None  # Mode the joiner asked for, not started yet
+        self.starting = None  # Start message from the host, not begun yet
+        self.missed = False  # The host started a round while this kiosk was busy
+        self.mode = None
+        self.start_ns = None  # Local clock time the round starts
+        self.mine = Progress()
+        self.theirs = Progress()
+
+    def propose(self, game, mode):
+        """A mode was picked on this kiosk"""
+        if not self.ready():
+            return
+        if self.peer.hosting:
+            self._start(game, mode)
+        else:
+            self.peer.send({"t": "propose", "mode": mode})
+
+    def update(self, game):
+        """Called from Game.update every frame"""
+        for message in self.peer.poll():
+            kind = message["t"]
+            if kind == "propose" and self.peer.hosting:
+                self.proposed = message["mode"]
+            elif kind == "start" and not self.peer.hosting:
+                self.starting = message
+            elif kind == "shot":
+                self.theirs.hits = max(self.theirs.hits, message["i"])
+                self.theirs.reaction_times.append(message["rt"])
+            elif kind == "finish":
+                self.theirs.average = message["avg"]
+                self.theirs.hits = message["hits"]
+        if not self.ready():
+            return
+        if game.state != "mode_select":
+            return  # Still in a round or saving its score
+        if self.proposed is not None:
+            self._start(game, self.proposed)
+        if self.starting is not None:
+            message, self.starting = self.starting, None
+            start_ns = self.peer.to_local(message["at"])
+            if message.get("area") != self.peer.area:
+                self.peer.error = f"play areas differ: {_area_text(self.peer.area)} here, {_area_text(message.get('area'))} on the host"
+            elif start_ns <= self.peer.clock():
+                self.missed = True
+            else:
+                self._begin(game, message["mode"], message["seed"], start_ns)
+
+    def ready(self):
+        """Connected, and the clock offset has been measured at least once"""
+        return self.peer.connected and self.peer.rtt_ns is not None
+
+    def shot(self, index, reaction_time, click_ns):
+        self.mine.hits = index
+        self.mine.reaction_times.append(reaction_time)
+        self.peer.send({"t": "shot", "i": index, "rt": reaction_time, "at": click_ns - self.start_ns})
+
+    def finished(self, average, hits, timestamp_ns=None):
+        self.mine.average = average
+        self.mine.finished_ns = (timestamp_ns if timestamp_ns is not None else self.peer.clock()) - self.start_ns
+        self.peer.send({"t": "finish", "avg": average, "hits": hits})
+
+    def outcome(self):
+        """"win", "lose" or "draw" once both rounds are finished, otherwise None"""
+        if self.mine.average is None or self.theirs.average is None:
+            return None
+        if self.mine.average == self.theirs.average:
+            return "draw"
+        return "win" if self.mine.average < self.theirs.average else "lose"
+
+    def status_lines(self):
+        peer = self.peer
+        if peer.error:
+            return [peer.error]
+        if not peer.connected:
+            if peer.lost:
+                return ["Opponent disconnected"]
+            return [f"Waiting for an opponent on port {peer.port}" if peer.hosting else "Connecting..."]
+        lines = [f"VS {peer.opponent}"]
+        if peer.rtt_ns is None:
+            lines.append("Syncing clocks...")
+            return lines
+        if self.missed:
+            lines.append("Opponent started without you")
+        if self.mode is None:
+            lines.append("Pick a mode to race" if peer.hosting else "Pick a mode or wait for the host")
+            return lines
+        theirs = self.theirs
+        lines.append(f"{theirs.hits} hits" + (f"  {theirs.average:.3f}s" if theirs.average is not None else ""))
+        outcome = self.outcome()
+        if outcome is not None:
+            lines.append({"win": "You win!", "lose": "You lose", "draw": "Draw"}[outcome])
+        if peer.rtt_ns is not None:
+            lines.append(f"ping {peer.rtt_ns / 1e6:.0f} ms")
+        return lines
+
+    def _start(self, game, mode):
+        self.proposed = None  # Whichever kiosk picked, this is the next race
+        seed = new_seed()
+        start = self.peer.clock() + COUNTDOWN_NS
+        self.peer.send({"t": "start", "mode": mode, "seed": seed, "at": start, "area": self.peer.area})
+        self._begin(game, mode, seed, start)
+
+    def _begin(self, game, mode, seed, start_ns):
+        self.missed = False
+        self.mode = mode
+        self.start_ns = start_ns
+        self.mine = Progress()
+        self.theirs = Progress()
+        game.start_game(mode, seed)
+        # Game counts its countdown down from countdown_start on the wall clock
+        game.countdown_start = time.time() + (start_ns - self.peer.clock()) / 1e9 - COUNTDOWN_NS / 1e9
+
+def _area_text(area):
+    return f"{area[0]}x{area[1]}" if area else "unknown"
+
+def parse_address(text, default_host="127.0.0.1"):
+    host, _, port = text.rpartition(":")
+    return host or default_host, int(port)
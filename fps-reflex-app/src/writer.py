@@ -0,0 +1,49 @@
+import queue
+import threading
+import traceback
+import metrics
+
+WRITE_ERRORS = metrics.REGISTRY.counter("fps_background_write_errors_total", "Background writes that raised", ("writer",))
+
+class BackgroundWriter:
+    """Runs disk writes on a daemon thread so the game loop never waits on I/O"""
+
+    def __init__(self, name="writer"):
+        self.queue = queue.Queue()
+        self.writes = 0  # Completed jobs
+        self.errors = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args):
+        if self.closed:
+            raise RuntimeError("writer is closed")
+        self.queue.put((func, args))
+
+    def flush(self):
+        """Block until every job submitted so far has run"""
+        self.queue.join()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                func, args = job
+                func(*args)
+                self.writes += 1
+            except Exception:
+                self.errors += 1
+                WRITE_ERRORS.labels(self.thread.name).inc()
+                traceback.print_exc()
+            finally:
+                self.queue.task_done()
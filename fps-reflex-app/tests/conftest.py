@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules in src import each other by bare name (as when run via `python src/main.py`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,83 @@
+def test_offsets_are_binned_in_target_radii():
+    from src.accuracy import AccuracyMap
+
+    aim = AccuracyMap(bins=33, extent=3.0)
+    middle = 16
+    aim.record(0, 0, 20, True)
+    aim.record(40, -40, 20, False)  # Two radii right, two up
+    aim.record(10_000, 0, 20, False)  # Far off; clamped to the edge
+    assert aim.counts[middle, middle] == 1
+    assert aim.counts[middle - 11, middle + 11] == 1
+    assert aim.counts[middle, 32] == 1
+    assert aim.counts.sum() == 3
+    assert aim.accuracy == 1 / 3
+    assert aim.bias()[1] == -2 / 3
+
+def test_misses_are_attributed_to_the_nearest_target():
+    from src.game import Game
+    from src.replay import NoScores, ReplayWindow
+
+    game = Game(NoScores())
+    game.window = ReplayWindow(800, 600)
+    game.start_game("grid", seed=3)
+    game.begin_play(0)
+    target = game.field.targets[0]
+    game.handle_click((target.x + target.size * 0.5, target.y), 1_000_000)
+    nearest = game.aimed_at((target.x, target.y))
+    game.handle_click((nearest.x + nearest.size * 1.5, nearest.y), 2_000_000)
+    assert (game.aim.hits, game.aim.misses) == (1, 1)
+    assert game.aim.bias()[0] == 1.0  # Half a radius right, then one and a half
+
+def test_runs_rank_by_accuracy_weighted_time(tmp_path):
+    from src.accuracy import AccuracyMap
+    from src.highscores import Highscores
+
+    def aim(hits, misses):
+        result = AccuracyMap()
+        for _ in range(hits):
+            result.record(0, 0, 20, True)
+        for _ in range(misses):
+            result.record(30, 0, 20, False)
+        return result
+
+    highscores = Highscores(str(tmp_path / "highscores.json"))
+    highscores.add_score("SLOPPY", 0.20, "quick", aim=aim(10, 10))  # 0.40 s weighted
+    highscores.add_score("CAREFUL", 0.25, "quick", aim=aim(10, 0))
+    highscores.flush()
+    assert [s['name'] for s in highscores.get_top_scores("quick")] == ["SLOPPY", "CAREFUL"]
+    assert [s['name'] for s in highscores.get_top_scores("quick", rank_by="weighted")] == ["CAREFUL", "SLOPPY"]
+    assert highscores.get_rank("quick", 0.3, 1.0, rank_by="weighted") == 2
+
+    highscores.add_score("SLOPPY", 0.22, "quick", aim=aim(10, 5))
+    highscores.flush()
+    player = highscores.get_player_aim("SLOPPY", "quick")
+    assert (player.hits, player.misses) == (20, 15)
+    assert player.counts.sum() == 35
+    highscores.close()
+
+def test_heatmap_is_redrawn_only_when_the_map_changes():
+    import pygame
+    from src.accuracy import AccuracyMap
+    from src.ui.heatmap import HeatmapCache
+
+    pygame.display.init()
+    aim = AccuracyMap()
+    cache = HeatmapCache()
+    aim.record(3, 4, 20, True)
+    first = cache.get(aim, 120)
+    assert cache.get(aim, 120) is first
+    aim.record(-30, 0, 20, False)
+    assert cache.get(aim, 120) is not first
+    assert cache.renders == 2
+    assert first.get_size() == (120, 120)
+
+def test_weighted_time_matches_the_indexed_expression(tmp_path):
+    from src.history import ScoreHistory, weighted_time
+
+    history = ScoreHistory(str(tmp_path / "highscores.db"))
+    runs = [(0.25, 0.8), (0.3, None), (0.2, 1.0), (0.31, 0.55)]
+    history.add_runs([("quick", f"P{i}", t, 1_700_000_000, None, accuracy) for i, (t, accuracy) in enumerate(runs)])
+    stored = history.conn.execute(f"SELECT {ScoreHistory.WEIGHTED} FROM runs ORDER BY id").fetchall()
+    assert [value for (value,) in stored] == [weighted_time(t, accuracy) for t, accuracy in runs]
+    assert weighted_time(0.25, 0.8) == 0.3125
+    history.close()
@@ -0,0 +1,59 @@
+def _record_session(path, mode, reactions_ms, saved_at):
+    from src import telemetry
+
+    recorder = telemetry.TelemetryRecorder(capacity=64)
+    t = 0
+    for i, reaction in enumerate(reactions_ms):
+        x, y = 100.0 + i * 200, 100.0
+        recorder.record(telemetry.SPAWN, t, x, y, 20.0, i)
+        recorder.record(telemetry.PRESENT, t + 5_000_000, x, y, 20.0, i)
+        t += 5_000_000 + int(reaction * 1e6)
+        recorder.record(telemetry.HIT, t, x, y, target=i)
+    telemetry.write_session(path, recorder.snapshot(), {"mode": mode, "saved_at": saved_at})
+
+def test_hits_pair_with_the_target_that_was_hit():
+    from src import telemetry
+    from src.analytics import session_shots
+
+    # Two targets on screen; the older one is hit after the newer one spawned
+    recorder = telemetry.TelemetryRecorder(capacity=16)
+    recorder.record(telemetry.SPAWN, 0, 100.0, 100.0, 20.0, 0)
+    recorder.record(telemetry.PRESENT, 1_000_000, 100.0, 100.0, 20.0, 0)
+    recorder.record(telemetry.SPAWN, 50_000_000, 500.0, 100.0, 30.0, 1)
+    recorder.record(telemetry.PRESENT, 51_000_000, 500.0, 100.0, 30.0, 1)
+    recorder.record(telemetry.HIT, 201_000_000, 100.0, 100.0, target=0)
+    recorder.record(telemetry.HIT, 251_000_000, 500.0, 100.0, target=1)
+    shots = session_shots(recorder.snapshot())
+    assert list(shots["reaction_ns"]) == [200_000_000, 200_000_000]
+    assert list(shots["width"]) == [40.0, 60.0]
+    assert shots["distance"][1] == 400.0
+
+def test_shot_cache_processes_only_new_sessions(tmp_path):
+    from src.analytics import ShotCache, report
+
+    _record_session(str(tmp_path / "1-quick.fpst"), "quick", [200, 300, 400], 0)
+    cache_path = str(tmp_path / "cache.npz")
+    assert ShotCache(cache_path).update(str(tmp_path)) == 1
+
+    _record_session(str(tmp_path / "2-normal.fpst"), "normal", [250, 250], 86400)
+    cache = ShotCache(cache_path)
+    assert cache.update(str(tmp_path)) == 1
+    assert cache.update(str(tmp_path)) == 0
+
+    result = report(cache)
+    assert result["overall"]["shots"] == 5
+    assert result["modes"]["quick"]["summary"]["p50"] == 300
+    assert result["modes"]["normal"]["summary"]["stddev"] == 0
+    assert abs(result["trend"]["ms_per_day"] + 50) < 1e-6
+
+def test_fitts_fit_recovers_linear_model():
+    import numpy as np
+    from src.analytics import fitts_fit
+
+    width = np.full(4, 40.0)
+    distance = np.array([40.0, 120.0, 280.0, 600.0])  # ID = 1, 2, 3, 4 bits
+    movement_ns = (100 + 50 * np.log2(distance / width + 1)) * 1e6
+    fit = fitts_fit(distance, width, movement_ns)
+    assert abs(fit["intercept_ms"] - 100) < 1e-6
+    assert abs(fit["slope_ms_per_bit"] - 50) < 1e-6
+    assert abs(fit["r_squared"] - 1) < 1e-9
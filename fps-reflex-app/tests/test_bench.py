@@ -0,0 +1,18 @@
+def test_benchmarks_run_headless():
+    from src.bench import run_benchmarks
+
+    results = run_benchmarks(scale=0.01, repeats=1, sizes=(10,), only=["target", "generate_target", "highscores"])
+    assert "target.is_clicked[hit]" in results
+    assert "game.generate_target[tracking]" in results
+    assert "highscores.load_scores[10]" in results
+    assert "highscores.rank_of[10:worst]" in results
+    assert all(result["ns_per_op"] > 0 for result in results.values())
+
+def test_regressions_beyond_the_threshold_are_reported():
+    from src.bench import compare
+
+    baseline = {"results": {"fast": {"ns_per_op": 100.0}, "slow": {"ns_per_op": 100.0}}}
+    results = {"fast": {"ns_per_op": 110.0}, "slow": {"ns_per_op": 140.0}, "new": {"ns_per_op": 5.0}}
+    assert compare(results, baseline, threshold=25) == ["slow"]
+    assert results["slow"]["change_percent"] == 40.0
+    assert "change_percent" not in results["new"]  # No baseline yet
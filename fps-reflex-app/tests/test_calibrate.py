@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+@pytest.mark.parametrize("mode", ["normal", "burst", "grid"])
+def test_vectorized_sampling_matches_spawn_schedule(mode):
+    from src.calibrate import round_difficulty, sample_rounds
+    from src.spawns import SpawnSchedule
+
+    schedules = [SpawnSchedule(seed, mode, 1280, 720) for seed in range(1000)]
+    expected = round_difficulty(*(np.array([list(getattr(s, name)) for s in schedules]) for name in ("x", "y", "size")))
+    sampled = round_difficulty(*sample_rounds(mode, 1280, 720, 20000, np.random.default_rng(1)))
+    assert sampled.mean() == pytest.approx(expected.mean(), rel=0.02)
+    assert sampled.std() == pytest.approx(expected.std(), rel=0.1)
+
+def test_results_do_not_depend_on_worker_count(monkeypatch):
+    from src import calibrate
+
+    monkeypatch.setattr(calibrate, "CHUNK_ROUNDS", 1000)
+    one = calibrate.calibrate(["quick", "burst"], [(800, 600)], 3000, workers=1)
+    two = calibrate.calibrate(["quick", "burst"], [(800, 600)], 3000, workers=2)
+    assert one == two
+    boards = one["resolutions"]["800x600"]
+    assert boards["quick"]["rounds"] == 3000
+    assert boards["quick"]["p5"] <= boards["quick"]["p50"] <= boards["quick"]["p95"]
+
+def test_factors_put_modes_on_the_reference_scale(tmp_path):
+    import json
+    from src.calibrate import DifficultyTable, calibrate
+
+    result = calibrate(["normal", "burst"], [(1280, 720), (1920, 1080)], 2000, workers=1)
+    assert result["resolutions"]["1280x720"]["normal"]["factor"] == 1.0
+    # Burst targets are close together, so it is easier and its times are scaled up
+    assert result["resolutions"]["1280x720"]["burst"]["factor"] > 1.0
+
+    path = tmp_path / "difficulty.json"
+    path.write_text(json.dumps(result))
+    table = DifficultyTable(str(path))
+    assert table.factor("burst", 1920, 1200) == result["resolutions"]["1920x1080"]["burst"]["factor"]
+    assert table.normalize(0.5, "normal", 1366, 768) == 0.5
@@ -0,0 +1,27 @@
+from src.ui.dirty_rects import DirtyRectTracker
+
+def test_state_change_forces_full_redraw():
+    tracker = DirtyRectTracker()
+    assert tracker.begin_frame("mode_select") == True
+    assert tracker.begin_frame("playing") == True
+    tracker.full_redraw = False
+    assert tracker.begin_frame("playing") == False
+    assert tracker.begin_frame("ended") == True
+
+def test_only_changed_items_are_dirty():
+    tracker = DirtyRectTracker()
+    tracker.previous = [((0, 0, 40, 40), (20, 20, 20)), ((10, 10, 100, 20), "Targets: 1/20")]
+    tracker.begin_frame("playing")
+    tracker.add((50, 50, 40, 40), (70, 70, 20))
+    tracker.add((10, 10, 100, 20), "Targets: 2/20")
+    rects = tracker.changed_rects()
+    assert (50, 50, 40, 40) in rects  # New target
+    assert (0, 0, 40, 40) in rects  # Old target must be erased on screen
+    assert rects.count((10, 10, 100, 20)) == 2  # Same rect, new counter text
+
+def test_unchanged_frame_has_no_dirty_rects():
+    tracker = DirtyRectTracker()
+    tracker.previous = [((0, 0, 40, 40), (20, 20, 20))]
+    tracker.begin_frame("playing")
+    tracker.add((0, 0, 40, 40), (20, 20, 20))
+    assert tracker.changed_rects() == []
@@ -0,0 +1,46 @@
+import json
+
+def test_font_resolution_is_cached_on_disk(tmp_path, monkeypatch):
+    import pygame
+    from src.ui import fonts
+
+    pygame.font.init()
+    cache_path = str(tmp_path / "font_cache.json")
+    names = ['Consolas', 'Courier New', 'Lucida Console', 'Monaco']
+
+    first = fonts.FontResolver(names, cache_path=cache_path)
+    resolved = first.resolve()
+    assert not first.cache_hit
+    assert json.loads(open(cache_path).read())
+
+    # A second start with the same font state never scans system fonts
+    monkeypatch.setattr(pygame.font, "match_font", lambda *args, **kwargs: 1 / 0)
+    second = fonts.FontResolver(names, cache_path=cache_path)
+    assert second.resolve() == resolved
+    assert second.cache_hit
+
+def test_font_cache_is_invalidated_when_system_fonts_change(tmp_path, monkeypatch):
+    import pygame
+    from src.ui import fonts
+
+    pygame.font.init()
+    cache_path = str(tmp_path / "font_cache.json")
+    fonts.FontResolver(['Monaco'], cache_path=cache_path).resolve()
+
+    monkeypatch.setattr(fonts, "font_state_fingerprint", lambda: "fonts changed")
+    resolver = fonts.FontResolver(['Monaco'], cache_path=cache_path)
+    resolver.resolve()
+    assert not resolver.cache_hit
+    assert list(json.loads(open(cache_path).read()).values())[0]["fingerprint"] == "fonts changed"
+
+def test_lazy_fonts_load_each_size_once(tmp_path):
+    import pygame
+    from src.ui.fonts import FontResolver, LazyFonts
+
+    pygame.font.init()
+    lazy = LazyFonts(FontResolver(['Monaco']))
+    assert not lazy.fonts
+    font = lazy.get(36)
+    assert lazy.get(36) is font
+    assert list(lazy.fonts) == [36]
+    assert font.get_bold() == lazy.resolver.synthetic_bold
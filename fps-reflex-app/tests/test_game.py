@@ -1,28 +1,49 @@
+import os
+import shutil
+import tempfile
 import unittest
 from src.game import Game
+from src.highscores import Highscores
+from src.replay import ReplayWindow
 
 class TestGame(unittest.TestCase):
 
     def setUp(self):
-        self.game = Game()
+        self.data_dir = tempfile.mkdtemp()
+        self.highscores = Highscores(os.path.join(self.data_dir, "highscores.json"))
+        self.game = Game(self.highscores)
+        self.game.window = ReplayWindow(800, 600)
+
+    def tearDown(self):
+        self.highscores.close()
+        shutil.rmtree(self.data_dir)
 
     def test_initial_score(self):
         self.assertEqual(self.game.score, 0)
 
     def test_target_generation(self):
-        self.game.generate_target()
+        self.game.start_game("quick", seed=1)
+        self.game.begin_play(0)
         self.assertIsNotNone(self.game.current_target)
+        self.assertEqual(self.game.spawned, 1)
 
     def test_reaction_time_calculation(self):
-        self.game.start_time = 0
-        self.game.end_time = 1
-        self.assertEqual(self.game.calculate_reaction_time(), 1)
+        # Measured from when the target was first on screen, not from the spawn
+        self.game.start_game("quick", seed=1)
+        self.game.begin_play(0)
+        self.game.frame_presented(50_000_000)
+        target = self.game.current_target
+        self.game.handle_click((target.x, target.y), 300_000_000)
+        self.assertAlmostEqual(self.game.reaction_times[-1], 0.25)
 
     def test_score_increment_on_target_click(self):
-        self.game.generate_target()
+        self.game.start_game("quick", seed=1)
+        self.game.begin_play(0)
+        self.game.frame_presented(0)
         initial_score = self.game.score
-        self.game.click_target(self.game.current_target.position)
+        target = self.game.current_target
+        self.game.handle_click((target.x, target.y), 200_000_000)
         self.assertEqual(self.game.score, initial_score + 1)
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+
+def test_scores_survive_reload_from_log(tmp_path):
+    from src.highscores import Highscores
+
+    path = str(tmp_path / "highscores.json")
+    scores = Highscores(path)
+    scores.add_score("ANA", 0.4, "quick")
+    scores.add_score("BO", 0.3, "quick")
+    scores.close()
+
+    reloaded = Highscores(path)
+    assert [s['name'] for s in reloaded.get_top_scores("quick")] == ["BO", "ANA"]
+    assert reloaded.last_player_name == "BO"
+    reloaded.close()
+
+def test_compaction_writes_snapshot_and_empties_log(tmp_path):
+    from src.highscores import Highscores
+    from src.scorestore import ScoreStore
+
+    path = str(tmp_path / "highscores.json")
+    scores = Highscores(path, ScoreStore(path, compact_every=3))
+    for i in range(3):
+        scores.add_score(f"P{i}", 0.5 - i * 0.1, "normal")
+    scores.flush()
+    with open(path) as f:
+        snapshot = json.load(f)
+    assert len(snapshot['scores']['normal']) == 3
+    assert snapshot['seq'] == 3
+    with open(path + ".log") as f:
+        assert f.read() == ""
+    scores.close()
+
+def test_torn_log_line_and_stale_records_are_skipped(tmp_path):
+    from src.highscores import Highscores
+
+    path = tmp_path / "highscores.json"
+    entry = {'name': 'OLD', 'time': 0.2, 'date': '01/01/26'}
+    path.write_text(json.dumps({'scores': {'quick': [entry]}, 'last_player': 'OLD', 'seq': 1}))
+    # Record 1 is already in the snapshot (crash before truncation); the last line was cut off
+    (tmp_path / "highscores.json.log").write_text(
+        json.dumps({'op': 'add', 'mode': 'quick', 'entry': entry, 'seq': 1}) + "\n"
+        + json.dumps({'op': 'add', 'mode': 'quick', 'entry': dict(entry, name='NEW', time=0.3), 'seq': 2}) + "\n"
+        + '{"op": "add", "mo'
+    )
+    scores = Highscores(str(path))
+    assert [s['name'] for s in scores.get_top_scores("quick")] == ["OLD", "NEW"]
+    scores.close()
+
+def test_log_lines_that_are_not_records_are_skipped(tmp_path):
+    from src.highscores import Highscores
+    from src.scorestore import LOAD_ERRORS
+
+    path = tmp_path / "highscores.json"
+    entry = {'name': 'NEW', 'time': 0.3, 'date': '01/01/26'}
+    (tmp_path / "highscores.json.log").write_text(
+        "[]\n1\n\"x\"\nnull\n" + json.dumps({'op': 'add', 'seq': "2"}) + "\n"
+        + json.dumps({'op': 'add', 'mode': 'quick', 'entry': entry, 'seq': 3}) + "\n"
+    )
+    errors = LOAD_ERRORS.labels("log").value
+    scores = Highscores(str(path))
+    assert [s['name'] for s in scores.get_top_scores("quick")] == ["NEW"]
+    assert LOAD_ERRORS.labels("log").value == errors + 5
+    scores.close()
+
+def test_corrupt_snapshot_is_moved_aside(tmp_path):
+    from src.highscores import Highscores
+
+    path = tmp_path / "highscores.json"
+    path.write_text("{not json")
+    scores = Highscores(str(path))
+    assert scores.get_top_scores("quick") == []
+    assert (tmp_path / "highscores.json.corrupt").exists()
+    scores.close()
+
+def test_history_keeps_every_run_beyond_top_ten(tmp_path):
+    from src.highscores import Highscores
+
+    scores = Highscores(str(tmp_path / "highscores.json"))
+    for i in range(15):
+        scores.add_score("ANA" if i % 2 else "BO", 0.2 + i * 0.01, "quick")
+    scores.flush()
+    assert len(scores.get_top_scores("quick")) == 10
+    assert len(scores.get_top_scores("quick", 100)) == 15
+    assert scores.history.count("quick") == 15
+    assert scores.get_rank("quick", 0.205) == 2
+    assert abs(scores.get_personal_best("ANA", "quick") - 0.21) < 1e-9
+    assert abs(scores.get_rolling_average("BO", "quick", 2) - 0.33) < 1e-9
+    scores.close()
+
+def test_rank_matches_counting_every_faster_run(tmp_path):
+    import random
+    import sqlite3
+    from src.history import ScoreHistory, weighted_time
+
+    path = str(tmp_path / "highscores.db")
+    history = ScoreHistory(path)
+    rng = random.Random(5)
+    rows = []
+    for i in range(3000):
+        t = rng.choice([rng.uniform(0.15, 0.6), round(rng.uniform(0.15, 0.6), 3), 20.0 + i])  # Ties and the overflow bucket
+        rows.append((rng.choice(["quick", "grid"]), "P", t, 1_700_000_000 + i, None, rng.choice([None, rng.uniform(0.5, 1.0)])))
+    for start in range(0, len(rows), 500):
+        history.add_runs(rows[start:start + 500])
+
+    def check(history, modes=("quick", "grid")):
+        conn = sqlite3.connect(path)
+        for _ in range(300):
+            mode = rng.choice(modes)
+            t = rng.choice([rng.uniform(0.1, 0.7), rng.choice(rows)[2], 25.0 + rng.random() * 3000])
+            accuracy = rng.choice([None, rng.uniform(0.5, 1.0)])
+            for rank_by, order in ScoreHistory.ORDER.items():
+                score = weighted_time(t, accuracy) if rank_by == "weighted" else t
+                (faster,) = conn.execute(f"SELECT COUNT(*) FROM runs WHERE mode = ? AND {order} < ?", (mode, score)).fetchone()
+                assert history.rank_of(mode, t, accuracy, rank_by) == faster + 1
+        conn.close()
+
+    check(history)
+    history.clear("grid")
+    assert history.rank_of("grid", 10.0) == 1
+    check(history, ("quick",))
+    history.close()
+
+    # A database from before rank_tree gets its tree built when opened
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DELETE FROM rank_tree")
+    conn.close()
+    history = ScoreHistory(path)
+    check(history)
+    history.close()
@@ -0,0 +1,186 @@
+import asyncio
+import socket
+import threading
+import time
+import pytest
+
+class RunningServer:
+    """A LeaderboardServer on its own event loop thread"""
+
+    def __init__(self, db_path, port=0):
+        from src.scoreserver import LeaderboardServer
+
+        self.loop = asyncio.new_event_loop()
+        self.server = LeaderboardServer(db_path)
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start("127.0.0.1", port), self.loop).result(10)
+        self.port = self.server.port
+
+    def submit(self, scores):
+        return asyncio.run_coroutine_threadsafe(self.server.submit(scores), self.loop).result(10)
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(10)
+
+@pytest.fixture
+def server(tmp_path):
+    running = RunningServer(str(tmp_path / "leaderboard.db"))
+    yield running
+    running.stop()
+
+def test_many_clients_submit_thousands_of_scores(server):
+    from src.scoreclient import LeaderboardClient
+
+    clients = [LeaderboardClient("127.0.0.1", server.port, kiosk=f"kiosk-{i}", flush_interval=0.01) for i in range(8)]
+    started = time.perf_counter()
+    for i in range(500):
+        for client in clients:
+            client.submit("quick", client.kiosk, 0.2 + i / 10000)
+    for client in clients:
+        assert client.flush(30)
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        client.close()
+
+    assert server.server.submissions == 4000
+    assert 4000 / elapsed > 1000
+    server.server.writer.flush()
+    assert server.server.history.count("quick") == 4000
+    assert server.server.top["quick"][0]["time"] == pytest.approx(0.2)
+
+def test_retried_batches_are_not_stored_twice(server):
+    score = {"id": "abc", "mode": "quick", "name": "A", "time": 0.3, "played_at": time.time()}
+    assert server.submit([score])["accepted"] == 1
+    assert server.submit([score, dict(score, id="def", mode="nope")]) == {
+        "ok": True, "accepted": 0, "duplicates": 1, "rejected": 1
+    }
+
+def test_seeds_must_be_integers_sqlite_can_store(server):
+    score = {"mode": "quick", "name": "A", "time": 0.3, "played_at": time.time()}
+    bad = [dict(score, seed=seed) for seed in ("7", 1.5, True, 2 ** 63, -2 ** 63 - 1, [1])]
+    good = [dict(score, seed=seed) for seed in (None, 0, 2 ** 63 - 1, -2 ** 63)]
+    assert server.submit(bad + good) == {"ok": True, "accepted": 4, "duplicates": 0, "rejected": 6}
+
+def test_batches_are_acked_only_once_stored(server):
+    import sqlite3
+
+    score = {"id": "abc", "mode": "quick", "name": "A", "time": 0.3, "played_at": time.time()}
+    add_runs = server.server.history.add_runs
+
+    def fail(rows):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    server.server.history.add_runs = fail
+    response = server.submit([score])
+    assert not response["ok"] and "disk I/O error" in response["error"]
+    assert server.server.top["quick"] == [] and server.server.submissions == 0
+
+    # Not remembered as seen, so the client's retry is stored
+    server.server.history.add_runs = add_runs
+    assert server.submit([score])["accepted"] == 1
+    assert server.server.history.count("quick") == 1
+    assert server.server.top["quick"][0]["name"] == "A"
+
+def test_a_retry_during_a_slow_insert_is_not_stored_twice(server):
+    score = {"id": "abc", "mode": "quick", "name": "A", "time": 0.3, "played_at": time.time()}
+    add_runs = server.server.history.add_runs
+
+    def slow(rows):
+        time.sleep(0.2)  # A slow disk: the client times out and resends the batch meanwhile
+        add_runs(rows)
+
+    server.server.history.add_runs = slow
+
+    async def submit_twice():
+        first = asyncio.ensure_future(server.server.submit([score]))
+        await asyncio.sleep(0.05)
+        return await asyncio.gather(first, server.server.submit([score]))
+
+    first, retry = asyncio.run_coroutine_threadsafe(submit_twice(), server.loop).result(10)
+    assert first["accepted"] == 1
+    assert retry == {"ok": True, "accepted": 0, "duplicates": 1, "rejected": 0}
+    assert server.server.history.count("quick") == 1
+    assert server.server.storing == {}
+
+def test_a_retry_during_a_failed_insert_is_not_acked(server):
+    import sqlite3
+
+    score = {"id": "abc", "mode": "quick", "name": "A", "time": 0.3, "played_at": time.time()}
+
+    def fail(rows):
+        time.sleep(0.2)
+        raise sqlite3.OperationalError("disk I/O error")
+
+    server.server.history.add_runs = fail
+
+    async def submit_twice():
+        first = asyncio.ensure_future(server.server.submit([score]))
+        await asyncio.sleep(0.05)
+        return await asyncio.gather(first, server.server.submit([score]))
+
+    first, retry = asyncio.run_coroutine_threadsafe(submit_twice(), server.loop).result(10)
+    assert not first["ok"] and not retry["ok"]  # The client keeps the score and sends it again later
+    assert "abc" not in server.server.seen_ids and server.server.storing == {}
+
+def test_scores_are_buffered_offline_and_delivered_later(tmp_path):
+    from src.scoreclient import LeaderboardClient
+
+    with socket.socket() as probe:  # A port nobody is listening on yet
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    spool = str(tmp_path / "spool.jsonl")
+    client = LeaderboardClient("127.0.0.1", port, spool_path=spool, flush_interval=0.01)
+    started = time.perf_counter()
+    client.submit("quick", "OFFLINE", 0.25)
+    assert time.perf_counter() - started < 0.05  # Never waits on the network
+    assert not client.flush(0.5)
+    client.close(timeout=0.1)
+
+    # A restarted client picks the spooled score up and sends it once the service is back
+    running = RunningServer(str(tmp_path / "leaderboard.db"), port)
+    try:
+        client = LeaderboardClient("127.0.0.1", port, spool_path=spool, flush_interval=0.01)
+        assert client.flush(10)
+        client.close()
+        assert running.server.top["quick"][0]["name"] == "OFFLINE"
+    finally:
+        running.stop()
+
+def test_highscores_show_the_shared_board(server, tmp_path):
+    import pygame
+    from src.highscores import Highscores
+    from src.ui.window import GameWindow
+    from src.scoreclient import LeaderboardClient
+
+    other = LeaderboardClient("127.0.0.1", server.port, flush_interval=0.01)
+    other.submit("quick", "ELSEWHERE", 0.15)
+    assert other.flush(10)
+    other.close()
+
+    pygame.display.init()
+    pygame.font.init()
+    remote = LeaderboardClient("127.0.0.1", server.port, flush_interval=0.01)
+    highscores = Highscores(str(tmp_path / "highscores.json"), remote=remote)
+    deadline = time.monotonic() + 10
+    while remote.top_scores("quick") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    version = highscores.version
+    highscores.poll_remote()
+    assert highscores.version == version + 1
+    assert highscores.get_top_scores("quick")[0]["name"] == "ELSEWHERE"
+
+    # Clearing only empties this kiosk's data; the shared board keeps showing, and the button says so
+    highscores.add_score("HERE", 0.3, "quick")
+    highscores.clear_scores()
+    highscores.flush()
+    assert highscores.history.count("quick") == 0
+    assert highscores.get_top_scores("quick")[0]["name"] == "ELSEWHERE"
+    window = GameWindow(800, 600)
+    assert window._clear_label(highscores) == "Clear Local Scores"
+    window.update_display("confirm_clear", [], highscores=highscores)
+    window.close()
+    highscores.close()
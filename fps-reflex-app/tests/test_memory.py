@@ -0,0 +1,52 @@
+import json
+import random
+
+def test_soak_samples_at_round_boundaries(tmp_path):
+    from src.memory import MemoryMonitor
+    from src.simulate import PerfectAim, run_simulation
+
+    log = tmp_path / "memory.jsonl"
+    memory = MemoryMonitor(interval=2, path=str(log)).start()
+    try:
+        report = run_simulation(PerfectAim(random.Random(1)), ["quick"], 6, str(tmp_path / "highscores.json"), memory=memory)
+    finally:
+        memory.stop()
+
+    samples = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [sample["round"] for sample in samples] == [2, 4, 6]
+    assert samples[-1]["objects"]["Surface"] > 0  # The window's cached scenes and text
+    assert samples[-1]["sizes"]["reaction_times"] == 10  # The round that just finished
+    growth = report["memory"]["growth"]
+    assert growth["rounds"] == 4
+    assert growth["objects"]["Target"] == 0  # Targets come from the pool
+
+def test_check_flags_a_growing_container():
+    from src.memory import MemoryMonitor
+
+    class FakeGame:
+        pass
+
+    game = FakeGame()
+    game.reaction_times = []
+    game.target_pool = FakeGame()
+    game.target_pool.free = []
+    game.telemetry = []
+    game.highscores = None
+    game.window = None
+
+    leak = []
+    memory = MemoryMonitor(interval=1).start()
+    try:
+        for _ in range(5):
+            leak.append(bytearray(100_000))
+            memory.round_started(game)
+    finally:
+        memory.stop()
+    assert memory.check(max_bytes_per_round=50_000)
+    assert not memory.check(max_bytes_per_round=200_000)
+    assert "test_memory.py:" in memory.growth_sites()[0]["site"]  # The bytearray above
+
+def test_check_needs_two_samples():
+    from src.memory import MemoryMonitor
+
+    assert MemoryMonitor().check(max_bytes_per_round=1) == ["not enough samples to measure growth"]
@@ -0,0 +1,93 @@
+import urllib.request
+
+def test_prometheus_text_format():
+    from src.metrics import Registry
+
+    registry = Registry()
+    rounds = registry.counter("rounds_total", "Rounds played", ("mode",))
+    queue = registry.gauge("queue", "Queued writes")
+    reaction = registry.histogram("reaction_seconds", "Reaction time", buckets=(0.2, 0.3, 1.0))
+    rounds.labels("quick").inc()
+    rounds.labels("quick").inc()
+    rounds.labels('a"b').inc()
+    queue.set_function(lambda: 3)
+    for seconds in (0.15, 0.25, 0.26, 5.0):
+        reaction.observe(seconds)
+
+    text = registry.render()
+    assert "# TYPE rounds_total counter\n" in text
+    assert 'rounds_total{mode="quick"} 2\n' in text
+    assert 'rounds_total{mode="a\\"b"} 1\n' in text
+    assert "queue 3\n" in text
+    assert 'reaction_seconds_bucket{le="0.2"} 1\n' in text
+    assert 'reaction_seconds_bucket{le="0.3"} 3\n' in text
+    assert 'reaction_seconds_bucket{le="1"} 3\n' in text
+    assert 'reaction_seconds_bucket{le="+Inf"} 4\n' in text
+    assert "reaction_seconds_count 4\n" in text
+    assert registry.counter("rounds_total", "Rounds played", ("mode",)) is rounds
+
+def test_updates_do_not_allocate():
+    import tracemalloc
+    from src.metrics import Registry
+
+    registry = Registry()
+    counter = registry.counter("c_total", "C", ("mode",)).labels("quick")
+    histogram = registry.histogram("h_seconds", "H")
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for i in range(10000):
+            counter.inc()
+            histogram.observe_ns(1000 + i)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename") if "metrics.py" in stat.traceback[0].filename or "profiler.py" in stat.traceback[0].filename)
+    assert growth < 1024
+
+def test_exporter_serves_and_writes(tmp_path):
+    from src.metrics import MetricsExporter, Registry
+
+    registry = Registry()
+    registry.counter("kiosk_up", "Up").inc()
+    path = tmp_path / "fps.prom"
+    exporter = MetricsExporter(registry, port=0, path=str(path), interval=0.05)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert "kiosk_up 1" in response.read().decode()
+    finally:
+        exporter.close()
+    assert "kiosk_up 1" in path.read_text()
+
+def test_game_and_highscores_are_instrumented(tmp_path):
+    from src import game as game_module
+    from src import scorestore
+    from src.highscores import Highscores
+    from src.replay import ReplayWindow
+
+    (tmp_path / "highscores.json").write_text("{not json")
+    errors = scorestore.LOAD_ERRORS.labels("snapshot").value
+    highscores = Highscores(str(tmp_path / "highscores.json"))
+    assert scorestore.LOAD_ERRORS.labels("snapshot").value == errors + 1
+
+    started = game_module.ROUNDS_STARTED.labels("quick").value
+    completed = game_module.ROUNDS_COMPLETED.labels("quick").value
+    hits = game_module.HITS.value
+    misses = game_module.MISSES.value
+    game = game_module.Game(highscores)
+    game.window = ReplayWindow(800, 600)
+    game.start_game("quick", seed=5)
+    game.begin_play(0)
+    game.handle_click((-100, -100), 1)
+    while game.state == "playing":
+        target = game.current_target
+        game.frame_presented(10)
+        game.handle_click((int(target.x), int(target.y)), 250_000_010)
+    highscores.close()
+
+    assert game_module.ROUNDS_STARTED.labels("quick").value == started + 1
+    assert game_module.ROUNDS_COMPLETED.labels("quick").value == completed + 1
+    assert game_module.HITS.value == hits + game.max_clicks
+    assert game_module.MISSES.value == misses + 1
+    assert 'fps_reaction_time_seconds_bucket{mode="quick",le="0.25"}' in game_module.metrics.REGISTRY.render()
@@ -0,0 +1,63 @@
+import pytest
+
+class SimulatedClock:
+    """Nanoseconds that pass only when slept through, plus 1 us per read so spin loops end"""
+
+    def __init__(self):
+        self.ns = 1_000_000_000
+
+    def now(self):
+        self.ns += 1_000
+        return self.ns
+
+    def sleep(self, seconds):
+        self.ns += int(seconds * 1e9)
+
+def _pacer(mode, **kwargs):
+    from src.pacing import FramePacer
+
+    clock = SimulatedClock()
+    return FramePacer(mode, now=clock.now, sleep=clock.sleep, **kwargs), clock
+
+def _frames(pacer, clock, count, render_ns=0):
+    for _ in range(count):
+        pacer.latch()
+        clock.sleep(render_ns / 1e9)
+        pacer.frame_done(clock.now())
+
+def test_refresh_mode_keeps_a_fixed_schedule():
+    pacer, clock = _pacer("refresh", fps=100)
+    _frames(pacer, clock, 30)
+    report = pacer.report()
+    assert report["frames"] == 29
+    assert report["achieved_fps"] == pytest.approx(100, rel=0.01)
+    assert report["frame_interval_ms"]["mean"] == pytest.approx(10, rel=0.01)
+
+def test_latency_is_half_a_poll_interval_plus_render_time():
+    pacer, clock = _pacer("refresh", fps=50)
+    _frames(pacer, clock, 20, render_ns=2_000_000)
+    report = pacer.report()
+    # 20 ms between polls: an event waits 10 ms on average, then 2 ms of render
+    assert report["input_to_present_ms"]["mean"] == pytest.approx(12, rel=0.01)
+    assert report["worst_input_to_present_ms"]["mean"] == pytest.approx(22, rel=0.01)
+
+def test_late_latch_polls_just_before_the_frame_is_due():
+    pacer, clock = _pacer("refresh", fps=50, late_latch=True, latch_margin_ns=500_000)
+    _frames(pacer, clock, 10, render_ns=2_000_000)
+    # The latch waits out the frame, so poll to present is only the render
+    assert pacer.present_ns - pacer.poll_ns == pytest.approx(2_000_000, rel=0.01)
+    assert pacer.report()["achieved_fps"] == pytest.approx(50, rel=0.01)
+
+def test_pause_drops_the_idle_gap():
+    pacer, clock = _pacer("uncapped")
+    _frames(pacer, clock, 5)
+    pacer.pause()
+    clock.sleep(0.05)
+    _frames(pacer, clock, 5)
+    assert pacer.report()["worst_input_to_present_ms"]["max"] < 1
+
+def test_unknown_mode_is_rejected():
+    from src.pacing import FramePacer
+
+    with pytest.raises(ValueError):
+        FramePacer("vsync")
@@ -0,0 +1,61 @@
+import random
+
+STEP = 1_000_000_000 // 240
+
+def _field(count=50, seed=1):
+    from src.physics import MoverField
+    from src.target import Target
+
+    rng = random.Random(seed)
+    field = MoverField(800, 600, capacity=8)  # Grows past the initial capacity
+    targets = [Target(rng.uniform(40, 760), rng.uniform(40, 560), 20) for _ in range(count)]
+    for target in targets:
+        field.insert(target, rng.uniform(-800, 800), rng.uniform(-800, 800), rng.uniform(-200, 200), 0, timestamp_ns=0)
+    return field, targets
+
+def test_movers_bounce_inside_the_screen():
+    field, targets = _field()
+    for frame in range(1, 600):
+        field.sync(frame * 6_944_444)  # 144 Hz
+        for target in targets:
+            assert 20 <= target.x <= 780
+            assert 20 <= target.y <= 580
+
+def test_state_does_not_depend_on_frame_rate():
+    slow, _ = _field()
+    fast, _ = _field()
+    for frame in range(1, 31):
+        slow.advance(frame * 33_333_333)
+    for frame in range(1, 145):
+        fast.advance(frame * 6_944_444)
+    slow.advance(1_000_000_000)
+    fast.advance(1_000_000_000)
+    assert slow.sim_ns == fast.sim_ns
+    assert (slow.pos == fast.pos).all()
+
+def test_hit_test_uses_the_interpolated_position_at_the_click():
+    from src.physics import MoverField
+    from src.target import Target
+
+    field = MoverField(10000, 600)
+    target = Target(100, 300, 0.5)
+    field.insert(target, 480, 0, timestamp_ns=0)  # 2 px per step
+    # Halfway through the second step it is drawn halfway between the first two steps' positions
+    assert field.hit_test(101, 300, timestamp_ns=STEP + STEP // 2) is target
+    assert field.hit_test(102, 300, timestamp_ns=STEP + STEP // 2) is None
+    assert field.hit_test(102, 300, timestamp_ns=2 * STEP) is target
+
+def test_topmost_mover_wins_and_removed_movers_are_ignored():
+    from src.physics import MoverField
+    from src.target import Target
+
+    field = MoverField(800, 600)
+    bottom = Target(100, 100, 30)
+    top = Target(110, 100, 30)
+    field.insert(bottom, timestamp_ns=0)
+    field.insert(top, timestamp_ns=0)
+    assert field.hit_test(105, 100, timestamp_ns=0) is top
+    assert field.hit_test(102, 100, nearest=True, timestamp_ns=0) is bottom
+    field.remove(top)
+    assert field.hit_test(105, 100, timestamp_ns=0) is bottom
+    assert field.targets == [bottom]
@@ -0,0 +1,33 @@
+def test_histogram_buckets_stay_within_relative_error():
+    from src.profiler import Histogram
+
+    hist = Histogram()
+    for value in (0, 7, 31, 32, 63, 64, 1000, 16_666_667, 10**12):
+        bucket = hist.bucket(value)
+        lower = hist.lower_bound(bucket)
+        assert lower <= value
+        assert value - lower <= max(1, lower // 32)
+
+def test_histogram_percentiles():
+    from src.profiler import Histogram
+
+    hist = Histogram()
+    for ms in range(1, 101):
+        hist.record(ms * 1_000_000)
+    assert abs(hist.percentile(0.50) - 50_000_000) / 50_000_000 < 0.04
+    assert abs(hist.percentile(0.99) - 99_000_000) / 99_000_000 < 0.04
+    assert hist.max == 100_000_000
+
+def test_frame_profiler_counts_budget_misses(tmp_path):
+    import json
+    from src.profiler import FrameProfiler
+
+    profiler = FrameProfiler(budget_ns=16_666_667)
+    profiler.end_frame(5_000_000, 16_700_000)
+    profiler.end_frame(20_000_000, 20_000_000)
+    path = tmp_path / "profile.json"
+    profiler.dump(str(path))
+    data = json.loads(path.read_text())
+    assert data["frames"] == 2
+    assert data["over_budget"] == 1
+    assert data["phases"]["frame"]["count"] == 2
@@ -0,0 +1,90 @@
+import pytest
+
+def test_profiles_load_on_demand_and_least_recently_used_are_evicted(tmp_path):
+    from src.profiles import ProfileStore
+
+    store = ProfileStore(str(tmp_path / "players"), capacity=2)
+    for name in ("ANA", "BO", "CY"):
+        store.record_run(name, "quick", 0.3)
+    assert list(store.profiles) == ["BO", "CY"]
+    assert store.evictions == 1
+
+    store.get("BO")  # Now the most recently used; CY goes next
+    store.record_run("ANA", "quick", 0.25)
+    assert list(store.profiles) == ["BO", "ANA"]
+    assert store.get("ANA").personal_best("quick") == 0.25
+    assert store.get("ANA").runs == 2  # Read back from its shard
+    assert store.get("NOBODY") is None
+
+def test_startup_loads_only_the_last_player(tmp_path):
+    from src.highscores import Highscores
+
+    highscores = Highscores(str(tmp_path / "highscores.json"))
+    for i in range(200):
+        highscores.add_score(f"P{i}", 0.2 + i / 1000, "quick")
+    highscores.profiles.set_setting("P7", "crosshair", "dot")
+    highscores.profiles.set_setting("P7", "sensitivity", 1.5)
+    highscores.close()
+    assert len(list((tmp_path / "players").glob("*/*.json"))) == 200
+
+    reopened = Highscores(str(tmp_path / "highscores.json"))
+    assert list(reopened.profiles.profiles) == ["P199"]
+    assert reopened.profiles.loads == 1
+    assert reopened.get_personal_best("P7", "quick") == pytest.approx(0.207)
+    assert reopened.get_profile("P7").settings == {"crosshair": "dot", "sensitivity": 1.5}
+    reopened.close()
+
+def test_players_from_before_profiles_are_seeded_from_history(tmp_path):
+    from src.highscores import Highscores
+
+    highscores = Highscores(str(tmp_path / "highscores.json"))
+    highscores.history.add_runs([("quick", "OLD", t, 1_700_000_000 + i, None) for i, t in enumerate((0.4, 0.3, 0.35))])
+    profile = highscores.get_profile("OLD")
+    assert profile.personal_best("quick") == 0.3
+    assert highscores.get_rolling_average("OLD", "quick", 2) == pytest.approx(0.325)
+
+    highscores.add_score("OLD", 0.28, "quick")
+    assert highscores.get_personal_best("OLD", "quick") == 0.28
+    assert profile.runs == 4
+    highscores.clear_scores("quick")
+    assert highscores.get_personal_best("OLD", "quick") is None
+    highscores.close()
+
+def test_clearing_runs_never_waits_for_the_shard_rewrite(tmp_path):
+    import threading
+    from src.profiles import ProfileStore
+    from src.writer import BackgroundWriter
+
+    writer = BackgroundWriter()
+    store = ProfileStore(str(tmp_path / "players"), writer, capacity=1)
+    store.record_run("ANA", "quick", 0.3)
+    store.record_run("BO", "quick", 0.4)  # ANA is evicted
+    writer.flush()
+
+    gate = threading.Event()
+    writer.submit(gate.wait, 10)  # Holds the writer, like a slow disk
+    store.clear_runs()
+    ana = store.get("ANA")  # Read from a shard that hasn't been rewritten yet
+    assert ana.personal_best("quick") is None and ana.runs == 0
+    gate.set()
+    writer.flush()
+    assert store.pending_clears == [(1, None)]  # Pruned on the next load
+    store.get("BO")
+    assert store.pending_clears == []
+    writer.close()
+
+def test_a_corrupt_shard_does_not_stop_a_clear(tmp_path, capsys):
+    from src.profiles import ProfileStore
+
+    store = ProfileStore(str(tmp_path / "players"))
+    for name in ("ANA", "BO", "CY"):
+        store.record_run(name, "quick", 0.3)
+    with open(store.path("BO"), 'w') as f:
+        f.write("{not json")
+    store.profiles.clear()
+
+    store.clear_runs("quick")
+    assert "Could not clear the profile" in capsys.readouterr().out
+    assert store.cleared == 1
+    for name in ("ANA", "CY"):
+        assert store.get(name).personal_best("quick") is None
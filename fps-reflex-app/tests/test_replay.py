@@ -0,0 +1,45 @@
+import json
+import random
+
+def _recordings(tmp_path):
+    from src.simulate import GaussianAim, run_simulation
+
+    run_simulation(GaussianAim(4.0, random.Random(5)), ["quick", "grid"], 1, str(tmp_path / "highscores.json"))
+    return sorted((tmp_path / "recordings").glob("*.json"))
+
+def test_submitted_runs_replay_to_the_recorded_score(tmp_path):
+    from src.highscores import Highscores
+    from src.replay import verify_many
+
+    paths = _recordings(tmp_path)
+    assert len(paths) == 2
+    highscores = Highscores(str(tmp_path / "highscores.json"))
+    referenced = [entry["recording"] for mode in ("quick", "grid") for entry in highscores.get_top_scores(mode)]
+    highscores.close()
+    assert sorted(referenced) == [p.name for p in paths]
+
+    report = verify_many([str(tmp_path / "recordings")])
+    assert report["checked"] == 2
+    assert report["mismatches"] == []
+    assert report["errors"] == []
+
+def test_tampered_recording_is_reported(tmp_path):
+    from src.replay import verify_many
+
+    path = _recordings(tmp_path)[0]
+    data = json.loads(path.read_text())
+    data["average_reaction_time"] *= 0.5
+    path.write_text(json.dumps(data))
+
+    report = verify_many([str(path)])
+    assert len(report["mismatches"]) == 1
+    assert "average" in report["mismatches"][0]["reason"]
+
+def test_replay_does_not_need_pygame():
+    import subprocess
+    import sys
+    import os
+
+    src = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    code = "import sys, replay; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=src).returncode == 0
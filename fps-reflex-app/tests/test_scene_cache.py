@@ -0,0 +1,62 @@
+def _window():
+    import pygame
+    from src.ui.window import GameWindow
+
+    pygame.display.init()
+    pygame.font.init()
+    return GameWindow(800, 600)
+
+def _show(window, state, highscores, input_text=""):
+    window.update_display(state, [], highscores=highscores, input_text=input_text, current_mode="quick", avg_reaction_time=0.3)
+
+def test_static_screens_render_once_until_invalidated(tmp_path):
+    from src.highscores import Highscores
+
+    highscores = Highscores(str(tmp_path / "highscores.json"))
+    window = _window()
+    for _ in range(5):
+        _show(window, "mode_select", highscores)
+    assert window.scenes.renders == 1
+    assert window.scenes.hits == 4
+
+    # A new score is a change notification; the next frame redraws the leaderboards
+    highscores.add_score("ACE", 0.2, "quick")
+    _show(window, "mode_select", highscores)
+    _show(window, "mode_select", highscores)
+    assert window.scenes.renders == 2
+    highscores.close()
+    window.close()
+
+def test_name_input_keystroke_invalidates_only_that_screen(tmp_path):
+    from src.game import Game
+    from src.highscores import Highscores
+
+    class Key:
+        def __init__(self, key, unicode):
+            self.key = key
+            self.unicode = unicode
+
+    highscores = Highscores(str(tmp_path / "highscores.json"))
+    window = _window()
+    game = Game(highscores)
+    game.window = window
+    game.state = "name_input"
+    _show(window, "name_input", highscores, game.input_text)
+    _show(window, "mode_select", highscores)
+    assert window.scenes.renders == 2
+
+    game.handle_keydown(Key(0, "A"))
+    _show(window, "name_input", highscores, game.input_text)
+    _show(window, "mode_select", highscores)
+    assert window.scenes.renders == 3
+    highscores.close()
+    window.close()
+
+def test_resize_redraws_scenes_at_the_new_size(tmp_path):
+    window = _window()
+    _show(window, "confirm_clear", None)
+    window.resize(640, 480)
+    _show(window, "confirm_clear", None)
+    assert window.scenes.renders == 2
+    assert window.scenes.scenes["confirm_clear"].get_size() == (640, 480)
+    window.close()
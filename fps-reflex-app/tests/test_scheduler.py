@@ -0,0 +1,98 @@
+import pytest
+
+class SimulatedEvents:
+    """Stands in for pygame.event: a queue whose wait() takes simulated time instead of real time"""
+
+    def __init__(self):
+        self.queue = []
+        self.blocked = set()
+        self.waits = []  # Timeouts passed to wait(), in ms
+        self.seconds = 0.0  # Simulated wall clock
+
+    def post(self, event):
+        if event.type not in self.blocked:
+            self.queue.append(event)
+
+    def get(self):
+        events, self.queue = self.queue, []
+        return events
+
+    def wait(self, timeout_ms):
+        import pygame
+
+        self.waits.append(timeout_ms)
+        if self.queue:
+            return self.queue.pop(0)
+        self.seconds += timeout_ms / 1000
+        return pygame.event.Event(pygame.NOEVENT)
+
+    def set_blocked(self, kind):
+        self.blocked.add(kind)
+        self.queue = [event for event in self.queue if event.type != kind]
+
+    def set_allowed(self, kind):
+        self.blocked.discard(kind)
+
+    def wall(self):
+        return self.seconds
+
+def _scheduler(**kwargs):
+    import pygame
+    from src.pacing import FramePacer
+    from src.scheduler import FrameScheduler
+
+    pygame.display.init()
+    events = SimulatedEvents()
+    pacer = FramePacer("uncapped", now=lambda: int(events.seconds * 1e9))
+    return FrameScheduler(pacer=pacer, events=events, wall=events.wall, cpu=lambda: 0.0, **kwargs), events
+
+def test_idle_state_blocks_until_input_or_timeout():
+    import pygame
+
+    scheduler, events = _scheduler(idle_timeout_ms=50)
+    assert scheduler.wait_events("mode_select") == []
+    assert events.waits == [50] and events.seconds == pytest.approx(0.05)
+
+    # Mouse motion doesn't wake a menu; a click does, along with anything queued behind it
+    events.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0)))
+    events.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(5, 5), button=1))
+    events.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a"))
+    assert [event.type for event in scheduler.wait_events("mode_select")] == [pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN]
+
+    # Play polls without waiting, and needs motion again for telemetry
+    assert scheduler.wait_events("playing") == []
+    assert len(events.waits) == 2
+    events.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(2, 2), rel=(1, 1), buttons=(0, 0, 0)))
+    assert [event.type for event in scheduler.wait_events("playing")] == [pygame.MOUSEMOTION]
+
+def test_idle_wait_uses_the_pygame_queue_by_default():
+    import pygame
+    from src.scheduler import FrameScheduler
+
+    pygame.display.init()
+    pygame.event.clear()
+    scheduler = FrameScheduler(idle_timeout_ms=1)
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0)))
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(5, 5), button=1))
+    assert [event.type for event in scheduler.wait_events("mode_select")] == [pygame.MOUSEBUTTONDOWN]
+    assert scheduler.wait_events("mode_select") == []
+    pygame.event.set_allowed(pygame.MOUSEMOTION)
+
+def test_report_splits_usage_by_state_and_loop_kind():
+    scheduler, events = _scheduler(idle_timeout_ms=20)
+    for _ in range(3):
+        scheduler.wait_events("menu")
+    scheduler.wait_events("countdown")
+    report = scheduler.report()
+
+    assert report["states"]["menu"]["loop"] == "idle"
+    assert report["states"]["countdown"]["loop"] == "active"
+    assert report["kinds"]["idle"]["wall_s"] == pytest.approx(0.06)  # Three timed-out waits
+    assert report["kinds"]["idle"]["iterations_per_s"] == pytest.approx(50)
+    assert report["kinds"]["idle"]["cpu_percent"] == 0.0
+
+def test_polling_mode_treats_every_state_as_active():
+    scheduler, events = _scheduler(idle=False)
+    assert scheduler.is_active("mode_select")
+    assert scheduler.wait_events("mode_select") == []
+    assert events.waits == []
@@ -0,0 +1,23 @@
+import json
+import random
+
+def test_headless_simulation_plays_every_round(tmp_path):
+    from src.simulate import GaussianAim, run_simulation
+
+    report = run_simulation(GaussianAim(4.0, random.Random(3)), ["quick", "burst"], 2, str(tmp_path / "highscores.json"))
+    assert report["rounds"] == {"quick": 2, "burst": 2}
+    assert report["timed_out"] == {"quick": 0, "burst": 0}
+    assert report["highscore_writes"] == 4  # One log append per submitted score
+    assert report["frame_ms"]["p50"] <= report["frame_ms"]["p99"]
+
+def test_rounds_that_never_finish_are_reported_and_fail_the_run(tmp_path, capsys):
+    from src.simulate import main
+
+    # The delayed bot waits far longer than a round is allowed to take
+    status = main(["--bot", "delayed", "--delay-frames", "1000", "--max-frames", "20", "--rounds", "2",
+                   "--modes", "quick", "--seed", "1", "--scores", str(tmp_path / "highscores.json")])
+    assert status == 1
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert report["rounds"] == {"quick": 0} and report["timed_out"] == {"quick": 2}
+    assert "2 quick round(s) did not finish within 20 frames" in captured.err
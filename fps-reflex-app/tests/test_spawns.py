@@ -0,0 +1,19 @@
+def test_same_seed_gives_same_schedule():
+    from src.spawns import SpawnSchedule
+
+    first = SpawnSchedule(1234, "burst", 1920, 1080)
+    second = SpawnSchedule(1234, "burst", 1920, 1080)
+    other = SpawnSchedule(4321, "burst", 1920, 1080)
+    assert len(first) == 30
+    assert [first[i] for i in range(30)] == [second[i] for i in range(30)]
+    assert [first[i] for i in range(30)] != [other[i] for i in range(30)]
+
+def test_schedule_stays_on_screen():
+    from src.spawns import SpawnSchedule
+
+    for mode in ("quick", "burst", "grid"):
+        schedule = SpawnSchedule(7, mode, 800, 600)
+        for i in range(len(schedule)):
+            x, y, size = schedule[i]
+            assert size <= x <= 800 - size
+            assert size <= y <= 600 - size
@@ -0,0 +1,35 @@
+def test_hit_test_finds_target_across_cell_boundary():
+    from src.target import Target
+    from src.targetfield import TargetField
+
+    field = TargetField(cell_size=64)
+    target = Target(64, 64, 20)  # Straddles four cells
+    field.insert(target)
+    assert field.hit_test(50, 50) is target
+    assert field.hit_test(78, 78) is target
+    assert field.hit_test(90, 90) is None
+
+def test_hit_test_prefers_topmost_or_nearest():
+    from src.target import Target
+    from src.targetfield import TargetField
+
+    field = TargetField()
+    below = Target(100, 100, 30)
+    above = Target(120, 100, 30)
+    field.insert_many([below, above])
+    assert field.hit_test(105, 100) is above
+    assert field.hit_test(105, 100, nearest=True) is below
+
+def test_remove_many_empties_cells():
+    from src.target import Target
+    from src.targetfield import TargetField
+
+    field = TargetField()
+    targets = [Target(40 * i, 40, 12) for i in range(1, 20)]
+    field.insert_many(targets)
+    assert len(field) == 19
+    field.remove_many(targets[:10])
+    assert field.targets == targets[10:]
+    assert field.hit_test(40, 40) is None
+    field.remove_many(targets[10:])
+    assert field.cells == {}
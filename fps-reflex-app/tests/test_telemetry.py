@@ -0,0 +1,27 @@
+from array import array
+
+def test_ring_buffer_keeps_newest_events_in_order():
+    from src import telemetry
+
+    recorder = telemetry.TelemetryRecorder(capacity=4)
+    for i in range(6):
+        recorder.record(telemetry.MOTION, i, float(i), float(i * 2))
+    assert len(recorder) == 4
+    columns = recorder.snapshot()
+    assert list(array("q", columns["t_ns"])) == [2, 3, 4, 5]
+
+def test_session_file_round_trip(tmp_path):
+    from src import telemetry
+
+    recorder = telemetry.TelemetryRecorder(capacity=8)
+    recorder.record(telemetry.SPAWN, 100, 50.0, 60.0, 20.0)
+    recorder.record(telemetry.PRESENT, 200, 50.0, 60.0, 20.0)
+    recorder.record(telemetry.HIT, 900, 52.0, 58.0)
+    path = str(tmp_path / "session.fpst")
+    telemetry.write_session(path, recorder.snapshot(), {"mode": "quick"})
+
+    meta, columns = telemetry.load_session(path)
+    assert meta == {"mode": "quick"}
+    assert list(columns["kind"]) == [telemetry.SPAWN, telemetry.PRESENT, telemetry.HIT]
+    assert list(columns["t_ns"]) == [100, 200, 900]
+    assert list(columns["size"]) == [20.0, 20.0, 0.0]
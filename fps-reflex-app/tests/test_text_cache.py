@@ -0,0 +1,30 @@
+from src.ui.text_cache import TextCache
+
+class FakeFont:
+    def __init__(self):
+        self.calls = 0
+
+    def render(self, text, antialias, color):
+        self.calls += 1
+        return (text, color)
+
+def test_text_cache_hits_after_first_render():
+    font = FakeFont()
+    cache = TextCache()
+    first = cache.render(font, "Start", (0, 0, 0))
+    second = cache.render(font, "Start", (0, 0, 0))
+    assert first is second
+    assert font.calls == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_text_cache_evicts_least_recently_used():
+    font = FakeFont()
+    cache = TextCache(max_size=2)
+    cache.render(font, "a", (255, 255, 255))
+    cache.render(font, "b", (255, 255, 255))
+    cache.render(font, "a", (255, 255, 255))
+    cache.render(font, "c", (255, 255, 255))
+    assert len(cache) == 2
+    cache.render(font, "a", (255, 255, 255))
+    assert font.calls == 3  # "a" survived, "b" was evicted
@@ -0,0 +1,75 @@
+import math
+from src.timing import ReactionTimer
+
+def test_reaction_time_measured_from_present():
+    timer = ReactionTimer()
+    timer.target_spawned("a", 1_000_000)
+    timer.frame_presented(9_000_000)
+    timer.frame_presented(25_000_000)  # Later frames don't move the visibility stamp
+    reaction = timer.target_hit("a", 259_000_000)
+    assert abs(reaction - 0.25) < 1e-9
+    assert timer.shots == [(8_000_000, 250_000_000)]
+
+def test_click_before_present_uses_spawn_time():
+    timer = ReactionTimer()
+    timer.target_spawned("a", 1_000_000)
+    reaction = timer.target_hit("a", 101_000_000)
+    assert abs(reaction - 0.1) < 1e-9
+    assert timer.breakdown() == [{"spawn_to_present_ms": 0.0, "present_to_click_ms": 100.0}]
+
+def test_each_live_target_keeps_its_own_stamps():
+    timer = ReactionTimer()
+    timer.target_spawned("old", 0)
+    timer.frame_presented(1_000_000)
+    timer.target_spawned("new", 50_000_000)
+    timer.frame_presented(51_000_000)
+    assert abs(timer.target_hit("old", 201_000_000) - 0.2) < 1e-9
+    assert abs(timer.target_hit("new", 251_000_000) - 0.2) < 1e-9
+    assert timer.target_hit("old", 300_000_000) == 0.0  # Already hit
+
+def _click_point(game, target, t):
+    """A point on `target` that isn't covered by a target drawn above it"""
+    x, y = game.field.position_of(target, t) if game.moving else (target.x, target.y)
+    candidates = [(x, y)] + [
+        (x + 0.8 * target.size * math.cos(angle * math.pi / 8), y + 0.8 * target.size * math.sin(angle * math.pi / 8))
+        for angle in range(16)
+    ]
+    for pos in candidates:
+        if game.target_at(pos, t) is target:
+            return pos
+    raise AssertionError("target is completely covered")
+
+def _play_round(mode, delay_ns, seed=1):
+    """Click every target exactly `delay_ns` after it was first presented (seed 1 never fully covers a target)"""
+    from src.game import Game
+    from src.replay import NoScores, ReplayWindow
+
+    game = Game(NoScores())
+    game.window = ReplayWindow(1920, 1080)
+    game.start_game(mode, seed)
+    game.begin_play(0)
+    t = 0
+    shown = {}  # target -> first present
+    while game.state == "playing":
+        t += 1_000_000
+        game.frame_presented(t)
+        for target in game.visible_targets(t):
+            shown.setdefault(target, t)
+        first = min(shown.values())
+        t = first + delay_ns
+        for target in [target for target, at in shown.items() if at == first]:
+            del shown[target]
+            game.handle_click(_click_point(game, target, t), t)
+    return game
+
+def test_grid_round_times_every_hit_from_its_own_target():
+    game = _play_round("grid", 200_000_000)
+    assert len(game.reaction_times) == 100
+    assert all(abs(reaction - 0.2) < 1e-6 for reaction in game.reaction_times)
+    assert abs(game.average_reaction_time() - 0.2) < 1e-6
+
+def test_tracking_round_times_every_hit_from_its_own_target():
+    game = _play_round("tracking", 200_000_000)
+    assert len(game.reaction_times) == 40
+    assert all(abs(reaction - 0.2) < 1e-6 for reaction in game.reaction_times)
+    assert abs(game.average_reaction_time() - 0.2) < 1e-6
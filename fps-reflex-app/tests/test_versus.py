@@ -0,0 +1,255 @@
+import random
+import time
+import pytest
+
+SKEW_NS = 7_000_000_000  # The joiner's clock runs 7 s ahead of the host's
+
+def _pair(loss=0.0, delay_ms=0.0, jitter_ms=0.0):
+    from src.timing import now_ns
+    from src.versus import LossyLink, VersusPeer
+
+    host = VersusPeer("HOST", host="127.0.0.1", link=LossyLink(loss, delay_ms, jitter_ms, random.Random(1)),
+                      resend_ms=30, ping_ms=40)
+    joiner = VersusPeer("JOIN", host="127.0.0.1", remote=("127.0.0.1", host.port),
+                        link=LossyLink(loss, delay_ms, jitter_ms, random.Random(2)),
+                        clock=lambda: now_ns() + SKEW_NS, resend_ms=30, ping_ms=40)
+    return host, joiner
+
+def _pump(peers, until, timeout=10.0):
+    delivered = {peer: [] for peer in peers}
+    deadline = time.perf_counter() + timeout
+    while not until(delivered) and time.perf_counter() < deadline:
+        for peer in peers:
+            delivered[peer].extend(peer.poll())
+        time.sleep(0.001)
+    return delivered
+
+def test_handshake_and_clock_offset_survive_loss_and_jitter():
+    host, joiner = _pair(loss=0.3, delay_ms=15, jitter_ms=10)
+    try:
+        _pump([host, joiner], lambda _: host.connected and joiner.connected)
+        assert host.opponent == "JOIN" and joiner.opponent == "HOST"
+        _pump([host, joiner], lambda _: len(joiner.samples) >= 8)
+        # Offset error is bounded by half the delay asymmetry, at most half the jitter here
+        assert abs(joiner.offset_ns + SKEW_NS) < 10_000_000
+        assert abs(host.offset_ns - SKEW_NS) < 10_000_000
+    finally:
+        host.close()
+        joiner.close()
+
+def test_reliable_messages_arrive_exactly_once():
+    host, joiner = _pair(loss=0.4, delay_ms=5, jitter_ms=20)  # Jitter also reorders
+    try:
+        _pump([host, joiner], lambda _: host.connected and joiner.connected)
+        for i in range(1, 31):
+            joiner.send({"t": "shot", "i": i, "rt": i / 100, "at": 0})
+        delivered = _pump([host, joiner], lambda d: len(d[host]) >= 30 and not joiner.unacked)
+        assert sorted(message["i"] for message in delivered[host]) == list(range(1, 31))
+        assert joiner.link.dropped > 0
+        delivered = _pump([host, joiner], lambda _: False, timeout=0.2)
+        assert delivered[host] == []  # Late duplicates of resent shots are not delivered again
+    finally:
+        host.close()
+        joiner.close()
+
+def test_a_second_joiner_is_turned_away():
+    from src.versus import VersusPeer
+
+    host, joiner = _pair()
+    intruder = VersusPeer("LATE", host="127.0.0.1", remote=("127.0.0.1", host.port))
+    try:
+        _pump([host, joiner], lambda _: host.connected and joiner.connected)
+        _pump([host, joiner, intruder], lambda _: intruder.error is not None)
+        assert intruder.error and not intruder.connected
+        assert host.opponent == "JOIN"
+    finally:
+        for peer in (host, joiner, intruder):
+            peer.close()
+
+def test_poll_never_waits_for_the_network():
+    from src.versus import VersusPeer
+
+    peer = VersusPeer("SOLO", host="127.0.0.1", remote=("127.0.0.1", 9))  # Nobody answers
+    try:
+        started = time.perf_counter()
+        for _ in range(200):
+            peer.poll()
+        assert (time.perf_counter() - started) / 200 < 0.002
+    finally:
+        peer.close()
+
+def test_match_races_the_same_round_and_keeps_local_reaction_times():
+    from src.replay import NoScores, ReplayWindow
+    from src.game import Game
+    from src.versus import VersusMatch
+
+    host, joiner = _pair(loss=0.2, delay_ms=10, jitter_ms=10)
+    games = []
+    for peer in (host, joiner):
+        game = Game(NoScores())
+        game.window = ReplayWindow(800, 600)
+        game.versus = VersusMatch(peer)
+        games.append(game)
+    host_game, joiner_game = games
+    try:
+        _pump([host, joiner], lambda _: host.connected and len(joiner.samples) >= 4)
+        joiner_game.versus.propose(joiner_game, "quick")
+        deadline = time.perf_counter() + 10
+        while joiner_game.state != "countdown" and time.perf_counter() < deadline:
+            for game in games:
+                game.update()
+            time.sleep(0.001)
+        assert host_game.state == joiner_game.state == "countdown"
+        assert host_game.seed == joiner_game.seed
+        # Both countdowns end at the same moment despite the skewed clocks
+        assert abs(host_game.countdown_start - joiner_game.countdown_start) < 0.03
+
+        # Play both rounds: the joiner is faster
+        for game, reaction_ns in ((host_game, 300_000_000), (joiner_game, 200_000_000)):
+            game.begin_play()
+            while game.state == "playing":
+                target = game.current_target
+                game.frame_presented(1_000_000_000)
+                game.handle_click((int(target.x), int(target.y)), 1_000_000_000 + reaction_ns)
+        assert joiner_game.average_reaction_time() == pytest.approx(0.2)
+        _pump_games(games, lambda: joiner_game.versus.outcome() and host_game.versus.outcome())
+        assert joiner_game.versus.outcome() == "win"
+        assert host_game.versus.outcome() == "lose"
+        # Reliable messages aren't ordered; the finish can overtake the last shots
+        _pump_games(games, lambda: len(host_game.versus.theirs.reaction_times) == joiner_game.max_clicks)
+        assert host_game.versus.theirs.reaction_times == pytest.approx([0.2] * joiner_game.max_clicks)
+    finally:
+        host.close()
+        joiner.close()
+
+def _pump_games(games, until, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not until() and time.perf_counter() < deadline:
+        for game in games:
+            game.versus.update(game)
+        time.sleep(0.001)
+
+def test_a_joiner_with_another_play_area_is_refused():
+    from src.versus import VersusPeer
+
+    host = VersusPeer("HOST", host="127.0.0.1", area=(800, 600), resend_ms=30)
+    joiner = VersusPeer("JOIN", host="127.0.0.1", remote=("127.0.0.1", host.port), area=(1024, 768), resend_ms=30)
+    try:
+        _pump([host, joiner], lambda _: joiner.error is not None, timeout=5)
+        assert joiner.error == "play areas differ: 1024x768 here, 800x600 on the host"
+        assert not host.connected and not joiner.connected
+    finally:
+        host.close()
+        joiner.close()
+
+class StubPeer:
+    """A connected VersusPeer stand-in whose messages and clock sync the test controls"""
+
+    def __init__(self, hosting, area=(800, 600)):
+        self.hosting = hosting
+        self.area = list(area)
+        self.connected = True
+        self.opponent = "THEM"
+        self.rtt_ns = None
+        self.offset_ns = 0
+        self.error = None
+        self.incoming = []
+        self.sent = []
+
+    def poll(self):
+        messages, self.incoming = self.incoming, []
+        return messages
+
+    def send(self, message):
+        self.sent.append(message)
+
+    def clock(self):
+        from src.timing import now_ns
+        return now_ns()
+
+    def to_local(self, remote_ns):
+        return remote_ns - self.offset_ns
+
+def _stub_game(peer):
+    from src.replay import NoScores, ReplayWindow
+    from src.game import Game
+    from src.versus import VersusMatch
+
+    game = Game(NoScores())
+    game.window = ReplayWindow(800, 600)
+    game.versus = VersusMatch(peer)
+    return game
+
+def test_nothing_starts_before_the_clock_offset_is_measured():
+    host = StubPeer(hosting=True)
+    game = _stub_game(host)
+    game.versus.propose(game, "quick")
+    host.incoming.append({"t": "propose", "mode": "grid"})
+    game.versus.update(game)
+    assert game.state == "mode_select" and host.sent == []
+
+    host.rtt_ns = 2_000_000  # First pong
+    game.versus.update(game)
+    assert game.state == "countdown" and game.current_mode == "grid"
+    assert host.sent[0]["t"] == "start" and host.sent[0]["area"] == [800, 600]
+
+def test_a_start_waits_for_the_clock_offset_and_checks_the_play_area():
+    from src.versus import COUNTDOWN_NS
+
+    joiner = StubPeer(hosting=False)
+    game = _stub_game(joiner)
+    joiner.incoming.append({"t": "start", "mode": "quick", "seed": 5, "at": joiner.clock() + COUNTDOWN_NS, "area": [800, 600]})
+    game.versus.update(game)
+    assert game.state == "mode_select"
+    joiner.rtt_ns = 2_000_000
+    game.versus.update(game)
+    assert game.state == "countdown" and game.seed == 5
+
+    other = StubPeer(hosting=False, area=(1280, 720))
+    other.rtt_ns = 2_000_000
+    game = _stub_game(other)
+    other.incoming.append({"t": "start", "mode": "quick", "seed": 5, "at": other.clock() + COUNTDOWN_NS, "area": [800, 600]})
+    game.versus.update(game)
+    assert game.state == "mode_select"
+    assert other.error == "play areas differ: 1280x720 here, 800x600 on the host"
+
+def test_a_start_waits_until_the_joiner_has_left_the_last_round():
+    from src.versus import COUNTDOWN_NS
+
+    joiner = StubPeer(hosting=False)
+    joiner.rtt_ns = 2_000_000
+    game = _stub_game(joiner)
+    game.state = "ended"  # Last race's result is still on screen; its score isn't saved yet
+    joiner.incoming.append({"t": "start", "mode": "quick", "seed": 5, "at": joiner.clock() + COUNTDOWN_NS, "area": [800, 600]})
+    game.versus.update(game)
+    assert game.state == "ended" and game.versus.starting is not None
+
+    game.state = "mode_select"  # Score saved
+    game.versus.update(game)
+    assert game.state == "countdown" and game.seed == 5
+
+def test_a_start_missed_on_the_ended_screen_is_reported():
+    joiner = StubPeer(hosting=False)
+    joiner.rtt_ns = 2_000_000
+    game = _stub_game(joiner)
+    game.state = "name_input"
+    joiner.incoming.append({"t": "start", "mode": "quick", "seed": 5, "at": joiner.clock() - 1, "area": [800, 600]})
+    game.versus.update(game)
+    game.state = "mode_select"
+    game.versus.update(game)
+    assert game.state == "mode_select" and game.versus.starting is None
+    assert "Opponent started without you" in game.versus.status_lines()
+
+def test_a_proposal_waits_until_the_host_has_left_the_last_round():
+    host = StubPeer(hosting=True)
+    host.rtt_ns = 2_000_000
+    game = _stub_game(host)
+    game.state = "ended"
+    host.incoming.append({"t": "propose", "mode": "grid"})
+    game.versus.update(game)
+    assert game.state == "ended" and host.sent == []
+
+    game.state = "mode_select"
+    game.versus.update(game)
+    assert game.state == "countdown" and game.current_mode == "grid"
+    assert game.versus.proposed is None